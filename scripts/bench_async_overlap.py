@@ -0,0 +1,97 @@
+"""Show that concurrent generations overlap on the async path.
+
+Runs N concurrent TwitterGenerator generations against a fake LLM client
+that sleeps for a fixed latency. The blocking path (sync generate() called
+from coroutines, as the routes used to do) serializes the calls; the async
+path (agenerate()) lets them overlap, so wall time stays close to a single
+call. A heartbeat task measures how long the event loop was starved.
+
+Usage:
+    python -m scripts.bench_async_overlap --requests 8 --latency 0.5
+"""
+
+import argparse
+import asyncio
+import time
+
+from src.generators.twitter_generator import TwitterGenerator
+from src.utils.config import Config
+
+
+class FakeLLMClient:
+    """LLM client stub with a fixed response latency."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def generate(self, prompt, max_tokens=2000, temperature=0.7, system=None) -> str:
+        time.sleep(self.latency)
+        return "Focus on what you control. #Stoicism"
+
+    async def agenerate(self, prompt, max_tokens=2000, temperature=0.7, system=None) -> str:
+        await asyncio.sleep(self.latency)
+        return "Focus on what you control. #Stoicism"
+
+
+async def _heartbeat(stop: asyncio.Event, interval: float = 0.01) -> float:
+    """Return the longest gap between ticks, i.e. the worst event-loop stall."""
+    worst = 0.0
+    last = time.perf_counter()
+    while not stop.is_set():
+        await asyncio.sleep(interval)
+        now = time.perf_counter()
+        worst = max(worst, now - last - interval)
+        last = now
+    return worst
+
+
+async def _run(generator: TwitterGenerator, requests: int, use_async: bool) -> dict:
+    """Run concurrent generations and time them."""
+
+    async def blocking_call():
+        return generator.generate(format_type="short", virtue="wisdom")
+
+    async def async_call():
+        return await generator.agenerate(format_type="short", virtue="wisdom")
+
+    call = async_call if use_async else blocking_call
+
+    stop = asyncio.Event()
+    heartbeat = asyncio.create_task(_heartbeat(stop))
+    started = time.perf_counter()
+    results = await asyncio.gather(*(call() for _ in range(requests)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    worst_stall = await heartbeat
+
+    return {
+        "wall_seconds": round(elapsed, 3),
+        "max_loop_stall_seconds": round(worst_stall, 3),
+        "errors": sum(1 for r in results if r.get("error")),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.5)
+    args = parser.parse_args()
+
+    generator = TwitterGenerator(FakeLLMClient(args.latency), None, Config)
+
+    blocking = asyncio.run(_run(generator, args.requests, use_async=False))
+    overlapped = asyncio.run(_run(generator, args.requests, use_async=True))
+
+    print(f"{args.requests} concurrent requests, {args.latency}s simulated LLM latency")
+    print(
+        f"blocking: {blocking['wall_seconds']}s wall, "
+        f"event loop stalled up to {blocking['max_loop_stall_seconds']}s"
+    )
+    print(
+        f"   async: {overlapped['wall_seconds']}s wall, "
+        f"event loop stalled up to {overlapped['max_loop_stall_seconds']}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
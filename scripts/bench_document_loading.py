@@ -0,0 +1,90 @@
+"""Benchmark serial vs parallel streaming document loading.
+
+Generates a synthetic markdown corpus, then compares the list-building
+load_markdown_files() with iter_documents() across worker counts. Reports
+wall time and the loading process's peak Python heap (tracemalloc), which
+stays flat for the streaming path because batches are dropped once consumed.
+
+Usage:
+    python -m scripts.bench_document_loading --files 3000
+    python -m scripts.bench_document_loading --files 5000 --workers 1 4 8
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict
+
+from src.rag.document_loader import DocumentLoader
+from src.utils.config import Config
+
+WORDS = (
+    "virtue wisdom courage justice temperance control judgment fate death reason "
+    "nature duty fear anger desire patience discipline character emotion choice "
+    "seneca marcus epictetus obstacle path mind freedom tranquility acceptance"
+).split()
+
+
+def build_corpus(directory: Path, files: int, paragraphs: int, seed: int = 7):
+    """Write files markdown documents with headings, emphasis and links."""
+    rng = random.Random(seed)
+    for i in range(files):
+        parts = [f"# Meditation {i}"]
+        for p in range(paragraphs):
+            sentence = " ".join(rng.choice(WORDS) for _ in range(rng.randint(40, 90)))
+            parts.append(f"**{rng.choice(WORDS)}** {sentence} [[{rng.choice(WORDS)}]] [link](http://example.com/{p}).")
+        (directory / f"doc_{i:05d}.md").write_text("\n\n".join(parts), encoding="utf-8")
+
+
+def _measure(fn: Callable[[], int]) -> Dict:
+    """Run fn (returning a chunk count) under tracemalloc, silencing per-file prints."""
+    tracemalloc.start()
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        chunks = fn()
+    seconds = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"chunks": chunks, "seconds": round(seconds, 2), "peak_mb": round(peak / 1e6, 1)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=3000)
+    parser.add_argument("--paragraphs", type=int, default=12)
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, os.cpu_count() or 1])
+    args = parser.parse_args()
+
+    loader = DocumentLoader(Config.CHUNK_SIZE, Config.CHUNK_OVERLAP)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus = Path(tmp)
+        started = time.perf_counter()
+        build_corpus(corpus, args.files, args.paragraphs)
+        size_mb = sum(f.stat().st_size for f in corpus.iterdir()) / 1e6
+        print(f"Corpus: {args.files} files, {size_mb:.1f} MB (built in {time.perf_counter() - started:.1f}s)")
+
+        results = {"load_markdown_files": _measure(lambda: len(loader.load_markdown_files(tmp)))}
+        for workers in args.workers:
+            results[f"iter_documents workers={workers}"] = _measure(
+                lambda: sum(len(batch) for batch in loader.iter_documents(tmp, args.batch_size, workers))
+            )
+
+    baseline = results["load_markdown_files"]["seconds"]
+    for label, stats in results.items():
+        speedup = baseline / max(stats["seconds"], 1e-6)
+        print(
+            f"{label:<28} {stats['chunks']:>7} chunks | {stats['seconds']:>6.2f}s ({speedup:.1f}x) | "
+            f"peak heap {stats['peak_mb']} MB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""Show how hedged requests cut LLM tail latency, and failover on errors.
+
+Runs TwitterGenerator.agenerate() against two fake providers whose latency
+is usually fast but occasionally very slow (a heavy tail, as with a
+congested provider). The same seeded workload goes through a router with
+hedging off and with hedging on; with hedging, a call that outlasts the
+provider's recent p95 is also sent to the other provider and the first
+answer wins. A final run makes the requested provider fail a share of calls
+to show failover.
+
+Usage:
+    python -m scripts.bench_llm_router --requests 400 --slow-rate 0.05
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+from src.generators.twitter_generator import TwitterGenerator
+from src.llm.router import LLMRouter
+from src.utils.config import Config
+
+
+class FakeProvider:
+    """LLM client stub with a seeded heavy-tailed latency and optional error rate."""
+
+    def __init__(self, name: str, fast: float, slow: float, slow_rate: float, error_rate: float = 0.0, seed: int = 0):
+        self.name = name
+        self.fast = fast
+        self.slow = slow
+        self.slow_rate = slow_rate
+        self.error_rate = error_rate
+        self.model = f"fake-{name}"
+        self.rng = random.Random(seed)
+        self.calls = 0
+
+    def _latency(self) -> float:
+        if self.rng.random() < self.slow_rate:
+            return self.slow * self.rng.uniform(0.8, 1.2)
+        return self.fast * self.rng.uniform(0.7, 1.3)
+
+    def generate(self, prompt, max_tokens=2000, temperature=0.7, system=None) -> str:
+        self.calls += 1
+        time.sleep(self._latency())
+        return f"Focus on what you control. ({self.name})"
+
+    async def agenerate(self, prompt, max_tokens=2000, temperature=0.7, system=None) -> str:
+        self.calls += 1
+        latency = self._latency()
+        failing = self.rng.random() < self.error_rate
+        await asyncio.sleep(latency / 4 if failing else latency)
+        if failing:
+            raise Exception(f"{self.name}: 529 overloaded")
+        return f"Focus on what you control. ({self.name})"
+
+
+def _percentile(timings, pct: float) -> float:
+    ordered = sorted(timings)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))] * 1000
+
+
+async def _run(router: LLMRouter, requests: int, concurrency: int) -> dict:
+    generator = TwitterGenerator(router, None, Config)
+    semaphore = asyncio.Semaphore(concurrency)
+    timings = []
+
+    async def call():
+        async with semaphore:
+            started = time.perf_counter()
+            result = await generator.agenerate(model_name="gpt4", format_type="short", virtue="wisdom")
+            timings.append(time.perf_counter() - started)
+            return result
+
+    results = await asyncio.gather(*(call() for _ in range(requests)))
+    stats = router.get_stats()
+    return {
+        "p50_ms": round(_percentile(timings, 0.5), 1),
+        "p95_ms": round(_percentile(timings, 0.95), 1),
+        "p99_ms": round(_percentile(timings, 0.99), 1),
+        "errors": sum(1 for r in results if r.get("error")),
+        "served_by_claude": sum(1 for r in results if r.get("model") == "claude"),
+        "hedges": stats["hedges"],
+        "hedge_wins": stats["hedge_wins"],
+        "failovers": stats["failovers"],
+    }
+
+
+def _router(args, hedging: bool, error_rate: float = 0.0) -> LLMRouter:
+    providers = {
+        "gpt4": FakeProvider("gpt4", args.fast, args.slow, args.slow_rate, error_rate, seed=1),
+        "claude": FakeProvider("claude", args.fast * 1.2, args.slow, args.slow_rate, seed=2),
+    }
+    return LLMRouter(
+        providers,
+        default="gpt4",
+        hedging=hedging,
+        hedge_percentile=args.percentile,
+        hedge_min_samples=20,
+        hedge_initial_delay=args.slow / 2,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--fast", type=float, default=0.05, help="Typical latency in seconds")
+    parser.add_argument("--slow", type=float, default=1.0, help="Tail latency in seconds")
+    parser.add_argument("--slow-rate", type=float, default=0.05, help="Share of calls that hit the tail")
+    parser.add_argument("--percentile", type=float, default=Config.LLM_HEDGE_PERCENTILE)
+    parser.add_argument("--error-rate", type=float, default=0.2, help="Requested provider's error rate in the failover run")
+    args = parser.parse_args()
+
+    runs = {
+        "single": asyncio.run(_run(_router(args, hedging=False), args.requests, args.concurrency)),
+        "hedged": asyncio.run(_run(_router(args, hedging=True), args.requests, args.concurrency)),
+        "failover": asyncio.run(_run(_router(args, hedging=True, error_rate=args.error_rate), args.requests, args.concurrency)),
+    }
+
+    print(
+        f"{args.requests} requests, {args.fast}s typical / {args.slow}s tail latency "
+        f"({args.slow_rate:.0%} of calls), hedge after p{args.percentile:g}"
+    )
+    for name, run in runs.items():
+        print(
+            f"{name:>8}: p50 {run['p50_ms']:>7} ms | p95 {run['p95_ms']:>7} ms | p99 {run['p99_ms']:>7} ms | "
+            f"hedges {run['hedges']} (won {run['hedge_wins']}) | failovers {run['failovers']} | "
+            f"served by claude {run['served_by_claude']} | errors {run['errors']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
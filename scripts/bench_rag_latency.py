@@ -0,0 +1,118 @@
+"""Benchmark cold (per-request) vs warm (shared service) retrieval latency.
+
+Cold mirrors the old route behaviour: every request builds a new VectorStore
+and Retriever before querying. Warm reuses the RAGService opened once at
+startup, with the result cache disabled. Cached is the shared Retriever as
+routes use it, where repeated queries are served from the retrieval cache.
+
+Usage:
+    python -m scripts.bench_rag_latency --iterations 20
+    python -m scripts.bench_rag_latency --db-path ./chroma_db --k 2
+"""
+
+import argparse
+import statistics
+import time
+from typing import Callable, Dict, List
+
+from src.rag.service import RAG_AVAILABLE, RAGService
+from src.utils.config import Config
+
+QUERIES = [
+    "dichotomy of control",
+    "facing fears with composure",
+    "moderation with technology",
+    "treating others with dignity",
+    "memento mori - awareness of mortality",
+]
+
+
+def _time_calls(fn: Callable[[str], object], iterations: int) -> List[float]:
+    """Time fn over the query list, returning per-call milliseconds."""
+    timings = []
+    for i in range(iterations):
+        query = QUERIES[i % len(QUERIES)]
+        started = time.perf_counter()
+        fn(query)
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def _summarize(timings: List[float]) -> Dict:
+    """Summarize a list of millisecond timings."""
+    ordered = sorted(timings)
+    return {
+        "mean_ms": round(statistics.mean(ordered), 2),
+        "p50_ms": round(ordered[len(ordered) // 2], 2),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 2),
+        "max_ms": round(ordered[-1], 2),
+    }
+
+
+def run(db_path: str, iterations: int, k: int) -> Dict:
+    """Run the cold and warm benchmarks and return a summary."""
+    from src.rag.retriever import Retriever
+    from src.rag.vector_store import VectorStore
+
+    def cold(query: str):
+        retriever = Retriever(VectorStore(db_path), cache_size=0)
+        return retriever.retrieve_knowledge(query, k=k)
+
+    cold_timings = _time_calls(cold, iterations)
+
+    service = RAGService(db_path)
+    started = time.perf_counter()
+    service.start(warm=True)
+    startup_ms = (time.perf_counter() - started) * 1000
+
+    uncached = Retriever(service.vector_store, cache_size=0)
+
+    def warm(query: str):
+        return uncached.retrieve_knowledge(query, k=k)
+
+    warm_timings = _time_calls(warm, iterations)
+
+    def cached(query: str):
+        return service.get_retriever().retrieve_knowledge(query, k=k)
+
+    cached_timings = _time_calls(cached, iterations)
+
+    return {
+        "iterations": iterations,
+        "k": k,
+        "service_startup_ms": round(startup_ms, 2),
+        "cold": _summarize(cold_timings),
+        "warm": _summarize(warm_timings),
+        "cached": _summarize(cached_timings),
+        "cache": service.get_retriever().get_stats()["cache"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db-path", default=Config.CHROMA_DB_PATH)
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--k", type=int, default=Config.RETRIEVAL_K)
+    args = parser.parse_args()
+
+    if not RAG_AVAILABLE:
+        print("chromadb is not installed; nothing to benchmark.")
+        return
+
+    result = run(args.db_path, args.iterations, args.k)
+
+    print(f"Service startup (open + warmup): {result['service_startup_ms']} ms")
+    for label in ("cold", "warm", "cached"):
+        stats = result[label]
+        print(
+            f"{label:>5}: mean {stats['mean_ms']} ms | p50 {stats['p50_ms']} ms | "
+            f"p95 {stats['p95_ms']} ms | max {stats['max_ms']} ms"
+        )
+    speedup = result["cold"]["mean_ms"] / max(result["warm"]["mean_ms"], 1e-6)
+    print(f"Warm requests are {speedup:.1f}x faster on average")
+    cache = result["cache"]
+    print(f"Retrieval cache: hit ratio {cache['hit_ratio']} | saved {cache['saved_ms']} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""Benchmark the Chroma (HNSW) and NumPy (exact) vector backends.
+
+Builds both stores from the same synthetic chunks, embedded once through a
+shared document embedding cache so build times measure indexing only. Then
+times queries with precomputed query embeddings and scores recall@k against
+exact brute-force neighbours.
+
+Usage:
+    python -m scripts.bench_vector_backends --chunks 5000 --queries 200
+    python -m scripts.bench_vector_backends --json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import random
+import tempfile
+import time
+from typing import Dict, List
+
+import numpy as np
+
+from src.rag.backends import backend_available, create_vector_store
+from src.rag.document_loader import Document
+from src.utils.config import Config
+
+
+def synthetic_chunks(count: int, seed: int = 11) -> List[Document]:
+    """Chunks of random words drawn from a Zipf-ish vocabulary."""
+    rng = random.Random(seed)
+    vocab = [f"w{i}" for i in range(2000)] + "virtue wisdom courage justice temperance fate death control".split()
+    weights = [1 / (rank + 1) for rank in range(len(vocab))]
+    return [
+        Document(
+            " ".join(rng.choices(vocab, weights, k=rng.randint(60, 160))),
+            {"source": f"Synthetic {i // 10}", "source_path": f"synthetic/{i // 10}.md", "chunk_id": i % 10},
+        )
+        for i in range(count)
+    ]
+
+
+def _key(result: Dict) -> tuple:
+    return result["metadata"]["source_path"], result["metadata"]["chunk_id"]
+
+
+def _percentile(timings: List[float], pct: float) -> float:
+    ordered = sorted(timings)
+    return round(ordered[min(len(ordered) - 1, int(len(ordered) * pct))], 3)
+
+
+def run(chunks: int, queries: int, k: int) -> Dict:
+    documents = synthetic_chunks(chunks)
+    query_texts = [doc.content[:80] for doc in random.Random(5).sample(documents, queries)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        Config.DOC_EMBEDDING_CACHE = True
+        Config.DOC_EMBEDDING_CACHE_DIR = f"{tmp}/embedding_cache"
+        Config.QUERY_EMBEDDING_CACHE_PATH = f"{tmp}/query_embeddings.sqlite3"
+
+        results = {"chunks": chunks, "queries": queries, "k": k, "backends": {}}
+        truth = None
+        query_vectors = None
+
+        for backend in ("numpy", "chroma"):
+            if not backend_available(backend):
+                results["backends"][backend] = {"error": "not installed"}
+                continue
+
+            store = create_vector_store(backend, f"{tmp}/{backend}")
+            if query_vectors is None:
+                started = time.perf_counter()
+                matrix = store.document_embeddings.embed([doc.content for doc in documents])
+                results["embedding_seconds"] = round(time.perf_counter() - started, 2)
+                query_vectors = [np.asarray(v, dtype=np.float32) for v in store.embed_queries(query_texts)]
+
+                # Ground truth: exact cosine neighbours
+                normed = matrix / np.linalg.norm(matrix, axis=1, keepdims=True)
+                truth = []
+                for q in query_vectors:
+                    scores = normed @ (q / np.linalg.norm(q))
+                    truth.append({_key({"metadata": documents[row].metadata}) for row in np.argsort(-scores)[:k]})
+
+            started = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                for start in range(0, len(documents), 1000):
+                    store.upsert_documents(documents[start:start + 1000])
+            build_seconds = time.perf_counter() - started
+
+            # Untimed first query pays for index loading / page faults
+            store.query(query_embedding=query_vectors[0], k=k)
+
+            timings, hits = [], 0
+            for q, expected in zip(query_vectors, truth):
+                started = time.perf_counter()
+                found = store.query(query_embedding=q, k=k)
+                timings.append((time.perf_counter() - started) * 1000)
+                hits += len({_key(r) for r in found} & expected)
+
+            results["backends"][backend] = {
+                "build_seconds": round(build_seconds, 2),
+                "p50_ms": _percentile(timings, 0.5),
+                "p95_ms": _percentile(timings, 0.95),
+                f"recall@{k}": round(hits / (k * len(truth)), 4),
+            }
+            store.close()
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chunks", type=int, default=5000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=Config.RETRIEVAL_K)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    results = run(args.chunks, args.queries, args.k)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{results['chunks']} chunks, {results['queries']} queries, k={results['k']} "
+          f"(embedding {results.get('embedding_seconds')}s, shared by both backends)")
+    recall_key = f"recall@{results['k']}"
+    for backend, stats in results["backends"].items():
+        if "error" in stats:
+            print(f"{backend:>7}: {stats['error']}")
+            continue
+        print(
+            f"{backend:>7}: build {stats['build_seconds']}s | p50 {stats['p50_ms']} ms | "
+            f"p95 {stats['p95_ms']} ms | {recall_key} {stats[recall_key]}"
+        )
+
+
+if __name__ == "__main__":
+    main()
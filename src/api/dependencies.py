@@ -0,0 +1,49 @@
+"""Shared dependencies for API routes."""
+
+from functools import lru_cache
+from typing import Dict, Optional
+from fastapi import HTTPException
+from src.generators.twitter_generator import TwitterGenerator
+from src.llm.router import LLMRouter, build_default_router
+from src.rag.service import get_rag_service
+from src.utils.config import Config
+
+
+@lru_cache(maxsize=1)
+def get_llm_client() -> LLMRouter:
+    """Get the process-wide LLM router (keeps each provider's HTTP connection pool warm)."""
+    return build_default_router()
+
+
+def get_generator() -> TwitterGenerator:
+    """Initialize the Twitter generator with the shared retriever and LLM router."""
+    retriever = get_rag_service().get_retriever()
+    return TwitterGenerator(get_llm_client(), retriever, Config)
+
+
+def model_kwargs(model: Optional[str]) -> Dict:
+    """
+    Check a requested provider against the router's configured providers.
+
+    Args:
+        model: Provider name from the request ("gpt4", "claude"), or None
+
+    Returns:
+        {"model_name": model} to pass to the generator, or {} to keep its default
+
+    Raises:
+        HTTPException: 422 when the router has no such provider
+    """
+    if not model:
+        return {}
+    try:
+        providers = get_llm_client().providers
+    except Exception:
+        # No router to check against; building the generator reports the config error
+        return {"model_name": model}
+    if model not in providers:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Unknown model {model!r}; configured providers: {', '.join(providers)}",
+        )
+    return {"model_name": model}
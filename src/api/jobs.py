@@ -0,0 +1,84 @@
+"""In-memory tracking for background generation jobs."""
+
+import asyncio
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import List, Optional
+
+
+class BatchJob:
+    """Progress of a single batch generation job."""
+
+    def __init__(self, count: int):
+        self.id = str(uuid.uuid4())
+        self.status = "pending"
+        self.count = count
+        self.completed = 0
+        self.failed = 0
+        self.post_ids: List[str] = []
+        self.errors: List[str] = []
+        self.stats: dict = {}
+        self.created_at = datetime.utcnow()
+        self.finished_at: Optional[datetime] = None
+        self.task: Optional[asyncio.Task] = None
+
+    def record_result(self, result: dict):
+        """Count a finished generation."""
+        if result.get("error"):
+            self.failed += 1
+            self.errors.append(result["error"])
+        else:
+            self.completed += 1
+
+    def finish(self, status: str, error: Optional[str] = None):
+        """Mark the job as finished."""
+        self.status = status
+        if error:
+            self.errors.append(error)
+        self.finished_at = datetime.utcnow()
+
+    def to_dict(self) -> dict:
+        """Serialize for the API response."""
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "count": self.count,
+            "completed": self.completed,
+            "failed": self.failed,
+            "post_ids": self.post_ids,
+            "errors": self.errors,
+            "stats": self.stats,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class JobStore:
+    """Keep the most recent jobs so the UI can poll them."""
+
+    def __init__(self, max_jobs: int = 100):
+        self.max_jobs = max_jobs
+        self._jobs: "OrderedDict[str, BatchJob]" = OrderedDict()
+
+    def create(self, count: int) -> BatchJob:
+        """Register a new job, evicting the oldest finished jobs past max_jobs."""
+        job = BatchJob(count)
+        self._jobs[job.id] = job
+
+        while len(self._jobs) > self.max_jobs:
+            oldest_id = next(
+                (job_id for job_id, j in self._jobs.items() if j.finished_at), None
+            )
+            if oldest_id is None:
+                break
+            del self._jobs[oldest_id]
+
+        return job
+
+    def get(self, job_id: str) -> Optional[BatchJob]:
+        """Get a job by ID."""
+        return self._jobs.get(job_id)
+
+
+batch_jobs = JobStore()
@@ -1,11 +1,13 @@
 """FastAPI application entry point."""
 
+import asyncio
 from contextlib import asynccontextmanager
 from datetime import datetime
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from src.api.models import HealthResponse
-from src.api.routes import generate, posts, queue, settings, trending, chat, auth, scheduler as scheduler_routes
+from src.llm.resilience import CircuitBreaker, breaker_states
+from src.api.routes import generate, posts, queue, settings, trending, chat, auth, llm, rag, scheduler as scheduler_routes
 
 
 @asynccontextmanager
@@ -13,6 +15,17 @@ async def lifespan(app: FastAPI):
     """Startup and shutdown events."""
     from src.scheduler import PostingScheduler
     from src.db.settings import SettingsDB
+    from src.rag.service import get_rag_service
+    from src.api.dependencies import get_generator
+    from src.generators.draft_pool import DraftPool
+    from src.utils.config import Config
+
+    app.state.rag = get_rag_service()
+    await asyncio.to_thread(app.state.rag.start)
+
+    if Config.DRAFT_POOL_ENABLED:
+        app.state.draft_pool = DraftPool(get_generator)
+        await app.state.draft_pool.start()
 
     settings_db = SettingsDB()
     config = settings_db.get_scheduler_config()
@@ -26,6 +39,11 @@ async def lifespan(app: FastAPI):
     if hasattr(app.state, "scheduler"):
         app.state.scheduler.stop()
 
+    if hasattr(app.state, "draft_pool"):
+        await app.state.draft_pool.stop()
+
+    app.state.rag.stop()
+
 
 app = FastAPI(
     title="x-generator",
@@ -50,6 +68,8 @@ app.include_router(trending.router)
 app.include_router(chat.router)
 app.include_router(auth.router)
 app.include_router(scheduler_routes.router)
+app.include_router(llm.router)
+app.include_router(rag.router)
 
 
 @app.get("/", response_model=HealthResponse)
@@ -64,11 +84,14 @@ async def root():
 
 @app.get("/health", response_model=HealthResponse)
 async def health_check():
-    """Health check endpoint for monitoring."""
+    """Health check endpoint for monitoring; degraded while any LLM provider's circuit breaker is open."""
+    breakers = breaker_states()
+    degraded = any(b["state"] == CircuitBreaker.OPEN for b in breakers.values())
     return HealthResponse(
-        status="healthy",
+        status="degraded" if degraded else "healthy",
         version="1.0.0",
         timestamp=datetime.utcnow(),
+        llm_providers=breakers,
     )
 
 
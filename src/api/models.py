@@ -1,9 +1,10 @@
 """Pydantic models for API requests and responses."""
 
 from datetime import datetime
-from typing import Optional, List
+from typing import Dict, Optional, List
 from pydantic import BaseModel, Field
 from enum import Enum
+from src.utils.config import Config
 
 
 class PostType(str, Enum):
@@ -51,6 +52,10 @@ class GenerateRequest(BaseModel):
         None,
         description="Stoic virtue: 'wisdom', 'courage', 'justice', 'temperance', 'general'. If not provided, randomly selects."
     )
+    model: Optional[str] = Field(
+        None,
+        description="LLM provider to try first: 'gpt4' or 'claude'. Fails over to the other one. Defaults to 'gpt4'."
+    )
 
 
 class GenerateReplyRequest(BaseModel):
@@ -59,6 +64,28 @@ class GenerateReplyRequest(BaseModel):
     username: Optional[str] = Field(None, description="Original tweet author username")
     include_examples: bool = Field(True, description="Include style examples")
     virtue: Optional[str] = Field(None, description="Stoic virtue for reply")
+    model: Optional[str] = Field(
+        None,
+        description="LLM provider to try first: 'gpt4' or 'claude'. Fails over to the other one. Defaults to 'gpt4'."
+    )
+
+
+class BatchGenerateRequest(BaseModel):
+    count: int = Field(..., ge=1, le=Config.BATCH_MAX_COUNT, description="Number of drafts to generate")
+    format_weights: Optional[Dict[str, int]] = Field(
+        None,
+        description="Format mix, e.g. {'short': 70, 'thread': 20, 'long': 10}. Defaults to the 70/20/10 weights."
+    )
+    virtue_weights: Optional[Dict[str, int]] = Field(
+        None,
+        description="Virtue mix, e.g. {'courage': 2, 'wisdom': 1}. Defaults to a uniform pick."
+    )
+    topic: Optional[str] = Field(None, description="Use one topic for every draft instead of random topics")
+    include_examples: bool = Field(True, description="Include style examples for threads")
+    model: Optional[str] = Field(
+        None,
+        description="LLM provider to try first: 'gpt4' or 'claude'. Fails over to the other one. Defaults to 'gpt4'."
+    )
 
 
 class CreatePostRequest(BaseModel):
@@ -88,6 +115,10 @@ class QueuePostRequest(BaseModel):
 class RefineRequest(BaseModel):
     content: str = Field(..., description="Content to refine")
     instruction: str = Field(..., description="How to refine the content")
+    model: Optional[str] = Field(
+        None,
+        description="LLM provider to try first: 'gpt4' or 'claude'. Fails over to the other one. Defaults to 'gpt4'."
+    )
 
 
 class SchedulerConfigRequest(BaseModel):
@@ -145,6 +176,19 @@ class GenerateResponse(BaseModel):
     post_id: Optional[str] = None
 
 
+class BatchJobResponse(BaseModel):
+    job_id: str
+    status: str
+    count: int
+    completed: int = 0
+    failed: int = 0
+    post_ids: List[str] = []
+    errors: List[str] = []
+    stats: dict = {}
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+
+
 class RefineResponse(BaseModel):
     content: str
     original: str
@@ -182,6 +226,7 @@ class HealthResponse(BaseModel):
     status: str
     version: str
     timestamp: datetime
+    llm_providers: Optional[Dict[str, Dict]] = None
 
 
 class ErrorResponse(BaseModel):
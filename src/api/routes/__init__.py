@@ -1,6 +1,6 @@
 """API routes for x-generator."""
 
-from src.api.routes import generate, posts, queue, settings, trending, chat, auth, scheduler
+from src.api.routes import generate, posts, queue, settings, trending, chat, auth, scheduler, llm, rag
 
 __all__ = [
     "generate",
@@ -11,4 +11,6 @@ __all__ = [
     "chat",
     "auth",
     "scheduler",
+    "llm",
+    "rag",
 ]
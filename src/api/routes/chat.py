@@ -1,24 +1,16 @@
 """LLM chat refinement routes."""
 
-from fastapi import APIRouter, HTTPException
+import time
+from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Query
 from src.api.models import RefineRequest, RefineResponse
-from src.generators.twitter_generator import TwitterGenerator
-from src.rag.retriever import Retriever
-from src.rag.vector_store import VectorStore
-from src.llm.openai_client import OpenAIClient
+from src.api.dependencies import get_generator, model_kwargs
+from src.api.streaming import sse_event, sse_response
 from src.utils.config import Config
 
 router = APIRouter(prefix="/chat", tags=["chat"])
 
 
-def get_generator():
-    """Initialize the Twitter generator with dependencies."""
-    vector_store = VectorStore()
-    retriever = Retriever(vector_store)
-    llm_client = OpenAIClient()
-    return TwitterGenerator(llm_client, retriever, Config)
-
-
 @router.post("/refine", response_model=RefineResponse)
 async def refine_content(request: RefineRequest):
     """
@@ -31,11 +23,13 @@ async def refine_content(request: RefineRequest):
     - "make it more casual"
     """
     try:
+        llm_kwargs = model_kwargs(request.model)
         generator = get_generator()
 
-        result = generator.refine(
+        result = await generator.arefine(
             content=request.content,
             instruction=request.instruction,
+            **llm_kwargs,
         )
 
         if result.get("error"):
@@ -48,45 +42,94 @@ async def refine_content(request: RefineRequest):
             model=result.get("model", "gpt4"),
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/refine/stream")
+async def refine_content_stream(request: RefineRequest):
+    """
+    Stream a refinement as Server-Sent Events.
+
+    Emits token events as text arrives, then a done event with the same
+    fields as POST /chat/refine plus ttft_ms/total_ms, or an error event.
+    """
+    llm_kwargs = model_kwargs(request.model)
+
+    async def events():
+        started = time.perf_counter()
+        ttft_ms = None
+
+        try:
+            generator = get_generator()
+            async for event in generator.arefine_stream(
+                content=request.content,
+                instruction=request.instruction,
+                **llm_kwargs,
+            ):
+                if event["event"] == "token" and ttft_ms is None:
+                    ttft_ms = round((time.perf_counter() - started) * 1000, 1)
+
+                if event["event"] == "result":
+                    data = dict(event["data"])
+                    data["ttft_ms"] = ttft_ms
+                    data["total_ms"] = round((time.perf_counter() - started) * 1000, 1)
+                    yield sse_event("done", data)
+                else:
+                    yield sse_event(event["event"], event["data"])
+        except Exception as e:
+            yield sse_event("error", {"error": str(e), "content": None, "original": request.content})
+
+    return sse_response(events())
+
+
 @router.post("/suggest")
-async def suggest_improvements(content: str):
-    """Get LLM suggestions for improving a post."""
+async def suggest_improvements(content: str, types: Optional[List[str]] = Query(None), model: Optional[str] = None):
+    """
+    Get LLM suggestions for improving a post.
+
+    All suggestion variants (Config.SUGGESTION_TYPES, optionally narrowed with
+    ?types=hook&types=clarity) run concurrently. Variants that fail or time out
+    are reported under "failed" instead of failing the whole request.
+    ?model= picks the provider to try first.
+    """
     try:
+        llm_kwargs = model_kwargs(model)
         generator = get_generator()
 
-        suggestions = []
+        suggestion_types = Config.SUGGESTION_TYPES
+        if types:
+            unknown = [t for t in types if t not in suggestion_types]
+            if unknown:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Unknown suggestion types: {', '.join(unknown)}",
+                )
+            suggestion_types = {t: suggestion_types[t] for t in types}
 
-        prompts = [
-            ("hook", "Suggest a more engaging hook for this stoic post"),
-            ("clarity", "Suggest how to make this clearer and more accessible"),
-            ("action", "Suggest an actionable takeaway to add"),
-        ]
+        started = time.perf_counter()
+        results = await generator.asuggest(content, suggestion_types, **llm_kwargs)
+        total_ms = round((time.perf_counter() - started) * 1000, 1)
 
-        for suggestion_type, instruction in prompts:
-            result = generator.refine(
-                content=content,
-                instruction=instruction,
-            )
-            if not result.get("error"):
-                suggestions.append({
-                    "type": suggestion_type,
-                    "suggestion": result.get("content", ""),
-                })
-
-        return {"suggestions": suggestions}
+        return {
+            "suggestions": [r for r in results if "suggestion" in r],
+            "failed": [r for r in results if "error" in r],
+            "latency_ms": total_ms,
+        }
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.post("/virtue-shift")
-async def shift_virtue(content: str, target_virtue: str):
+async def shift_virtue(content: str, target_virtue: str, model: Optional[str] = None):
     """Reframe content to emphasize a different stoic virtue."""
     try:
+        llm_kwargs = model_kwargs(model)
         generator = get_generator()
 
         virtue_descriptions = {
@@ -98,9 +141,10 @@ async def shift_virtue(content: str, target_virtue: str):
 
         instruction = f"Reframe this to emphasize {virtue_descriptions.get(target_virtue, target_virtue)}"
 
-        result = generator.refine(
+        result = await generator.arefine(
             content=content,
             instruction=instruction,
+            **llm_kwargs,
         )
 
         if result.get("error"):
@@ -112,5 +156,7 @@ async def shift_virtue(content: str, target_virtue: str):
             "target_virtue": target_virtue,
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -1,109 +1,265 @@
 """Content generation routes."""
 
-from fastapi import APIRouter, HTTPException
+import asyncio
+import time
+from typing import List, Optional, Tuple
+from fastapi import APIRouter, HTTPException, Request
 from src.api.models import (
+    BatchGenerateRequest,
+    BatchJobResponse,
     GenerateRequest,
     GenerateReplyRequest,
     GenerateResponse,
 )
 from src.db.posts import PostsDB
-from src.generators.twitter_generator import TwitterGenerator
-from src.llm.openai_client import OpenAIClient
+from src.generators.batch import BatchGenerator
 from src.utils.config import Config
-
-# Optional RAG imports - may not be available on all Python versions
-try:
-    from src.rag.retriever import Retriever
-    from src.rag.vector_store import VectorStore
-    RAG_AVAILABLE = True
-except ImportError:
-    Retriever = None
-    VectorStore = None
-    RAG_AVAILABLE = False
+from src.api.dependencies import get_generator, model_kwargs
+from src.api.jobs import BatchJob, batch_jobs
+from src.api.streaming import sse_event, sse_response
 
 router = APIRouter(prefix="/generate", tags=["generate"])
 
 
-def get_generator():
-    """Initialize the Twitter generator with dependencies."""
-    retriever = None
-    if RAG_AVAILABLE:
-        vector_store = VectorStore()
-        retriever = Retriever(vector_store)
-    llm_client = OpenAIClient()
-    return TwitterGenerator(llm_client, retriever, Config)
+def _citations_list(result: dict) -> Optional[List[dict]]:
+    """Convert the generator's citation text into a list of sources."""
+    citations_str = result.get("citations", "")
+    if not citations_str:
+        return None
+    return [{"source": line.strip("- ").strip()}
+            for line in citations_str.strip().split("\n")[1:]
+            if line.strip()]
+
+
+def _original_post_data(result: dict, topic: Optional[str]) -> dict:
+    """Build the posts row for a generated original post."""
+    return {
+        "content": result.get("content", ""),
+        "topic": result.get("topic", topic),
+        "post_type": "original",
+        "format_type": result.get("format_type", "short"),
+        "virtue": result.get("virtue", "general"),
+        "tweets": result.get("tweets", []),
+        "tweet_count": result.get("tweet_count", 1),
+        "model": result.get("model", "gpt4"),
+        "citations": {"sources": result.get("citations", [])},
+        "status": "pending_review"
+    }
+
+
+def _generate_response(result: dict, topic: Optional[str], saved_post: Optional[dict]) -> GenerateResponse:
+    """Build the API response for a generated original post."""
+    return GenerateResponse(
+        content=result.get("content", ""),
+        tweets=result.get("tweets", []),
+        format_type=result.get("format_type", "short"),
+        virtue=result.get("virtue", "general"),
+        tweet_count=result.get("tweet_count", 1),
+        topic=result.get("topic", topic),
+        model=result.get("model", "gpt4"),
+        citations=_citations_list(result),
+        post_id=saved_post.get("id") if saved_post else None
+    )
+
+
+def _take_pooled_draft(
+    http_request: Request, request: GenerateRequest, generator
+) -> Tuple[Optional[dict], Optional[str], Optional[str]]:
+    """
+    Serve a pre-generated draft when the request has no topic/example/model constraints.
+
+    Returns:
+        (draft or None on a miss, virtue, format_type). On a miss the virtue and
+        format picked for the bucket are returned so the live fallback keeps the
+        70/20/10 mix instead of rolling again.
+    """
+    pool = getattr(http_request.app.state, "draft_pool", None)
+    if pool is None or request.topic or not request.include_examples or request.model:
+        return None, request.virtue, request.format_type
+
+    virtue = request.virtue or generator._select_virtue()
+    format_type = request.format_type or generator._select_format()
+    return pool.take(virtue=virtue, format_type=format_type), virtue, format_type
 
 
 @router.post("", response_model=GenerateResponse)
-async def generate_post(request: GenerateRequest):
-    """Generate a new stoic-themed post using 70/20/10 engagement strategy."""
+async def generate_post(request: GenerateRequest, http_request: Request):
+    """
+    Generate a new stoic-themed post using 70/20/10 engagement strategy.
+
+    Served instantly from the draft pool when it is enabled and the request
+    doesn't pin a topic; otherwise generated live.
+    """
     try:
+        llm_kwargs = model_kwargs(request.model)
         generator = get_generator()
 
-        result = generator.generate(
-            topic=request.topic or "stoic wisdom for daily life",
-            include_examples=request.include_examples,
-            format_type=request.format_type,
-            virtue=request.virtue,
-        )
+        result, virtue, format_type = _take_pooled_draft(http_request, request, generator)
+        if result is None:
+            result = await generator.agenerate(
+                topic=request.topic or "stoic wisdom for daily life",
+                include_examples=request.include_examples,
+                format_type=format_type,
+                virtue=virtue,
+                **llm_kwargs,
+            )
 
         if result.get("error"):
             raise HTTPException(status_code=500, detail=result["error"])
 
-        tweets = result.get("tweets", [])
-        content = result.get("content", "")
-        format_type = result.get("format_type", "short")
-        virtue = result.get("virtue", "general")
-        tweet_count = result.get("tweet_count", 1)
+        posts_db = PostsDB()
+        saved_post = posts_db.create(_original_post_data(result, request.topic))
+
+        return _generate_response(result, request.topic, saved_post)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/stream")
+async def generate_post_stream(request: GenerateRequest):
+    """
+    Stream a generated post as Server-Sent Events.
+
+    Events:
+    - start: resolved format_type, virtue and topic
+    - token: raw text as it arrives from the LLM
+    - tweet: each thread tweet as soon as its "N/" boundary closes
+    - done: the saved post (same shape as POST /generate) plus ttft_ms/total_ms
+    - error: generation or persistence failure
+    """
+    llm_kwargs = model_kwargs(request.model)
+
+    async def events():
+        started = time.perf_counter()
+        ttft_ms = None
+
+        try:
+            generator = get_generator()
+            async for event in generator.agenerate_stream(
+                topic=request.topic or "stoic wisdom for daily life",
+                include_examples=request.include_examples,
+                format_type=request.format_type,
+                virtue=request.virtue,
+                **llm_kwargs,
+            ):
+                if event["event"] == "token" and ttft_ms is None:
+                    ttft_ms = round((time.perf_counter() - started) * 1000, 1)
+
+                if event["event"] != "result":
+                    yield sse_event(event["event"], event["data"])
+                    continue
+
+                result = event["data"]
+                try:
+                    posts_db = PostsDB()
+                    saved_post = await asyncio.to_thread(
+                        posts_db.create, _original_post_data(result, request.topic)
+                    )
+                except Exception as e:
+                    yield sse_event("error", {"error": str(e)})
+                    return
+
+                response = _generate_response(result, request.topic, saved_post).model_dump()
+                response["ttft_ms"] = ttft_ms
+                response["total_ms"] = round((time.perf_counter() - started) * 1000, 1)
+                yield sse_event("done", response)
+        except Exception as e:
+            yield sse_event("error", {"error": str(e)})
+
+    return sse_response(events())
+
+
+async def _run_batch_job(job: BatchJob, request: BatchGenerateRequest):
+    """Generate a batch of drafts and save them with one bulk insert."""
+    job.status = "running"
+    started = time.perf_counter()
 
+    try:
+        batch = BatchGenerator(get_generator())
+        plan = batch.plan(
+            request.count,
+            format_weights=request.format_weights,
+            virtue_weights=request.virtue_weights,
+            topic=request.topic,
+        )
+        results = await batch.generate(
+            plan,
+            include_examples=request.include_examples,
+            on_result=job.record_result,
+            **model_kwargs(request.model),
+        )
+
+        rows = [_original_post_data(r, request.topic) for r in results if not r.get("error")]
         posts_db = PostsDB()
-        post_data = {
-            "content": content,
-            "topic": result.get("topic", request.topic),
-            "post_type": "original",
-            "format_type": format_type,
-            "virtue": virtue,
-            "tweets": tweets,
-            "tweet_count": tweet_count,
-            "model": result.get("model", "gpt4"),
-            "citations": {"sources": result.get("citations", [])},
-            "status": "pending_review"
+        saved = await asyncio.to_thread(posts_db.create_many, rows)
+
+        job.post_ids = [post["id"] for post in saved if post.get("id")]
+        job.stats = {
+            **batch.get_stats(),
+            "elapsed_seconds": round(time.perf_counter() - started, 2),
         }
-        saved_post = posts_db.create(post_data)
+        job.finish("completed")
 
-        citations_str = result.get("citations", "")
-        citations_list = None
-        if citations_str:
-            citations_list = [{"source": line.strip("- ").strip()}
-                             for line in citations_str.strip().split("\n")[1:]
-                             if line.strip()]
+    except Exception as e:
+        job.finish("failed", str(e))
 
-        return GenerateResponse(
-            content=content,
-            tweets=tweets,
-            format_type=format_type,
-            virtue=virtue,
-            tweet_count=tweet_count,
-            topic=result.get("topic", request.topic),
-            model=result.get("model", "gpt4"),
-            citations=citations_list,
-            post_id=saved_post.get("id") if saved_post else None
+
+@router.post("/batch", response_model=BatchJobResponse, status_code=202)
+async def generate_batch(request: BatchGenerateRequest):
+    """
+    Generate several drafts in the background and return a job to poll.
+
+    Drafts are generated with bounded concurrency (BATCH_CONCURRENCY), share
+    retrieval for repeated topics, and are saved in one bulk insert.
+    """
+    unknown_formats = set(request.format_weights or {}) - set(Config.POST_FORMAT_WEIGHTS)
+    unknown_virtues = set(request.virtue_weights or {}) - set(Config.VIRTUES)
+    if unknown_formats or unknown_virtues:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown format/virtue weights: {', '.join(sorted(unknown_formats | unknown_virtues))}",
         )
 
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    model_kwargs(request.model)
+
+    job = batch_jobs.create(request.count)
+    job.task = asyncio.create_task(_run_batch_job(job, request))
+    return BatchJobResponse(**job.to_dict())
+
+
+@router.get("/batch/{job_id}", response_model=BatchJobResponse)
+async def get_batch_job(job_id: str):
+    """Get progress and results for a batch generation job."""
+    job = batch_jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Batch job not found")
+    return BatchJobResponse(**job.to_dict())
+
+
+@router.get("/pool")
+async def get_draft_pool_stats(http_request: Request):
+    """Get draft pool hit/miss metrics and bucket sizes."""
+    pool = getattr(http_request.app.state, "draft_pool", None)
+    if pool is None:
+        return {"enabled": False}
+    return {"enabled": True, **pool.get_stats()}
 
 
 @router.post("/reply", response_model=GenerateResponse)
 async def generate_reply(request: GenerateReplyRequest):
     """Generate a stoic reply to a tweet (always 280 characters or less)."""
     try:
+        llm_kwargs = model_kwargs(request.model)
         generator = get_generator()
 
-        result = generator.generate_reply(
+        result = await generator.agenerate_reply(
             original_content=request.tweet_text,
             username=request.username or "user",
             virtue=request.virtue,
+            **llm_kwargs,
         )
 
         if result.get("error"):
@@ -131,13 +287,6 @@ async def generate_reply(request: GenerateReplyRequest):
         }
         saved_post = posts_db.create(post_data)
 
-        citations_str = result.get("citations", "")
-        citations_list = None
-        if citations_str:
-            citations_list = [{"source": line.strip("- ").strip()}
-                             for line in citations_str.strip().split("\n")[1:]
-                             if line.strip()]
-
         return GenerateResponse(
             content=reply_content,
             tweets=tweets,
@@ -146,9 +295,11 @@ async def generate_reply(request: GenerateReplyRequest):
             tweet_count=1,
             topic=post_data["topic"],
             model=result.get("model", "gpt4"),
-            citations=citations_list,
+            citations=_citations_list(result),
             post_id=saved_post.get("id") if saved_post else None
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,75 @@
+"""LLM usage, call ledger, routing, rate-limit, response-cache and prompt-cache routes."""
+
+from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Query
+from src.api.dependencies import get_llm_client
+from src.llm.cache_stats import prompt_cache_stats
+from src.llm.ledger import GROUP_FIELDS, llm_ledger
+from src.llm.rate_limit import rate_limiter
+from src.llm.response_cache import get_response_cache
+
+router = APIRouter(prefix="/llm", tags=["llm"])
+
+
+@router.get("/calls")
+async def get_llm_calls(
+    limit: int = Query(100, ge=1, le=1000),
+    provider: Optional[str] = None,
+    format_type: Optional[str] = None,
+    virtue: Optional[str] = None,
+    status: Optional[str] = None,
+):
+    """Get the most recent LLM calls with tokens, latency, TTFT and estimated cost."""
+    return llm_ledger.get_records(limit, provider=provider, format_type=format_type, virtue=virtue, status=status)
+
+
+@router.get("/calls/summary")
+async def get_llm_calls_summary(group_by: List[str] = Query(["format_type", "virtue"])):
+    """Get p50/p95 latency, tokens and cost of the recent LLM calls per group."""
+    invalid = [field for field in group_by if field not in GROUP_FIELDS]
+    if invalid:
+        raise HTTPException(status_code=400, detail=f"Cannot group by {invalid}; expected any of {list(GROUP_FIELDS)}")
+    return llm_ledger.summary(group_by)
+
+
+@router.get("/prompt-cache")
+async def get_prompt_cache_stats():
+    """Get Anthropic prompt-cache hit ratio, token counts and latency split."""
+    return prompt_cache_stats.get_stats()
+
+
+@router.get("/router")
+async def get_router_stats():
+    """Get provider routing stats: hedges, hedge wins, failovers and per-provider latency."""
+    try:
+        return get_llm_client().get_stats()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/rate-limits")
+async def get_rate_limit_stats():
+    """Get per provider/model RPM/TPM headroom, queue depth and time spent waiting."""
+    return rate_limiter.get_stats()
+
+
+@router.get("/response-cache")
+async def get_response_cache_stats():
+    """Get response-cache size, hit ratio, bypassed calls and LLM latency saved."""
+    cache = get_response_cache()
+    if cache is None:
+        return {"enabled": False}
+    return cache.get_stats()
+
+
+@router.delete("/response-cache")
+async def clear_response_cache():
+    """Drop every cached response (e.g. after changing prompt templates)."""
+    cache = get_response_cache()
+    if cache is None:
+        return {"enabled": False, "cleared": False}
+    try:
+        cache.clear()
+        return {"enabled": True, "cleared": True}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,12 @@
+"""RAG service status routes."""
+
+from fastapi import APIRouter
+from src.rag.service import get_rag_service
+
+router = APIRouter(prefix="/rag", tags=["rag"])
+
+
+@router.get("/stats")
+async def get_rag_stats():
+    """Get vector store counts, startup timings and retrieval cache statistics."""
+    return get_rag_service().get_stats()
@@ -0,0 +1,23 @@
+"""Server-Sent Events helpers for streaming routes."""
+
+import json
+from typing import AsyncIterator
+from fastapi.responses import StreamingResponse
+
+
+def sse_event(event: str, data: dict) -> str:
+    """Format a single Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+def sse_response(events: AsyncIterator[str]) -> StreamingResponse:
+    """Wrap an async iterator of formatted events in a streaming response."""
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            # Stop nginx from buffering the stream behind the /api/ proxy
+            "X-Accel-Buffering": "no",
+        },
+    )
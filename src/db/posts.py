@@ -26,6 +26,16 @@ class PostsDB:
         result = self.client.table("posts").insert(data).execute()
         return result.data[0] if result.data else None
 
+    def create_many(self, rows: List[dict]) -> List[dict]:
+        """Create several posts in a single insert request."""
+        if not rows:
+            return []
+        for data in rows:
+            if "content" in data:
+                data["content_hash"] = content_hash(data["content"])
+        result = self.client.table("posts").insert(rows).execute()
+        return result.data or []
+
     def is_duplicate(self, content: str, days_lookback: int = 30) -> bool:
         """Check if similar content was posted recently."""
         hash_value = content_hash(content)
@@ -1,5 +1,7 @@
 """Content generators."""
 
 from src.generators.twitter_generator import TwitterGenerator
+from src.generators.batch import BatchGenerator
+from src.generators.draft_pool import DraftPool
 
-__all__ = ["TwitterGenerator"]
+__all__ = ["TwitterGenerator", "BatchGenerator", "DraftPool"]
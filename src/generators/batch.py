@@ -0,0 +1,139 @@
+"""Batch generation for filling a day's queue in one call."""
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional
+from src.generators.twitter_generator import TwitterGenerator
+from src.llm.rate_limit import BACKGROUND, llm_priority
+
+
+class MemoizedRetriever:
+    """
+    Retriever proxy that runs each distinct lookup once.
+
+    Concurrent callers asking for the same (method, query, k) wait on the
+    first caller's result instead of querying the vector store again.
+    """
+
+    def __init__(self, retriever):
+        self._retriever = retriever
+        self._lock = threading.Lock()
+        self._results: Dict[tuple, Future] = {}
+        self.lookups = 0
+        self.deduplicated = 0
+
+    def _memoized(self, method: str, query: str, k: int, kwargs: dict):
+        key = (method, query, k, tuple(sorted(kwargs.items())))
+
+        with self._lock:
+            future = self._results.get(key)
+            is_owner = future is None
+            if is_owner:
+                future = Future()
+                self._results[key] = future
+                self.lookups += 1
+            else:
+                self.deduplicated += 1
+
+        if is_owner:
+            try:
+                future.set_result(getattr(self._retriever, method)(query, k=k, **kwargs))
+            except Exception as e:
+                future.set_exception(e)
+
+        return future.result()
+
+    def retrieve_knowledge(self, query: str, k: int = 3, **kwargs) -> List[Dict]:
+        return self._memoized("retrieve_knowledge", query, k, kwargs)
+
+    def retrieve_style_examples(self, query: str, k: int = 2, **kwargs) -> List[Dict]:
+        return self._memoized("retrieve_style_examples", query, k, kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._retriever, name)
+
+
+class BatchGenerator:
+    """Generate many drafts with bounded concurrency and shared retrieval."""
+
+    def __init__(self, generator: TwitterGenerator, concurrency: int = None):
+        """
+        Args:
+            generator: Generator whose LLM client and retriever are used
+            concurrency: Maximum generations in flight (defaults to Config.BATCH_CONCURRENCY)
+        """
+        self.concurrency = concurrency or generator.config.BATCH_CONCURRENCY
+        self.retriever = MemoizedRetriever(generator.retriever) if generator.retriever else None
+        self.generator = TwitterGenerator(generator.llm, self.retriever, generator.config)
+
+    def plan(
+        self,
+        count: int,
+        format_weights: Optional[Dict[str, int]] = None,
+        virtue_weights: Optional[Dict[str, int]] = None,
+        topic: Optional[str] = None,
+    ) -> List[Dict]:
+        """
+        Pick format, virtue and topic for each draft up front.
+
+        Uses the same weighted selection as single generations, so a batch
+        follows the 70/20/10 mix unless other weights are given.
+        """
+        items = []
+        for _ in range(count):
+            format_type = self.generator._select_format(format_weights)
+            virtue = self.generator._select_virtue(virtue_weights)
+            items.append({
+                "format_type": format_type,
+                "virtue": virtue,
+                "topic": topic or self.generator._get_random_topic(virtue),
+            })
+        return items
+
+    async def generate(
+        self,
+        plan: List[Dict],
+        include_examples: bool = True,
+        on_result: Optional[Callable[[Dict], None]] = None,
+        model_name: str = "gpt4",
+    ) -> List[Dict]:
+        """
+        Generate every planned draft.
+
+        Args:
+            plan: Items from plan()
+            include_examples: Include style examples for threads
+            on_result: Called with each result as it finishes (for progress)
+            model_name: Provider to try first for every draft
+
+        Returns:
+            Results in plan order, in the same shape as TwitterGenerator.agenerate()
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def run(item: Dict) -> Dict:
+            async with semaphore:
+                result = await self.generator.agenerate(
+                    topic=item["topic"],
+                    include_examples=include_examples,
+                    format_type=item["format_type"],
+                    virtue=item["virtue"],
+                    model_name=model_name,
+                )
+            if on_result:
+                on_result(result)
+            return result
+
+        # Bulk work queues behind interactive requests at the rate limiter
+        with llm_priority(BACKGROUND):
+            return await asyncio.gather(*(run(item) for item in plan))
+
+    def get_stats(self) -> Dict:
+        """Get retrieval deduplication counts for this batch."""
+        if not self.retriever:
+            return {"retrieval_lookups": 0, "retrieval_deduplicated": 0}
+        return {
+            "retrieval_lookups": self.retriever.lookups,
+            "retrieval_deduplicated": self.retriever.deduplicated,
+        }
@@ -0,0 +1,171 @@
+"""Pool of pre-generated drafts kept warm by a background worker."""
+
+import asyncio
+import itertools
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+from src.generators.twitter_generator import TwitterGenerator
+from src.llm.rate_limit import BACKGROUND, llm_priority
+from src.utils.config import Config
+
+Bucket = Tuple[str, str]
+
+
+class DraftPool:
+    """
+    Keep a few ready drafts per (virtue, format_type) bucket.
+
+    A background task tops up any bucket that drops below the low watermark
+    and evicts drafts older than the TTL, so /generate can hand out a draft
+    instantly instead of waiting on the LLM.
+    """
+
+    def __init__(
+        self,
+        generator_factory: Callable[[], TwitterGenerator],
+        config: Config = None,
+        buckets: Optional[List[Bucket]] = None,
+    ):
+        """
+        Args:
+            generator_factory: Returns the TwitterGenerator used for refills
+            config: Pool sizing and TTL settings (defaults to Config)
+            buckets: (virtue, format_type) pairs to keep warm; defaults to every
+                virtue crossed with every weighted format
+        """
+        self.config = config or Config
+        self.generator_factory = generator_factory
+        self.buckets = buckets or list(
+            itertools.product(self.config.VIRTUES, self.config.POST_FORMAT_WEIGHTS)
+        )
+        self.target_size = self.config.DRAFT_POOL_TARGET_SIZE
+        self.low_watermark = min(self.config.DRAFT_POOL_LOW_WATERMARK, self.target_size)
+        self.ttl_seconds = self.config.DRAFT_POOL_TTL_SECONDS
+
+        self._drafts: Dict[Bucket, Deque[Tuple[float, Dict]]] = {b: deque() for b in self.buckets}
+        self._refill_needed = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._semaphore = asyncio.Semaphore(self.config.DRAFT_POOL_CONCURRENCY)
+
+        self.hits = 0
+        self.misses = 0
+        self.generated = 0
+        self.failed = 0
+        self.evicted = 0
+
+    async def start(self):
+        """Start the background refill worker."""
+        if self._task is None:
+            self._refill_needed.set()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the background refill worker."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def take(self, virtue: str, format_type: str) -> Optional[Dict]:
+        """
+        Pop the oldest fresh draft for a bucket.
+
+        Returns:
+            A result dictionary in the TwitterGenerator.generate() shape, or None
+            on a miss (unknown bucket or nothing ready)
+        """
+        drafts = self._drafts.get((virtue, format_type))
+        self._evict_expired()
+
+        if not drafts:
+            self.misses += 1
+            if drafts is not None:
+                self._refill_needed.set()
+            return None
+
+        _, result = drafts.popleft()
+        self.hits += 1
+        if len(drafts) < self.low_watermark:
+            self._refill_needed.set()
+        return result
+
+    def _evict_expired(self):
+        """Drop drafts older than the TTL."""
+        cutoff = time.monotonic() - self.ttl_seconds
+        for drafts in self._drafts.values():
+            while drafts and drafts[0][0] < cutoff:
+                drafts.popleft()
+                self.evicted += 1
+
+    async def _run(self):
+        """Refill low buckets whenever take() signals or the interval elapses."""
+        while True:
+            try:
+                await asyncio.wait_for(
+                    self._refill_needed.wait(), timeout=self.config.DRAFT_POOL_REFILL_INTERVAL
+                )
+            except asyncio.TimeoutError:
+                pass
+
+            # Only cancellation may end the worker; anything else is retried next round
+            try:
+                self._refill_needed.clear()
+                self._evict_expired()
+
+                missing = [
+                    bucket
+                    for bucket, drafts in self._drafts.items()
+                    if len(drafts) < self.low_watermark
+                    for _ in range(self.target_size - len(drafts))
+                ]
+                if missing:
+                    await self._refill(missing)
+            except Exception as e:
+                self.failed += 1
+                print(f"Draft pool refill failed: {e}")
+
+    async def _refill(self, missing: List[Bucket]):
+        """Generate one draft per entry in missing, with bounded concurrency."""
+        generator = self.generator_factory()
+
+        async def fill(bucket: Bucket):
+            virtue, format_type = bucket
+            async with self._semaphore:
+                try:
+                    result = await generator.agenerate(virtue=virtue, format_type=format_type)
+                except Exception as e:
+                    result = {"error": str(e)}
+
+            if result.get("error"):
+                self.failed += 1
+                return
+            self.generated += 1
+            self._drafts[bucket].append((time.monotonic(), result))
+
+        # Refills queue behind interactive requests at the rate limiter
+        with llm_priority(BACKGROUND):
+            await asyncio.gather(*(fill(bucket) for bucket in missing))
+
+    def get_stats(self) -> Dict:
+        """Get hit/miss metrics and current bucket sizes."""
+        lookups = self.hits + self.misses
+        return {
+            "running": self._task is not None,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else None,
+            "generated": self.generated,
+            "failed": self.failed,
+            "evicted": self.evicted,
+            "target_size": self.target_size,
+            "low_watermark": self.low_watermark,
+            "ttl_seconds": self.ttl_seconds,
+            "buckets": {
+                f"{virtue}/{format_type}": len(drafts)
+                for (virtue, format_type), drafts in self._drafts.items()
+            },
+        }
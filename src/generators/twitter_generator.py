@@ -1,7 +1,11 @@
+import asyncio
 import random
 import re
-from typing import Dict, List, Optional
-from src.llm.prompt_templates import build_format_prompt, build_refine_prompt, get_system_prompt
+import time
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from src.llm.ledger import llm_call_context
+from src.llm.prompt_templates import build_format_messages, build_refine_prompt, get_system_prompt
+from src.llm.response_cache import get_response_cache, response_cache_key
 from src.utils.config import Config
 
 # Optional RAG import - may not be available on all Python versions
@@ -12,32 +16,195 @@ except ImportError:
     Retriever = None
     RAG_AVAILABLE = False
 
+# Matches the "N/" (or "N." / "N)") marker that starts each tweet in a thread
+THREAD_BOUNDARY_PATTERN = r'(?:^|\n)\s*(\d+)[\/\.\)]\s*'
+
+# Topics picked when a post has none, keyed by virtue
+VIRTUE_TOPICS = {
+    "wisdom": [
+        "practical wisdom in daily decisions",
+        "discernment between good and bad",
+        "clear thinking without bias",
+        "understanding what truly matters",
+    ],
+    "courage": [
+        "facing fears with composure",
+        "standing up for what's right",
+        "enduring hardship gracefully",
+        "speaking truth when difficult",
+    ],
+    "justice": [
+        "treating others with dignity",
+        "fulfilling duties to community",
+        "fairness in daily interactions",
+        "contributing to the common good",
+    ],
+    "temperance": [
+        "self-control in modern life",
+        "moderation with technology",
+        "mastering impulses and reactions",
+        "finding balance in desires",
+    ],
+    "general": [
+        "amor fati - loving your fate",
+        "memento mori - awareness of mortality",
+        "dichotomy of control",
+        "living according to nature",
+        "finding inner peace",
+        "building resilience",
+    ],
+}
+
+
+def clean_thread_tweet(tweet: str) -> str:
+    """Strip quotes/whitespace from a thread tweet and cap it at 280 characters."""
+    tweet = tweet.strip().strip('"\'')
+    if len(tweet) > 280:
+        tweet = tweet[:277] + "..."
+    return tweet
+
+
+class ThreadStreamParser:
+    """
+    Incremental version of TwitterGenerator._parse_thread_tweets.
+
+    Feed streamed text chunks in; a tweet is emitted as soon as the next
+    "N/" boundary closes it. finish() flushes the final tweet.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self.emitted = 0
+
+    def feed(self, text: str) -> List[str]:
+        """Add a chunk of streamed text and return any newly completed tweets."""
+        self.buffer += text
+        parts = re.split(THREAD_BOUNDARY_PATTERN, self.buffer)
+
+        # parts = [preamble, num, tweet, num, tweet, ...]; the last tweet is still open
+        closed = [parts[i] for i in range(2, len(parts) - 2, 2)]
+        return self._emit(closed)
+
+    def finish(self) -> List[str]:
+        """Flush the final tweet once the stream has ended."""
+        parts = re.split(THREAD_BOUNDARY_PATTERN, self.buffer)
+        return self._emit([parts[i] for i in range(2, len(parts), 2)])
+
+    def _emit(self, raw_tweets: List[str]) -> List[str]:
+        """Return cleaned tweets that haven't been emitted yet."""
+        tweets = [clean_thread_tweet(t) for t in raw_tweets]
+        tweets = [t for t in tweets if t]
+        new = tweets[self.emitted:]
+        self.emitted = len(tweets)
+        return new
+
 
 class TwitterGenerator:
     """Generate Twitter/X posts with stoic perspective using 70/20/10 engagement strategy."""
 
-    def __init__(self, llm_client, retriever=None, config: Config = None):
+    def __init__(self, llm_client, retriever=None, config: Config = None, response_cache=None):
         self.llm = llm_client
         self.retriever = retriever
         self.config = config or Config
+        self.response_cache = response_cache if response_cache is not None else get_response_cache()
+
+    def _llm(self, model_name: str):
+        """The client for one call; a router is pinned to the requested model."""
+        for_model = getattr(self.llm, "for_model", None)
+        return for_model(model_name) if for_model else self.llm
+
+    @staticmethod
+    def _served_by(llm, model_name: str) -> str:
+        """The provider that actually answered, which differs from model_name after a hedge or failover."""
+        return getattr(llm, "served_by", None) or model_name
+
+    def _sampling_pinned(self, temperature: Optional[float]) -> bool:
+        """Whether a generation may be cached: opted in and decoding is deterministic."""
+        return self.config.LLM_RESPONSE_CACHE_GENERATE and temperature == 0
+
+    def _refine_temperature(self) -> float:
+        """Refinements decode greedily while the response cache is on, so a cached edit is the edit."""
+        return 0.0 if self.response_cache is not None else 0.7
+
+    def _response_key(self, model_name: str, cacheable: bool, request: Dict) -> Optional[str]:
+        """Response-cache key for a call, or None when the cache is off or the call depends on sampling."""
+        if self.response_cache is None:
+            return None
+        if not cacheable:
+            self.response_cache.record_bypass()
+            return None
+        return response_cache_key(
+            model_name, request["system"], request["prompt"], request["max_tokens"], request["temperature"]
+        )
+
+    def _call_llm(self, model_name: str, cacheable: bool = False, labels: Optional[Dict] = None, **request) -> Tuple[str, str]:
+        """
+        Call the LLM pinned to model_name, through the response cache when cacheable.
 
-    def _select_format(self) -> str:
+        Args:
+            model_name: Requested provider
+            cacheable: Whether the response may come from / go to the response cache
+            labels: format_type / virtue for the LLM call ledger
+            **request: prompt, system, max_tokens and temperature
+
+        Returns:
+            The response text and the provider that produced it
+        """
+        key = self._response_key(model_name, cacheable, request)
+        cached = self.response_cache.get(key) if key else None
+        if cached:
+            return cached["text"], cached["model"]
+
+        llm = self._llm(model_name)
+        started = time.perf_counter()
+        with llm_call_context(**(labels or {})):
+            text = llm.generate(**request)
+        served_by = self._served_by(llm, model_name)
+        if key:
+            self.response_cache.put(key, text, served_by, (time.perf_counter() - started) * 1000)
+        return text, served_by
+
+    async def _acall_llm(self, model_name: str, cacheable: bool = False, labels: Optional[Dict] = None, **request) -> Tuple[str, str]:
+        """Async version of _call_llm()."""
+        key = self._response_key(model_name, cacheable, request)
+        cached = self.response_cache.get(key) if key else None
+        if cached:
+            return cached["text"], cached["model"]
+
+        llm = self._llm(model_name)
+        started = time.perf_counter()
+        with llm_call_context(**(labels or {})):
+            text = await llm.agenerate(**request)
+        served_by = self._served_by(llm, model_name)
+        if key:
+            self.response_cache.put(key, text, served_by, (time.perf_counter() - started) * 1000)
+        return text, served_by
+
+    def _select_format(self, weights: Optional[Dict[str, int]] = None) -> str:
         """Weighted random selection based on 70/20/10 engagement strategy."""
-        weights = self.config.POST_FORMAT_WEIGHTS
+        return self._weighted_choice(weights or self.config.POST_FORMAT_WEIGHTS, "short")
+
+    def _select_virtue(self, weights: Optional[Dict[str, int]] = None) -> str:
+        """Randomly select a stoic virtue, optionally weighted."""
+        if weights:
+            return self._weighted_choice(weights, "general")
+        return random.choice(self.config.VIRTUES)
+
+    @staticmethod
+    def _weighted_choice(weights: Dict[str, int], default: str) -> str:
+        """Pick a key from a {choice: weight} mapping."""
         total = sum(weights.values())
+        if total <= 0:
+            return default
         roll = random.randint(1, total)
 
         cumulative = 0
-        for format_type, weight in weights.items():
+        for choice, weight in weights.items():
             cumulative += weight
             if roll <= cumulative:
-                return format_type
+                return choice
 
-        return "short"
-
-    def _select_virtue(self) -> str:
-        """Randomly select a stoic virtue."""
-        return random.choice(self.config.VIRTUES)
+        return default
 
     def _get_max_tokens(self, format_type: str) -> int:
         """Get the appropriate max_tokens for a format type."""
@@ -49,27 +216,14 @@ class TwitterGenerator:
         }
         return token_limits.get(format_type, self.config.TWEET_MAX_TOKENS)
 
-    def generate(
+    def _prepare_generation(
         self,
         topic: str = None,
-        model_name: str = "gpt4",
         include_examples: bool = True,
         format_type: str = None,
         virtue: str = None,
     ) -> Dict:
-        """
-        Generate Twitter/X content based on format type and virtue.
-
-        Args:
-            topic: The topic for the content
-            model_name: Which model to use ('claude' or 'gpt4')
-            include_examples: Whether to include style examples (only for threads)
-            format_type: 'short', 'thread', 'long', or None for weighted random
-            virtue: 'wisdom', 'courage', 'justice', 'temperance', 'general', or None for random
-
-        Returns:
-            Dictionary with content, format_type, virtue, tweets array, and metadata
-        """
+        """Resolve format/virtue/topic, run retrieval and build the LLM prompt."""
         if format_type is None:
             format_type = self._select_format()
 
@@ -85,7 +239,7 @@ class TwitterGenerator:
 
         if self.retriever:
             knowledge_k = 1 if format_type == "short" else max(1, self.config.RETRIEVAL_K // 2)
-            knowledge_results = self.retriever.retrieve_knowledge(topic, k=knowledge_k)
+            knowledge_results = self.retriever.retrieve_knowledge(topic, k=knowledge_k, virtue=virtue)
             knowledge_context = self.retriever.format_knowledge_context(knowledge_results)
 
             if include_examples and format_type == "thread":
@@ -94,7 +248,7 @@ class TwitterGenerator:
                 )
                 style_context = self.retriever.format_style_examples(style_results)
 
-        prompt = build_format_prompt(
+        system, prompt = build_format_messages(
             format_type=format_type,
             topic=topic,
             knowledge_context=knowledge_context,
@@ -102,52 +256,187 @@ class TwitterGenerator:
             virtue=virtue,
         )
 
-        system_prompt = get_system_prompt("twitter", virtue)
-
-        try:
-            raw_content = self.llm.generate(
-                prompt=prompt,
-                system=system_prompt,
-                max_tokens=self._get_max_tokens(format_type),
-                temperature=self.config.SOCIAL_TEMPERATURE,
-            )
-
-            content, tweets = self._parse_content(raw_content, format_type)
+        return {
+            "format_type": format_type,
+            "virtue": virtue,
+            "topic": topic,
+            "prompt": prompt,
+            "system": system,
+            "max_tokens": self._get_max_tokens(format_type),
+            "knowledge_results": knowledge_results,
+        }
 
-        except Exception as e:
-            return {
-                "error": str(e),
-                "content": None,
-                "format_type": format_type,
-                "virtue": virtue,
-                "tweets": [],
-                "citations": None,
-            }
+    def _generation_error(self, prepared: Dict, error: Exception) -> Dict:
+        """Build the error result for a failed generation."""
+        return {
+            "error": str(error),
+            "content": None,
+            "format_type": prepared["format_type"],
+            "virtue": prepared["virtue"],
+            "tweets": [],
+            "citations": None,
+        }
 
+    def _generation_result(self, prepared: Dict, raw_content: str, model_name: str) -> Dict:
+        """Parse raw LLM output into the generation result dictionary."""
+        format_type = prepared["format_type"]
+        knowledge_results = prepared["knowledge_results"]
+        content, tweets = self._parse_content(raw_content, format_type)
         citations = self.retriever.format_citations(knowledge_results) if self.retriever else None
 
         return {
             "content": content,
             "format_type": format_type,
-            "virtue": virtue,
+            "virtue": prepared["virtue"],
             "tweets": tweets,
             "raw_content": raw_content,
             "citations": citations,
-            "topic": topic,
+            "topic": prepared["topic"],
             "model": model_name,
             "tweet_count": len(tweets) if tweets else 1,
             "knowledge_sources": len(knowledge_results),
         }
 
-    def generate_reply(
+    def generate(
+        self,
+        topic: str = None,
+        model_name: str = "gpt4",
+        include_examples: bool = True,
+        format_type: str = None,
+        virtue: str = None,
+    ) -> Dict:
+        """
+        Generate Twitter/X content based on format type and virtue.
+
+        Args:
+            topic: The topic for the content
+            model_name: Which model to use ('claude' or 'gpt4')
+            include_examples: Whether to include style examples (only for threads)
+            format_type: 'short', 'thread', 'long', or None for weighted random
+            virtue: 'wisdom', 'courage', 'justice', 'temperance', 'general', or None for random
+
+        Returns:
+            Dictionary with content, format_type, virtue, tweets array, and metadata
+        """
+        prepared = self._prepare_generation(topic, include_examples, format_type, virtue)
+
+        try:
+            raw_content, served_by = self._call_llm(
+                model_name,
+                cacheable=self._sampling_pinned(self.config.SOCIAL_TEMPERATURE),
+                labels={"format_type": prepared["format_type"], "virtue": prepared["virtue"]},
+                prompt=prepared["prompt"],
+                system=prepared["system"],
+                max_tokens=prepared["max_tokens"],
+                temperature=self.config.SOCIAL_TEMPERATURE,
+            )
+            return self._generation_result(prepared, raw_content, served_by)
+
+        except Exception as e:
+            return self._generation_error(prepared, e)
+
+    async def agenerate(
+        self,
+        topic: str = None,
+        model_name: str = "gpt4",
+        include_examples: bool = True,
+        format_type: str = None,
+        virtue: str = None,
+    ) -> Dict:
+        """
+        Async version of generate().
+
+        Retrieval runs in a worker thread and the LLM call uses the client's
+        native async API, so the event loop stays free while waiting.
+        """
+        prepared = await asyncio.to_thread(
+            self._prepare_generation, topic, include_examples, format_type, virtue
+        )
+
+        try:
+            raw_content, served_by = await self._acall_llm(
+                model_name,
+                cacheable=self._sampling_pinned(self.config.SOCIAL_TEMPERATURE),
+                labels={"format_type": prepared["format_type"], "virtue": prepared["virtue"]},
+                prompt=prepared["prompt"],
+                system=prepared["system"],
+                max_tokens=prepared["max_tokens"],
+                temperature=self.config.SOCIAL_TEMPERATURE,
+            )
+            return self._generation_result(prepared, raw_content, served_by)
+
+        except Exception as e:
+            return self._generation_error(prepared, e)
+
+    async def agenerate_stream(
+        self,
+        topic: str = None,
+        model_name: str = "gpt4",
+        include_examples: bool = True,
+        format_type: str = None,
+        virtue: str = None,
+    ) -> AsyncIterator[Dict]:
+        """
+        Stream a generation as events.
+
+        Yields dictionaries with an "event" name and "data" payload:
+            start  - resolved format_type, virtue and topic
+            token  - a raw text chunk from the LLM
+            tweet  - a parsed thread tweet, as soon as its "N/" boundary closes
+            result - the same dictionary agenerate() returns
+            error  - the error message if the LLM call failed
+        """
+        prepared = await asyncio.to_thread(
+            self._prepare_generation, topic, include_examples, format_type, virtue
+        )
+        yield {
+            "event": "start",
+            "data": {
+                "format_type": prepared["format_type"],
+                "virtue": prepared["virtue"],
+                "topic": prepared["topic"],
+            },
+        }
+
+        thread_parser = ThreadStreamParser() if prepared["format_type"] == "thread" else None
+        chunks = []
+
+        llm = self._llm(model_name)
+        try:
+            with llm_call_context(format_type=prepared["format_type"], virtue=prepared["virtue"]):
+                async for text in llm.agenerate_streaming(
+                    prompt=prepared["prompt"],
+                    system=prepared["system"],
+                    max_tokens=prepared["max_tokens"],
+                    temperature=self.config.SOCIAL_TEMPERATURE,
+                ):
+                    chunks.append(text)
+                    yield {"event": "token", "data": {"text": text}}
+
+                    if thread_parser:
+                        for tweet in thread_parser.feed(text):
+                            yield {"event": "tweet", "data": {"index": thread_parser.emitted - 1, "text": tweet}}
+
+            if thread_parser:
+                for tweet in thread_parser.finish():
+                    yield {"event": "tweet", "data": {"index": thread_parser.emitted - 1, "text": tweet}}
+
+            result = self._generation_result(prepared, "".join(chunks), self._served_by(llm, model_name))
+
+        except Exception as e:
+            yield {"event": "error", "data": self._generation_error(prepared, e)}
+            return
+
+        yield {"event": "result", "data": result}
+
+    def _prepare_reply(
         self,
         original_content: str,
         username: str,
         topic: str = None,
-        model_name: str = "gpt4",
         virtue: str = None,
     ) -> Dict:
-        """Generate a reply to a tweet. Always 280 chars or less."""
+        """Run retrieval and build the LLM prompt for a reply."""
         search_topic = topic or original_content[:100]
 
         if virtue is None:
@@ -157,10 +446,10 @@ class TwitterGenerator:
         knowledge_results = []
 
         if self.retriever:
-            knowledge_results = self.retriever.retrieve_knowledge(search_topic, k=1)
+            knowledge_results = self.retriever.retrieve_knowledge(search_topic, k=1, virtue=virtue)
             knowledge_context = self.retriever.format_knowledge_context(knowledge_results)
 
-        prompt = build_format_prompt(
+        system, prompt = build_format_messages(
             format_type="reply",
             topic=search_topic,
             knowledge_context=knowledge_context,
@@ -169,55 +458,155 @@ class TwitterGenerator:
             virtue=virtue,
         )
 
-        system_prompt = get_system_prompt("twitter", virtue)
+        return {
+            "format_type": "reply",
+            "virtue": virtue,
+            "username": username,
+            "prompt": prompt,
+            "system": system,
+            "max_tokens": self.config.SHORT_MAX_TOKENS,
+            "knowledge_results": knowledge_results,
+        }
+
+    def _reply_result(self, prepared: Dict, raw_content: str, model_name: str) -> Dict:
+        """Clean raw LLM output into the reply result dictionary."""
+        reply = self._clean_reply(raw_content)
+        knowledge_results = prepared["knowledge_results"]
+        citations = self.retriever.format_citations(knowledge_results) if self.retriever else None
+
+        return {
+            "content": reply,
+            "format_type": "reply",
+            "virtue": prepared["virtue"],
+            "tweets": [reply],
+            "raw_content": raw_content,
+            "citations": citations,
+            "model": model_name,
+            "reply_to_username": prepared["username"],
+        }
+
+    def generate_reply(
+        self,
+        original_content: str,
+        username: str,
+        topic: str = None,
+        model_name: str = "gpt4",
+        virtue: str = None,
+    ) -> Dict:
+        """Generate a reply to a tweet. Always 280 chars or less."""
+        prepared = self._prepare_reply(original_content, username, topic, virtue)
 
         try:
-            raw_content = self.llm.generate(
-                prompt=prompt,
-                system=system_prompt,
-                max_tokens=self.config.SHORT_MAX_TOKENS,
+            raw_content, served_by = self._call_llm(
+                model_name,
+                cacheable=self._sampling_pinned(self.config.SOCIAL_TEMPERATURE),
+                labels={"format_type": "reply", "virtue": prepared["virtue"]},
+                prompt=prepared["prompt"],
+                system=prepared["system"],
+                max_tokens=prepared["max_tokens"],
                 temperature=self.config.SOCIAL_TEMPERATURE,
             )
+            return self._reply_result(prepared, raw_content, served_by)
 
-            reply = self._clean_reply(raw_content)
+        except Exception as e:
+            return {
+                "error": str(e),
+                "content": None,
+                "format_type": "reply",
+                "virtue": prepared["virtue"],
+            }
+
+    async def agenerate_reply(
+        self,
+        original_content: str,
+        username: str,
+        topic: str = None,
+        model_name: str = "gpt4",
+        virtue: str = None,
+    ) -> Dict:
+        """Async version of generate_reply()."""
+        prepared = await asyncio.to_thread(
+            self._prepare_reply, original_content, username, topic, virtue
+        )
+
+        try:
+            raw_content, served_by = await self._acall_llm(
+                model_name,
+                cacheable=self._sampling_pinned(self.config.SOCIAL_TEMPERATURE),
+                labels={"format_type": "reply", "virtue": prepared["virtue"]},
+                prompt=prepared["prompt"],
+                system=prepared["system"],
+                max_tokens=prepared["max_tokens"],
+                temperature=self.config.SOCIAL_TEMPERATURE,
+            )
+            return self._reply_result(prepared, raw_content, served_by)
 
         except Exception as e:
             return {
                 "error": str(e),
                 "content": None,
                 "format_type": "reply",
-                "virtue": virtue,
+                "virtue": prepared["virtue"],
             }
 
-        citations = self.retriever.format_citations(knowledge_results) if self.retriever else None
+    def refine(
+        self,
+        content: str,
+        instruction: str,
+        model_name: str = "gpt4",
+    ) -> Dict:
+        """Refine existing content based on user instruction."""
+        prompt = build_refine_prompt(content, instruction)
+        system_prompt = get_system_prompt("twitter")
+        temperature = self._refine_temperature()
+
+        try:
+            refined, served_by = self._call_llm(
+                model_name,
+                cacheable=temperature == 0,
+                labels={"format_type": "refine"},
+                prompt=prompt,
+                system=system_prompt,
+                max_tokens=self.config.THREAD_MAX_TOKENS,
+                temperature=temperature,
+            )
+
+            refined = refined.strip().strip('"\'')
+
+        except Exception as e:
+            return {
+                "error": str(e),
+                "content": None,
+                "original": content,
+            }
 
         return {
-            "content": reply,
-            "format_type": "reply",
-            "virtue": virtue,
-            "tweets": [reply],
-            "raw_content": raw_content,
-            "citations": citations,
-            "model": model_name,
-            "reply_to_username": username,
+            "content": refined,
+            "original": content,
+            "instruction": instruction,
+            "model": served_by,
         }
 
-    def refine(
+    async def arefine(
         self,
         content: str,
         instruction: str,
         model_name: str = "gpt4",
     ) -> Dict:
-        """Refine existing content based on user instruction."""
+        """Async version of refine()."""
         prompt = build_refine_prompt(content, instruction)
         system_prompt = get_system_prompt("twitter")
+        temperature = self._refine_temperature()
 
         try:
-            refined = self.llm.generate(
+            refined, served_by = await self._acall_llm(
+                model_name,
+                cacheable=temperature == 0,
+                labels={"format_type": "refine"},
                 prompt=prompt,
                 system=system_prompt,
                 max_tokens=self.config.THREAD_MAX_TOKENS,
-                temperature=0.7,
+                temperature=temperature,
             )
 
             refined = refined.strip().strip('"\'')
@@ -233,9 +622,116 @@ class TwitterGenerator:
             "content": refined,
             "original": content,
             "instruction": instruction,
-            "model": model_name,
+            "model": served_by,
         }
 
+    async def arefine_stream(
+        self,
+        content: str,
+        instruction: str,
+        model_name: str = "gpt4",
+    ) -> AsyncIterator[Dict]:
+        """Stream a refinement as token events followed by a result event."""
+        prompt = build_refine_prompt(content, instruction)
+        system_prompt = get_system_prompt("twitter")
+        chunks = []
+        request = {
+            "prompt": prompt,
+            "system": system_prompt,
+            "max_tokens": self.config.THREAD_MAX_TOKENS,
+            "temperature": self._refine_temperature(),
+        }
+
+        # Shares entries with refine(): a cached refinement arrives as one token event
+        key = self._response_key(model_name, request["temperature"] == 0, request)
+        cached = self.response_cache.get(key) if key else None
+        if cached:
+            chunks.append(cached["text"])
+            served_by = cached["model"]
+            yield {"event": "token", "data": {"text": cached["text"]}}
+        else:
+            llm = self._llm(model_name)
+            started = time.perf_counter()
+            try:
+                with llm_call_context(format_type="refine"):
+                    async for text in llm.agenerate_streaming(**request):
+                        chunks.append(text)
+                        yield {"event": "token", "data": {"text": text}}
+
+            except Exception as e:
+                yield {"event": "error", "data": {"error": str(e), "content": None, "original": content}}
+                return
+
+            served_by = self._served_by(llm, model_name)
+            if key:
+                self.response_cache.put(key, "".join(chunks), served_by, (time.perf_counter() - started) * 1000)
+
+        yield {
+            "event": "result",
+            "data": {
+                "content": "".join(chunks).strip().strip('"\''),
+                "original": content,
+                "instruction": instruction,
+                "model": served_by,
+            },
+        }
+
+    async def asuggest(
+        self,
+        content: str,
+        suggestion_types: Optional[Dict[str, str]] = None,
+        concurrency: int = None,
+        timeout: float = None,
+        model_name: str = "gpt4",
+    ) -> List[Dict]:
+        """
+        Run every suggestion variant concurrently.
+
+        Args:
+            content: The post to suggest improvements for
+            suggestion_types: Mapping of suggestion type to refine instruction
+                (defaults to Config.SUGGESTION_TYPES)
+            concurrency: Maximum variants in flight at once
+            timeout: Per-variant timeout in seconds; slow variants are dropped
+                instead of holding up the others
+
+        Returns:
+            One dictionary per variant, in input order, with type, latency_ms and
+            either suggestion or error (timed_out is set for timeouts)
+        """
+        suggestion_types = suggestion_types or self.config.SUGGESTION_TYPES
+        semaphore = asyncio.Semaphore(concurrency or self.config.SUGGEST_CONCURRENCY)
+        timeout = timeout or self.config.SUGGEST_TIMEOUT_SECONDS
+
+        async def run_variant(suggestion_type: str, instruction: str) -> Dict:
+            async with semaphore:
+                started = time.perf_counter()
+                try:
+                    result = await asyncio.wait_for(
+                        self.arefine(content=content, instruction=instruction, model_name=model_name),
+                        timeout=timeout,
+                    )
+                except asyncio.TimeoutError:
+                    result = {"error": f"Timed out after {timeout:g}s", "timed_out": True}
+                latency_ms = round((time.perf_counter() - started) * 1000, 1)
+
+            if result.get("error"):
+                return {
+                    "type": suggestion_type,
+                    "error": result["error"],
+                    "timed_out": result.get("timed_out", False),
+                    "latency_ms": latency_ms,
+                }
+            return {
+                "type": suggestion_type,
+                "suggestion": result.get("content", ""),
+                "latency_ms": latency_ms,
+            }
+
+        return await asyncio.gather(
+            *(run_variant(t, instruction) for t, instruction in suggestion_types.items())
+        )
+
     def _parse_content(self, raw_content: str, format_type: str) -> tuple:
         """Parse content based on format type."""
         raw_content = raw_content.strip()
@@ -268,16 +764,12 @@ class TwitterGenerator:
         """Parse numbered thread tweets from response."""
         tweets = []
 
-        pattern = r'(?:^|\n)\s*(\d+)[\/\.\)]\s*'
-        parts = re.split(pattern, content)
+        parts = re.split(THREAD_BOUNDARY_PATTERN, content)
 
         if len(parts) > 2:
             for i in range(2, len(parts), 2):
-                tweet = parts[i].strip()
+                tweet = clean_thread_tweet(parts[i])
                 if tweet:
-                    tweet = tweet.strip('"\'')
-                    if len(tweet) > 280:
-                        tweet = tweet[:277] + "..."
                     tweets.append(tweet)
 
         if not tweets:
@@ -307,45 +799,10 @@ class TwitterGenerator:
 
     def _get_random_topic(self, virtue: str = None) -> str:
         """Get a random stoic topic, optionally filtered by virtue."""
-        virtue_topics = {
-            "wisdom": [
-                "practical wisdom in daily decisions",
-                "discernment between good and bad",
-                "clear thinking without bias",
-                "understanding what truly matters",
-            ],
-            "courage": [
-                "facing fears with composure",
-                "standing up for what's right",
-                "enduring hardship gracefully",
-                "speaking truth when difficult",
-            ],
-            "justice": [
-                "treating others with dignity",
-                "fulfilling duties to community",
-                "fairness in daily interactions",
-                "contributing to the common good",
-            ],
-            "temperance": [
-                "self-control in modern life",
-                "moderation with technology",
-                "mastering impulses and reactions",
-                "finding balance in desires",
-            ],
-            "general": [
-                "amor fati - loving your fate",
-                "memento mori - awareness of mortality",
-                "dichotomy of control",
-                "living according to nature",
-                "finding inner peace",
-                "building resilience",
-            ],
-        }
-
-        if virtue and virtue in virtue_topics:
-            return random.choice(virtue_topics[virtue])
+        if virtue and virtue in VIRTUE_TOPICS:
+            return random.choice(VIRTUE_TOPICS[virtue])
 
         all_topics = []
-        for topics in virtue_topics.values():
+        for topics in VIRTUE_TOPICS.values():
             all_topics.extend(topics)
         return random.choice(all_topics)
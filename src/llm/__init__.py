@@ -2,7 +2,19 @@
 
 from src.llm.openai_client import OpenAIClient
 from src.llm.anthropic_client import AnthropicClient
+from src.llm.ledger import LLMLedger, llm_call_context, llm_ledger
+from src.llm.rate_limit import BACKGROUND, INTERACTIVE, RateLimiter, llm_priority, rate_limiter
+from src.llm.resilience import (
+    CircuitOpenError,
+    InvalidRequestError,
+    LLMError,
+    ProviderUnavailableError,
+    RateLimitError,
+)
+from src.llm.response_cache import ResponseCache, create_response_cache, get_response_cache
+from src.llm.router import LLMRouter, RoutedLLM, build_default_router
 from src.llm.prompt_templates import (
+    build_format_messages,
     build_format_prompt,
     build_refine_prompt,
     get_format_template,
@@ -12,6 +24,26 @@ from src.llm.prompt_templates import (
 __all__ = [
     "OpenAIClient",
     "AnthropicClient",
+    "LLMError",
+    "RateLimitError",
+    "ProviderUnavailableError",
+    "InvalidRequestError",
+    "CircuitOpenError",
+    "LLMLedger",
+    "llm_ledger",
+    "llm_call_context",
+    "RateLimiter",
+    "rate_limiter",
+    "llm_priority",
+    "INTERACTIVE",
+    "BACKGROUND",
+    "ResponseCache",
+    "create_response_cache",
+    "get_response_cache",
+    "LLMRouter",
+    "RoutedLLM",
+    "build_default_router",
+    "build_format_messages",
     "build_format_prompt",
     "build_refine_prompt",
     "get_format_template",
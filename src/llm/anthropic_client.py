@@ -1,13 +1,71 @@
+import time
 import anthropic
-from typing import Optional
+from typing import AsyncIterator, Optional
+from src.llm.cache_stats import prompt_cache_stats
+from src.llm.ledger import llm_ledger
+from src.llm.rate_limit import estimate_tokens, rate_limiter
+from src.llm.resilience import Resilience
+from src.utils.config import Config
 
 
 class AnthropicClient:
     """Wrapper for Anthropic API (Claude models)"""
 
-    def __init__(self, api_key: str, model: str = "claude-3-5-sonnet-20241022"):
-        self.client = anthropic.Anthropic(api_key=api_key)
+    def __init__(
+        self,
+        api_key: str,
+        model: str = "claude-3-5-sonnet-20241022",
+        base_url: Optional[str] = None,
+        cache_system: Optional[bool] = None,
+    ):
+        # base_url lets tests and local proxies stand in for the messages API
+        base_url = base_url or Config.ANTHROPIC_BASE_URL or None
+        # Retries and backoff are handled by self.resilience, not the SDK
+        options = {"max_retries": 0, "timeout": Config.LLM_REQUEST_TIMEOUT_SECONDS}
+        self.client = anthropic.Anthropic(api_key=api_key, base_url=base_url, **options)
+        self.async_client = anthropic.AsyncAnthropic(api_key=api_key, base_url=base_url, **options)
         self.model = model
+        self.resilience = Resilience("anthropic", "Anthropic", (anthropic.APIConnectionError,))
+
+        self.cache_system = Config.ANTHROPIC_PROMPT_CACHING if cache_system is None else cache_system
+
+    def _build_kwargs(
+        self,
+        prompt: str,
+        max_tokens: int,
+        temperature: Optional[float],
+        system: Optional[str],
+    ) -> dict:
+        """Build the messages API arguments shared by every call style."""
+        kwargs = {
+            "model": self.model,
+            "max_tokens": max_tokens,
+            "messages": [{"role": "user", "content": prompt}],
+        }
+
+        if system and self.cache_system:
+            # Mark the static prefix (persona + format rules) as a cache breakpoint
+            kwargs["system"] = [
+                {"type": "text", "text": system, "cache_control": {"type": "ephemeral"}}
+            ]
+        elif system:
+            kwargs["system"] = system
+
+        if temperature is not None:
+            kwargs["temperature"] = temperature
+
+        return kwargs
+
+    @staticmethod
+    def _record_usage(tracker, usage):
+        """Copy a message's usage block onto the ledger record."""
+        if usage is not None:
+            tracker.usage(
+                prompt_tokens=usage.input_tokens,
+                completion_tokens=usage.output_tokens,
+                cache_creation_tokens=getattr(usage, "cache_creation_input_tokens", 0),
+                cache_read_tokens=getattr(usage, "cache_read_input_tokens", 0),
+            )
 
     def generate(
         self,
@@ -17,24 +75,19 @@ class AnthropicClient:
         system: Optional[str] = None,
     ) -> str:
         """Generate content using Claude"""
-        try:
-            kwargs = {
-                "model": self.model,
-                "max_tokens": max_tokens,
-                "messages": [{"role": "user", "content": prompt}],
-            }
-
-            if system:
-                kwargs["system"] = system
-
-            if temperature is not None:
-                kwargs["temperature"] = temperature
-
-            response = self.client.messages.create(**kwargs)
+        kwargs = self._build_kwargs(prompt, max_tokens, temperature, system)
+        tokens = estimate_tokens(prompt, system, max_tokens)
 
+        def call():
+            rate_limiter.acquire_blocking("anthropic", self.model, tokens)
+            with llm_ledger.track("anthropic", self.model) as tracker:
+                started = time.perf_counter()
+                response = self.client.messages.create(**kwargs)
+                prompt_cache_stats.record(response.usage, (time.perf_counter() - started) * 1000)
+                self._record_usage(tracker, response.usage)
             return response.content[0].text
-        except Exception as e:
-            raise Exception(f"Error calling Anthropic API: {str(e)}")
+
+        return self.resilience.call(call)
 
     def generate_streaming(
         self,
@@ -44,21 +97,67 @@ class AnthropicClient:
         system: Optional[str] = None,
     ):
         """Generate content using Claude with streaming"""
-        try:
-            kwargs = {
-                "model": self.model,
-                "max_tokens": max_tokens,
-                "messages": [{"role": "user", "content": prompt}],
-            }
-
-            if system:
-                kwargs["system"] = system
-
-            if temperature is not None:
-                kwargs["temperature"] = temperature
-
-            with self.client.messages.stream(**kwargs) as stream:
-                for text in stream.text_stream:
-                    yield text
-        except Exception as e:
-            raise Exception(f"Error calling Anthropic API: {str(e)}")
+        kwargs = self._build_kwargs(prompt, max_tokens, temperature, system)
+        tokens = estimate_tokens(prompt, system, max_tokens)
+
+        def open_stream():
+            rate_limiter.acquire_blocking("anthropic", self.model, tokens)
+            with llm_ledger.track("anthropic", self.model, "stream") as tracker:
+                started = time.perf_counter()
+                with self.client.messages.stream(**kwargs) as stream:
+                    for text in stream.text_stream:
+                        tracker.first_token()
+                        yield text
+                    final = stream.get_final_message()
+                prompt_cache_stats.record(final.usage, (time.perf_counter() - started) * 1000)
+                self._record_usage(tracker, final.usage)
+
+        yield from self.resilience.stream(open_stream)
+
+    async def agenerate(
+        self,
+        prompt: str,
+        max_tokens: int = 2000,
+        temperature: float = 0.7,
+        system: Optional[str] = None,
+    ) -> str:
+        """Generate content using Claude without blocking the event loop"""
+        kwargs = self._build_kwargs(prompt, max_tokens, temperature, system)
+        tokens = estimate_tokens(prompt, system, max_tokens)
+
+        async def call():
+            await rate_limiter.acquire("anthropic", self.model, tokens)
+            with llm_ledger.track("anthropic", self.model) as tracker:
+                started = time.perf_counter()
+                response = await self.async_client.messages.create(**kwargs)
+                prompt_cache_stats.record(response.usage, (time.perf_counter() - started) * 1000)
+                self._record_usage(tracker, response.usage)
+            return response.content[0].text
+
+        return await self.resilience.acall(call)
+
+    async def agenerate_streaming(
+        self,
+        prompt: str,
+        max_tokens: int = 2000,
+        temperature: float = 0.7,
+        system: Optional[str] = None,
+    ) -> AsyncIterator[str]:
+        """Generate content using Claude with async streaming"""
+        kwargs = self._build_kwargs(prompt, max_tokens, temperature, system)
+        tokens = estimate_tokens(prompt, system, max_tokens)
+
+        async def open_stream():
+            await rate_limiter.acquire("anthropic", self.model, tokens)
+            with llm_ledger.track("anthropic", self.model, "stream") as tracker:
+                started = time.perf_counter()
+                async with self.async_client.messages.stream(**kwargs) as stream:
+                    async for text in stream.text_stream:
+                        tracker.first_token()
+                        yield text
+                    final = await stream.get_final_message()
+                prompt_cache_stats.record(final.usage, (time.perf_counter() - started) * 1000)
+                self._record_usage(tracker, final.usage)
+
+        async for text in self.resilience.astream(open_stream):
+            yield text
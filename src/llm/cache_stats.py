@@ -0,0 +1,97 @@
+"""Prompt-cache accounting for Anthropic calls.
+
+Every messages API response reports how many input tokens were written to or
+read from the prompt cache. PromptCacheStats aggregates those counts with call
+latency so the effect of caching the static prompt prefix is visible at
+/llm/prompt-cache.
+"""
+
+import threading
+from typing import Dict
+
+# Anthropic bills cache writes at 1.25x and cache reads at 0.1x the input price
+CACHE_WRITE_COST_MULTIPLIER = 1.25
+CACHE_READ_COST_MULTIPLIER = 0.1
+
+
+class PromptCacheStats:
+    """Thread-safe running totals of prompt-cache usage."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Clear all counters."""
+        with self._lock:
+            self.calls = 0
+            self.cache_hits = 0
+            self.cache_writes = 0
+            self.input_tokens = 0
+            self.output_tokens = 0
+            self.cache_creation_input_tokens = 0
+            self.cache_read_input_tokens = 0
+            self._hit_latency_ms = 0.0
+            self._miss_latency_ms = 0.0
+
+    def record(self, usage, latency_ms: float):
+        """
+        Record the usage block of one messages API response.
+
+        Args:
+            usage: Response usage (object or dict); missing cache fields count as 0
+            latency_ms: Wall time of the call
+        """
+        if usage is None:
+            return
+
+        def field(name: str) -> int:
+            value = usage.get(name) if isinstance(usage, dict) else getattr(usage, name, None)
+            return value or 0
+
+        created = field("cache_creation_input_tokens")
+        read = field("cache_read_input_tokens")
+
+        with self._lock:
+            self.calls += 1
+            self.input_tokens += field("input_tokens")
+            self.output_tokens += field("output_tokens")
+            self.cache_creation_input_tokens += created
+            self.cache_read_input_tokens += read
+
+            if read:
+                self.cache_hits += 1
+                self._hit_latency_ms += latency_ms
+            else:
+                self._miss_latency_ms += latency_ms
+            if created:
+                self.cache_writes += 1
+
+    def get_stats(self) -> Dict:
+        """Get totals, hit ratio, latency split and estimated input-token savings."""
+        with self._lock:
+            misses = self.calls - self.cache_hits
+            total_input = self.input_tokens + self.cache_creation_input_tokens + self.cache_read_input_tokens
+            # Input cost in "uncached token" units compared with sending everything uncached
+            billed = (
+                self.input_tokens
+                + self.cache_creation_input_tokens * CACHE_WRITE_COST_MULTIPLIER
+                + self.cache_read_input_tokens * CACHE_READ_COST_MULTIPLIER
+            )
+
+            return {
+                "calls": self.calls,
+                "cache_hits": self.cache_hits,
+                "cache_writes": self.cache_writes,
+                "hit_ratio": round(self.cache_hits / self.calls, 3) if self.calls else 0.0,
+                "input_tokens": self.input_tokens,
+                "output_tokens": self.output_tokens,
+                "cache_creation_input_tokens": self.cache_creation_input_tokens,
+                "cache_read_input_tokens": self.cache_read_input_tokens,
+                "avg_hit_latency_ms": round(self._hit_latency_ms / self.cache_hits, 1) if self.cache_hits else None,
+                "avg_miss_latency_ms": round(self._miss_latency_ms / misses, 1) if misses else None,
+                "estimated_input_cost_saved_pct": round(100 * (1 - billed / total_input), 1) if total_input else 0.0,
+            }
+
+
+prompt_cache_stats = PromptCacheStats()
@@ -0,0 +1,299 @@
+"""Per-call LLM ledger: latency, time to first token, tokens and estimated cost.
+
+Every provider call made by OpenAIClient and AnthropicClient, retries
+included, adds one record to a process-wide ring buffer. A record holds:
+
+- provider and model, plus the format_type and virtue the generator was
+  working on
+- prompt and completion tokens from the response's usage
+- latency, and time to first token for streams
+- estimated cost in USD, and whether the call succeeded
+
+/llm/calls serves recent records and /llm/calls/summary groups them, so
+slow or expensive formats and virtues stand out. When LLM_LEDGER_PATH is
+set, records are also appended to that file as JSON lines. Summarize the
+file with:
+
+    python -m src.llm.ledger data/processed/llm_calls.jsonl --group-by format_type virtue
+"""
+
+import argparse
+import asyncio
+import contextvars
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional
+from src.llm.cache_stats import CACHE_READ_COST_MULTIPLIER, CACHE_WRITE_COST_MULTIPLIER
+from src.utils.config import Config
+
+# USD per million (input, output) tokens; models match on the longest prefix
+PRICES_PER_MILLION = {
+    "gpt-4-turbo": (10.0, 30.0),
+    "gpt-4o-mini": (0.15, 0.6),
+    "gpt-4o": (2.5, 10.0),
+    "gpt-4": (30.0, 60.0),
+    "gpt-3.5-turbo": (0.5, 1.5),
+    "claude-3-5-sonnet": (3.0, 15.0),
+    "claude-3-7-sonnet": (3.0, 15.0),
+    "claude-3-5-haiku": (0.8, 4.0),
+    "claude-3-opus": (15.0, 75.0),
+    "claude-3-haiku": (0.25, 1.25),
+}
+GROUP_FIELDS = ("provider", "model", "format_type", "virtue", "operation")
+
+_call_labels = contextvars.ContextVar("llm_call_labels", default={})
+
+
+@contextmanager
+def llm_call_context(**labels):
+    """Attach labels (format_type, virtue) to the LLM calls made inside the block."""
+    token = _call_labels.set({**_call_labels.get(), **labels})
+    try:
+        yield
+    finally:
+        try:
+            _call_labels.reset(token)
+        except ValueError:
+            # A streaming generator closed from another context (e.g. garbage
+            # collected after the client went away); that context is discarded
+            pass
+
+
+def estimate_cost(
+    model: str,
+    prompt_tokens: int,
+    completion_tokens: int,
+    cache_creation_tokens: int = 0,
+    cache_read_tokens: int = 0,
+) -> Optional[float]:
+    """
+    Estimate a call's cost in USD.
+
+    Args:
+        model: Model name, matched on the longest known prefix
+        prompt_tokens: Uncached input tokens
+        completion_tokens: Output tokens
+        cache_creation_tokens: Input tokens written to the prompt cache (Anthropic)
+        cache_read_tokens: Input tokens read from the prompt cache (Anthropic)
+
+    Returns:
+        Cost in USD, or None for a model without a known price
+    """
+    matches = [name for name in PRICES_PER_MILLION if model and model.startswith(name)]
+    if not matches:
+        return None
+    input_price, output_price = PRICES_PER_MILLION[max(matches, key=len)]
+    input_cost = (
+        prompt_tokens
+        + cache_creation_tokens * CACHE_WRITE_COST_MULTIPLIER
+        + cache_read_tokens * CACHE_READ_COST_MULTIPLIER
+    ) * input_price
+    return round((input_cost + completion_tokens * output_price) / 1e6, 6)
+
+
+class CallTracker:
+    """Collects timing and usage for one provider call; see LLMLedger.track()."""
+
+    def __init__(self, provider: str, model: str, operation: str):
+        self.provider = provider
+        self.model = model
+        self.operation = operation
+        self.labels = dict(_call_labels.get())
+        self.started = time.perf_counter()
+        self.ttft_ms = None
+        self.tokens = {}
+
+    def first_token(self):
+        """Mark the arrival of the first streamed text (later calls are ignored)."""
+        if self.ttft_ms is None:
+            self.ttft_ms = round((time.perf_counter() - self.started) * 1000, 1)
+
+    def usage(self, prompt_tokens: int = 0, completion_tokens: int = 0, cache_creation_tokens: int = 0, cache_read_tokens: int = 0):
+        """Record token counts from the response's usage block."""
+        self.tokens = {
+            "prompt_tokens": prompt_tokens or 0,
+            "completion_tokens": completion_tokens or 0,
+            "cache_creation_tokens": cache_creation_tokens or 0,
+            "cache_read_tokens": cache_read_tokens or 0,
+        }
+
+    def to_record(self, status: str, error: Optional[BaseException] = None) -> Dict:
+        tokens = self.tokens or {
+            "prompt_tokens": None,
+            "completion_tokens": None,
+            "cache_creation_tokens": None,
+            "cache_read_tokens": None,
+        }
+        return {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+            "provider": self.provider,
+            "model": self.model,
+            "operation": self.operation,
+            "format_type": self.labels.get("format_type"),
+            "virtue": self.labels.get("virtue"),
+            **tokens,
+            "latency_ms": round((time.perf_counter() - self.started) * 1000, 1),
+            "ttft_ms": self.ttft_ms,
+            "cost_usd": estimate_cost(self.model, **tokens) if self.tokens else None,
+            "status": status,
+            "error": f"{type(error).__name__}: {error}"[:300] if error is not None and status == "error" else None,
+        }
+
+
+def _percentile(values: List[float], pct: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+def summarize(records: Iterable[Dict], group_by: Iterable[str] = ("format_type", "virtue")) -> List[Dict]:
+    """
+    Aggregate records into one row per group.
+
+    Args:
+        records: Ledger records
+        group_by: Record fields to group on (any of GROUP_FIELDS)
+
+    Returns:
+        Rows with calls, errors, p50/p95 latency, average TTFT, token totals and
+        cost, most expensive group first
+    """
+    group_by = tuple(group_by)
+    groups: Dict[tuple, List[Dict]] = {}
+    for record in records:
+        groups.setdefault(tuple(record.get(field) for field in group_by), []).append(record)
+
+    rows = []
+    for key, items in groups.items():
+        ok = [r for r in items if r["status"] == "ok"]
+        latencies = [r["latency_ms"] for r in ok]
+        ttfts = [r["ttft_ms"] for r in ok if r.get("ttft_ms") is not None]
+        costs = [r["cost_usd"] for r in ok if r.get("cost_usd") is not None]
+        rows.append({
+            **dict(zip(group_by, key)),
+            "calls": len(items),
+            "errors": sum(1 for r in items if r["status"] == "error"),
+            "p50_latency_ms": _percentile(latencies, 0.5),
+            "p95_latency_ms": _percentile(latencies, 0.95),
+            "avg_ttft_ms": round(sum(ttfts) / len(ttfts), 1) if ttfts else None,
+            "prompt_tokens": sum(r.get("prompt_tokens") or 0 for r in ok),
+            "completion_tokens": sum(r.get("completion_tokens") or 0 for r in ok),
+            "cost_usd": round(sum(costs), 6),
+            "avg_cost_usd": round(sum(costs) / len(costs), 6) if costs else None,
+        })
+    return sorted(rows, key=lambda row: row["cost_usd"], reverse=True)
+
+
+class LLMLedger:
+    """Ring buffer of call records, optionally mirrored to an append-only JSONL file."""
+
+    def __init__(self, max_records: Optional[int] = None, path: Optional[str] = None):
+        """
+        Args:
+            max_records: Records kept in memory (defaults to Config.LLM_LEDGER_SIZE)
+            path: JSONL file to append every record to (defaults to Config.LLM_LEDGER_PATH; empty disables)
+        """
+        self.max_records = max_records or Config.LLM_LEDGER_SIZE
+        self.path = Config.LLM_LEDGER_PATH if path is None else path
+        self._records = deque(maxlen=self.max_records)
+        self._lock = threading.Lock()
+        self._file = None
+        self.total = 0
+        if self.path:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            # Line-buffered so each record reaches the file as one complete line
+            self._file = open(self.path, "a", encoding="utf-8", buffering=1)
+
+    @contextmanager
+    def track(self, provider: str, model: str, operation: str = "generate"):
+        """
+        Record one provider call.
+
+        Yields a CallTracker for usage() and first_token(). The record is
+        written when the block exits: "ok", "error" for an exception, or
+        "cancelled" when a hedge loser or abandoned stream is torn down.
+        """
+        tracker = CallTracker(provider, model, operation)
+        try:
+            yield tracker
+        except (asyncio.CancelledError, GeneratorExit) as e:
+            self.add(tracker.to_record("cancelled", e))
+            raise
+        except BaseException as e:
+            self.add(tracker.to_record("error", e))
+            raise
+        self.add(tracker.to_record("ok"))
+
+    def add(self, record: Dict):
+        with self._lock:
+            self._records.append(record)
+            self.total += 1
+            if self._file is not None:
+                try:
+                    self._file.write(json.dumps(record) + "\n")
+                except (OSError, ValueError) as e:
+                    print(f"LLM ledger: could not write {self.path}: {e}")
+
+    def get_records(self, limit: int = 100, **filters) -> List[Dict]:
+        """Most recent records first, optionally filtered on fields such as format_type or virtue."""
+        with self._lock:
+            records = list(self._records)
+        matching = [
+            r for r in reversed(records)
+            if all(value is None or r.get(field) == value for field, value in filters.items())
+        ]
+        return matching[:limit]
+
+    def summary(self, group_by: Iterable[str] = ("format_type", "virtue")) -> Dict:
+        """Aggregate the buffered records (see summarize())."""
+        with self._lock:
+            records = list(self._records)
+        return {
+            "records": len(records),
+            "total_recorded": self.total,
+            "file": self.path or None,
+            "groups": summarize(records, group_by),
+        }
+
+
+llm_ledger = LLMLedger()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize an LLM ledger JSONL file")
+    parser.add_argument("path", nargs="?", default=Config.LLM_LEDGER_PATH, help="Ledger file (defaults to LLM_LEDGER_PATH)")
+    parser.add_argument("--group-by", nargs="+", default=["format_type", "virtue"], choices=GROUP_FIELDS)
+    parser.add_argument("--json", action="store_true", help="Print the rows as JSON")
+    args = parser.parse_args()
+
+    if not args.path or not os.path.exists(args.path):
+        print(f"No ledger file at {args.path!r}", file=sys.stderr)
+        sys.exit(1)
+
+    with open(args.path, "r", encoding="utf-8") as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    rows = summarize(records, args.group_by)
+
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return
+
+    print(f"{len(records)} calls in {args.path}")
+    for row in rows:
+        label = " / ".join(str(row[field]) for field in args.group_by)
+        print(
+            f"{label:<32} {row['calls']:>6} calls {row['errors']:>4} errors | "
+            f"p50 {row['p50_latency_ms']} ms p95 {row['p95_latency_ms']} ms ttft {row['avg_ttft_ms']} ms | "
+            f"{row['prompt_tokens']}+{row['completion_tokens']} tokens | ${row['cost_usd']:.4f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,10 @@
 import os
-from openai import OpenAI
-from typing import Optional
+from openai import APIConnectionError, AsyncOpenAI, OpenAI
+from typing import AsyncIterator, List, Optional
+from src.llm.ledger import llm_ledger
+from src.llm.rate_limit import estimate_tokens, rate_limiter
+from src.llm.resilience import Resilience
+from src.utils.config import Config
 
 
 class OpenAIClient:
@@ -10,10 +14,31 @@ class OpenAIClient:
         api_key = api_key or os.environ.get("OPENAI_API_KEY")
         if not api_key:
             raise ValueError("OPENAI_API_KEY environment variable not set")
-        self.client = OpenAI(api_key=api_key)
+        # Retries and backoff are handled by self.resilience, not the SDK
+        timeout = Config.LLM_REQUEST_TIMEOUT_SECONDS
+        self.client = OpenAI(api_key=api_key, max_retries=0, timeout=timeout)
+        self.async_client = AsyncOpenAI(api_key=api_key, max_retries=0, timeout=timeout)
         self.model = model
+        self.resilience = Resilience("openai", "OpenAI", (APIConnectionError,))
         self.embedding_model = "text-embedding-3-small"
 
+    @staticmethod
+    def _build_messages(prompt: str, system: Optional[str] = None) -> List[dict]:
+        """Build the chat messages list for a prompt and optional system prompt."""
+        messages = []
+
+        if system:
+            messages.append({"role": "system", "content": system})
+
+        messages.append({"role": "user", "content": prompt})
+        return messages
+
+    @staticmethod
+    def _record_usage(tracker, usage):
+        """Copy a chat completion's usage block onto the ledger record."""
+        if usage is not None:
+            tracker.usage(prompt_tokens=usage.prompt_tokens, completion_tokens=usage.completion_tokens)
+
     def generate(
         self,
         prompt: str,
@@ -22,24 +47,21 @@ class OpenAIClient:
         system: Optional[str] = None,
     ) -> str:
         """Generate content using GPT-4 Turbo"""
-        try:
-            messages = []
-
-            if system:
-                messages.append({"role": "system", "content": system})
-
-            messages.append({"role": "user", "content": prompt})
-
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                max_tokens=max_tokens,
-                temperature=temperature,
-            )
+        tokens = estimate_tokens(prompt, system, max_tokens)
 
+        def call():
+            rate_limiter.acquire_blocking("openai", self.model, tokens)
+            with llm_ledger.track("openai", self.model) as tracker:
+                response = self.client.chat.completions.create(
+                    model=self.model,
+                    messages=self._build_messages(prompt, system),
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                )
+                self._record_usage(tracker, response.usage)
             return response.choices[0].message.content
-        except Exception as e:
-            raise Exception(f"Error calling OpenAI API: {str(e)}")
+
+        return self.resilience.call(call)
 
     def generate_streaming(
         self,
@@ -49,26 +71,83 @@ class OpenAIClient:
         system: Optional[str] = None,
     ):
         """Generate content using GPT-4 Turbo with streaming"""
-        try:
-            messages = []
-
-            if system:
-                messages.append({"role": "system", "content": system})
-
-            messages.append({"role": "user", "content": prompt})
-
-            with self.client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                max_tokens=max_tokens,
-                temperature=temperature,
-                stream=True,
-            ) as response:
-                for chunk in response:
-                    if chunk.choices[0].delta.content:
-                        yield chunk.choices[0].delta.content
-        except Exception as e:
-            raise Exception(f"Error calling OpenAI API: {str(e)}")
+        tokens = estimate_tokens(prompt, system, max_tokens)
+
+        def open_stream():
+            rate_limiter.acquire_blocking("openai", self.model, tokens)
+            with llm_ledger.track("openai", self.model, "stream") as tracker:
+                with self.client.chat.completions.create(
+                    model=self.model,
+                    messages=self._build_messages(prompt, system),
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                    stream=True,
+                    stream_options={"include_usage": True},
+                ) as response:
+                    for chunk in response:
+                        # With include_usage the last chunk carries usage and no choices
+                        self._record_usage(tracker, chunk.usage)
+                        if chunk.choices and chunk.choices[0].delta.content:
+                            tracker.first_token()
+                            yield chunk.choices[0].delta.content
+
+        yield from self.resilience.stream(open_stream)
+
+    async def agenerate(
+        self,
+        prompt: str,
+        max_tokens: int = 2000,
+        temperature: float = 0.7,
+        system: Optional[str] = None,
+    ) -> str:
+        """Generate content using GPT-4 Turbo without blocking the event loop"""
+        tokens = estimate_tokens(prompt, system, max_tokens)
+
+        async def call():
+            await rate_limiter.acquire("openai", self.model, tokens)
+            with llm_ledger.track("openai", self.model) as tracker:
+                response = await self.async_client.chat.completions.create(
+                    model=self.model,
+                    messages=self._build_messages(prompt, system),
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                )
+                self._record_usage(tracker, response.usage)
+            return response.choices[0].message.content
+
+        return await self.resilience.acall(call)
+
+    async def agenerate_streaming(
+        self,
+        prompt: str,
+        max_tokens: int = 2000,
+        temperature: float = 0.7,
+        system: Optional[str] = None,
+    ) -> AsyncIterator[str]:
+        """Generate content using GPT-4 Turbo with async streaming"""
+        tokens = estimate_tokens(prompt, system, max_tokens)
+
+        async def open_stream():
+            await rate_limiter.acquire("openai", self.model, tokens)
+            with llm_ledger.track("openai", self.model, "stream") as tracker:
+                response = await self.async_client.chat.completions.create(
+                    model=self.model,
+                    messages=self._build_messages(prompt, system),
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                    stream=True,
+                    stream_options={"include_usage": True},
+                )
+                async with response:
+                    async for chunk in response:
+                        # With include_usage the last chunk carries usage and no choices
+                        self._record_usage(tracker, chunk.usage)
+                        if chunk.choices and chunk.choices[0].delta.content:
+                            tracker.first_token()
+                            yield chunk.choices[0].delta.content
+
+        async for text in self.resilience.astream(open_stream):
+            yield text
 
     def get_embedding(self, text: str) -> list:
         """Get embedding for text"""
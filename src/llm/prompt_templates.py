@@ -1,11 +1,15 @@
 """Prompt templates for different content types and tones."""
 
+from typing import Tuple
 from src.llm.prompts import (
     get_virtue_system_prompt,
     get_virtue_short_template,
     get_virtue_thread_template,
 )
 
+# Per-request template fields; these always come last so the prefix can be cached
+VARIABLE_FIELDS = ("topic", "knowledge_context", "original_content", "username")
+
 STOIC_SYSTEM_PROMPT = """You are a stoic philosopher committed to the timeless wisdom of stoicism. Your goal is to help others understand and apply stoic principles to their lives.
 
 Core Stoic Principles you embody:
@@ -34,11 +38,7 @@ For Twitter/X posts specifically:
 - Each tweet should stand alone but threads can build
 - Keep the tone warm, encouraging, and conversational"""
 
-SHORT_TWEET_TEMPLATE = """{system_prompt}
-
-Create ONE powerful tweet about: {topic}
-
-{knowledge_context}
+SHORT_TWEET_TEMPLATE = """Create ONE powerful tweet about the topic below.
 
 Requirements:
 - 70-150 characters (shorter is better for engagement)
@@ -47,15 +47,13 @@ Requirements:
 - Can be: quote, insight, question, or hot take
 - Use 1-2 relevant hashtags at the end
 
-Write ONLY the tweet text, nothing else. No explanations."""
-
-THREAD_TEMPLATE = """{system_prompt}
+Write ONLY the tweet text, nothing else. No explanations.
 
-Create a 5-tweet thread telling ONE coherent story about: {topic}
+Topic: {topic}
 
-{knowledge_context}
+{knowledge_context}"""
 
-{style_examples}
+THREAD_TEMPLATE = """Create a 5-tweet thread telling ONE coherent story about the topic below.
 
 Structure (follow exactly):
 1/ Hook - Start with a relatable problem or bold claim that grabs attention
@@ -76,13 +74,15 @@ Format exactly as:
 2/ [tweet]
 3/ [tweet]
 4/ [tweet]
-5/ [tweet]"""
+5/ [tweet]
+
+{style_examples}
 
-LONG_POST_TEMPLATE = """{system_prompt}
+Topic: {topic}
 
-Write a long-form X post (essay style) about: {topic}
+{knowledge_context}"""
 
-{knowledge_context}
+LONG_POST_TEMPLATE = """Write a long-form X post (essay style) about the topic below.
 
 Requirements:
 - Total length: 1500-3000 characters
@@ -94,24 +94,25 @@ Requirements:
 - End with a reflection question or call to action
 - No hashtags in the body, optionally 1-2 at the very end
 
-Write the essay directly, no explanations."""
-
-REPLY_TEMPLATE = """{system_prompt}
+Write the essay directly, no explanations.
 
-You're replying to this tweet:
-"{original_content}"
-By: @{username}
+Topic: {topic}
 
-{knowledge_context}
+{knowledge_context}"""
 
-Write a thoughtful reply that:
+REPLY_TEMPLATE = """Write a thoughtful reply to the tweet below that:
 - Is 100-200 characters (NEVER exceed 280)
 - Adds stoic wisdom naturally and conversationally
 - Engages with what they said specifically
 - Isn't preachy or lecturing
 - Feels like a genuine conversation
 
-Write ONLY the reply text, nothing else."""
+Write ONLY the reply text, nothing else.
+
+Tweet from @{username}:
+"{original_content}"
+
+{knowledge_context}"""
 
 REFINE_TEMPLATE = """You are helping refine a stoic-themed tweet/post.
 
@@ -160,13 +161,18 @@ def build_format_prompt(
     original_content: str = "",
     username: str = "",
     virtue: str = None,
+    inline_system: bool = False,
 ) -> str:
-    """Build a prompt for a specific tweet format (short/thread/long/reply)."""
-    system_prompt = get_system_prompt("twitter", virtue)
+    """
+    Build a prompt for a specific tweet format (short/thread/long/reply).
+
+    The persona is sent once, as the system prompt (get_system_prompt), so by
+    default it is not repeated here. Pass inline_system=True only for callers
+    that cannot send a system prompt and need the persona in the user message.
+    """
     template = get_format_template(format_type, virtue)
 
-    return template.format(
-        system_prompt=system_prompt,
+    prompt = template.format(
         topic=topic,
         knowledge_context=knowledge_context,
         style_examples=style_examples,
@@ -174,6 +180,56 @@ def build_format_prompt(
         username=username,
     )
 
+    if inline_system:
+        return f"{get_system_prompt('twitter', virtue)}\n\n{prompt}"
+    return prompt
+
+
+def split_template(template: str) -> Tuple[str, str]:
+    """
+    Split a format template into its static prefix and variable suffix.
+
+    Templates keep their per-request fields (topic, knowledge context, the
+    tweet being replied to) at the end, so everything before the first line
+    that uses one of them is identical across calls and can be cached.
+    """
+    offset = 0
+    for line in template.splitlines(keepends=True):
+        if any(f"{{{field}}}" in line for field in VARIABLE_FIELDS):
+            return template[:offset].rstrip(), template[offset:]
+        offset += len(line)
+    return template.rstrip(), ""
+
+
+def build_format_messages(
+    format_type: str,
+    topic: str,
+    knowledge_context: str = "",
+    style_examples: str = "",
+    original_content: str = "",
+    username: str = "",
+    virtue: str = None,
+) -> Tuple[str, str]:
+    """
+    Build (system, prompt) for a tweet format, ordered for prompt caching.
+
+    The system prompt holds the static prefix - persona, format rules and
+    thread style examples - which is identical across calls for a given
+    format/virtue. The user prompt holds only the per-request topic and
+    knowledge context.
+    """
+    static, variable = split_template(get_format_template(format_type, virtue))
+
+    system = f"{get_system_prompt('twitter', virtue)}\n\n{static.format(style_examples=style_examples).strip()}"
+    prompt = variable.format(
+        topic=topic,
+        knowledge_context=knowledge_context,
+        original_content=original_content,
+        username=username,
+    ).strip()
+
+    return system, prompt
+
 
 def build_refine_prompt(content: str, instruction: str) -> str:
     """Build a prompt for refining content with LLM."""
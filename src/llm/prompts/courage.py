@@ -16,13 +16,7 @@ When writing about Courage:
 - Reference Seneca on adversity, Marcus on duty
 - Inspire action without minimizing difficulty"""
 
-COURAGE_SHORT_TEMPLATE = """{system_prompt}
-
-Create ONE powerful tweet about courage and facing fears.
-
-Topic focus: {topic}
-
-{knowledge_context}
+COURAGE_SHORT_TEMPLATE = """Create ONE powerful tweet about courage and facing fears.
 
 Requirements:
 - 70-150 characters (shorter is better)
@@ -30,17 +24,13 @@ Requirements:
 - Make it inspiring but grounded
 - Use 1-2 relevant hashtags
 
-Write ONLY the tweet text, nothing else."""
-
-COURAGE_THREAD_TEMPLATE = """{system_prompt}
-
-Create a 5-tweet thread about developing courage.
+Write ONLY the tweet text, nothing else.
 
 Topic focus: {topic}
 
-{knowledge_context}
+{knowledge_context}"""
 
-{style_examples}
+COURAGE_THREAD_TEMPLATE = """Create a 5-tweet thread about developing courage.
 
 Structure:
 1/ Hook - A fear that holds many back
@@ -56,4 +46,10 @@ Format as:
 2/ [tweet]
 3/ [tweet]
 4/ [tweet]
-5/ [tweet]"""
+5/ [tweet]
+
+{style_examples}
+
+Topic focus: {topic}
+
+{knowledge_context}"""
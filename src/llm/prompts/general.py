@@ -18,73 +18,59 @@ When writing about these concepts:
 - Show how these practices transform daily life
 - Reference specific philosophers when appropriate"""
 
-AMOR_FATI_TEMPLATE = """{system_prompt}
-
-Create content about AMOR FATI - loving your fate.
-
-Topic focus: {topic}
-
-{knowledge_context}
+AMOR_FATI_TEMPLATE = """Create content about AMOR FATI - loving your fate.
 
 The essence: Not just accepting what happens, but loving it. Seeing everything - especially difficulties - as necessary for your growth.
 
 Requirements:
 - Make acceptance feel empowering, not passive
 - Show how embracing fate transforms suffering
-- Connect to real situations people face"""
-
-MEMENTO_MORI_TEMPLATE = """{system_prompt}
-
-Create content about MEMENTO MORI - remembering death.
+- Connect to real situations people face
 
 Topic focus: {topic}
 
-{knowledge_context}
+{knowledge_context}"""
+
+MEMENTO_MORI_TEMPLATE = """Create content about MEMENTO MORI - remembering death.
 
 The essence: Using awareness of mortality to live more fully. Death as teacher, not terror.
 
 Requirements:
 - Handle with wisdom, not morbidity
 - Show how death awareness clarifies priorities
-- Connect to living fully today"""
-
-PREMEDITATIO_TEMPLATE = """{system_prompt}
-
-Create content about PREMEDITATIO MALORUM - negative visualization.
+- Connect to living fully today
 
 Topic focus: {topic}
 
-{knowledge_context}
+{knowledge_context}"""
+
+PREMEDITATIO_TEMPLATE = """Create content about PREMEDITATIO MALORUM - negative visualization.
 
 The essence: Imagining worst cases to reduce their power and prepare mentally for adversity.
 
 Requirements:
 - Show this as strength, not pessimism
 - Connect to practical preparation
-- Demonstrate how it builds resilience"""
-
-DICHOTOMY_TEMPLATE = """{system_prompt}
-
-Create content about the DICHOTOMY OF CONTROL.
+- Demonstrate how it builds resilience
 
 Topic focus: {topic}
 
-{knowledge_context}
+{knowledge_context}"""
+
+DICHOTOMY_TEMPLATE = """Create content about the DICHOTOMY OF CONTROL.
 
 The essence: Some things are up to us (our judgments, choices, actions) and some are not (outcomes, others' actions, external events).
 
 Requirements:
 - Make the distinction crystal clear
 - Show liberation that comes from focusing rightly
-- Give practical examples of applying this"""
-
-GENERAL_SHORT_TEMPLATE = """{system_prompt}
-
-Create ONE powerful tweet about stoic philosophy.
+- Give practical examples of applying this
 
 Topic focus: {topic}
 
-{knowledge_context}
+{knowledge_context}"""
+
+GENERAL_SHORT_TEMPLATE = """Create ONE powerful tweet about stoic philosophy.
 
 Requirements:
 - 70-150 characters (shorter is better)
@@ -92,17 +78,13 @@ Requirements:
 - Make it memorable and shareable
 - Use 1-2 relevant hashtags
 
-Write ONLY the tweet text, nothing else."""
-
-GENERAL_THREAD_TEMPLATE = """{system_prompt}
-
-Create a 5-tweet thread about stoic wisdom.
+Write ONLY the tweet text, nothing else.
 
 Topic focus: {topic}
 
-{knowledge_context}
+{knowledge_context}"""
 
-{style_examples}
+GENERAL_THREAD_TEMPLATE = """Create a 5-tweet thread about stoic wisdom.
 
 Structure:
 1/ Hook - A common struggle or question
@@ -118,4 +100,10 @@ Format as:
 2/ [tweet]
 3/ [tweet]
 4/ [tweet]
-5/ [tweet]"""
+5/ [tweet]
+
+{style_examples}
+
+Topic focus: {topic}
+
+{knowledge_context}"""
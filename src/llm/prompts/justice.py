@@ -16,13 +16,7 @@ When writing about Justice:
 - Reference Marcus on social duty, Epictetus on roles
 - Inspire service without being preachy"""
 
-JUSTICE_SHORT_TEMPLATE = """{system_prompt}
-
-Create ONE powerful tweet about justice and treating others well.
-
-Topic focus: {topic}
-
-{knowledge_context}
+JUSTICE_SHORT_TEMPLATE = """Create ONE powerful tweet about justice and treating others well.
 
 Requirements:
 - 70-150 characters (shorter is better)
@@ -30,17 +24,13 @@ Requirements:
 - Make it resonate with modern life
 - Use 1-2 relevant hashtags
 
-Write ONLY the tweet text, nothing else."""
-
-JUSTICE_THREAD_TEMPLATE = """{system_prompt}
-
-Create a 5-tweet thread about living justly.
+Write ONLY the tweet text, nothing else.
 
 Topic focus: {topic}
 
-{knowledge_context}
+{knowledge_context}"""
 
-{style_examples}
+JUSTICE_THREAD_TEMPLATE = """Create a 5-tweet thread about living justly.
 
 Structure:
 1/ Hook - A moment of choosing fairness or self-interest
@@ -56,4 +46,10 @@ Format as:
 2/ [tweet]
 3/ [tweet]
 4/ [tweet]
-5/ [tweet]"""
+5/ [tweet]
+
+{style_examples}
+
+Topic focus: {topic}
+
+{knowledge_context}"""
@@ -16,13 +16,7 @@ When writing about Temperance:
 - Reference Seneca on desires, Epictetus on impressions
 - Make discipline feel empowering, not punishing"""
 
-TEMPERANCE_SHORT_TEMPLATE = """{system_prompt}
-
-Create ONE powerful tweet about self-control and moderation.
-
-Topic focus: {topic}
-
-{knowledge_context}
+TEMPERANCE_SHORT_TEMPLATE = """Create ONE powerful tweet about self-control and moderation.
 
 Requirements:
 - 70-150 characters (shorter is better)
@@ -30,17 +24,13 @@ Requirements:
 - Make restraint feel freeing
 - Use 1-2 relevant hashtags
 
-Write ONLY the tweet text, nothing else."""
-
-TEMPERANCE_THREAD_TEMPLATE = """{system_prompt}
-
-Create a 5-tweet thread about developing self-control.
+Write ONLY the tweet text, nothing else.
 
 Topic focus: {topic}
 
-{knowledge_context}
+{knowledge_context}"""
 
-{style_examples}
+TEMPERANCE_THREAD_TEMPLATE = """Create a 5-tweet thread about developing self-control.
 
 Structure:
 1/ Hook - The hidden cost of unchecked desires
@@ -56,4 +46,10 @@ Format as:
 2/ [tweet]
 3/ [tweet]
 4/ [tweet]
-5/ [tweet]"""
+5/ [tweet]
+
+{style_examples}
+
+Topic focus: {topic}
+
+{knowledge_context}"""
@@ -16,13 +16,7 @@ When writing about Wisdom:
 - Reference philosophers like Marcus Aurelius on reflection, Epictetus on judgment
 - Help readers develop their own discernment"""
 
-WISDOM_SHORT_TEMPLATE = """{system_prompt}
-
-Create ONE powerful tweet about wisdom and practical judgment.
-
-Topic focus: {topic}
-
-{knowledge_context}
+WISDOM_SHORT_TEMPLATE = """Create ONE powerful tweet about wisdom and practical judgment.
 
 Requirements:
 - 70-150 characters (shorter is better)
@@ -30,17 +24,13 @@ Requirements:
 - Make it memorable and shareable
 - Use 1-2 relevant hashtags
 
-Write ONLY the tweet text, nothing else."""
-
-WISDOM_THREAD_TEMPLATE = """{system_prompt}
-
-Create a 5-tweet thread about developing wisdom and good judgment.
+Write ONLY the tweet text, nothing else.
 
 Topic focus: {topic}
 
-{knowledge_context}
+{knowledge_context}"""
 
-{style_examples}
+WISDOM_THREAD_TEMPLATE = """Create a 5-tweet thread about developing wisdom and good judgment.
 
 Structure:
 1/ Hook - A moment when wisdom changed everything
@@ -56,4 +46,10 @@ Format as:
 2/ [tweet]
 3/ [tweet]
 4/ [tweet]
-5/ [tweet]"""
+5/ [tweet]
+
+{style_examples}
+
+Topic focus: {topic}
+
+{knowledge_context}"""
@@ -0,0 +1,292 @@
+"""Client-side RPM/TPM limiting for LLM calls.
+
+Each (provider, model) pair has two token buckets, one for requests and one
+for tokens, refilled continuously at the configured per-minute rate. A call
+reserves one request and its estimated tokens before it is sent. The
+estimate is the prompt and system tokens plus max_tokens, which is also how
+OpenAI counts a request against TPM when it arrives. Calls that do not fit
+wait in a priority queue instead of being throttled by the provider, so
+bursts from batch generation, the draft pool and suggestions are spread out
+rather than failing with 429.
+
+Waiters are admitted strictly in priority order, then arrival order:
+interactive dashboard requests (the default) go ahead of anything queued at
+BACKGROUND priority. Code that generates in bulk marks its calls with
+`with llm_priority(BACKGROUND):`. The priority is a context variable, so it
+follows the call into tasks started inside the block.
+
+Limits come from LLM_RATE_LIMITS, e.g. "openai=500/30000,anthropic:claude-3-5-sonnet-20241022=50/40000"
+(requests/tokens per minute; a provider-wide entry applies to models without their own).
+"""
+
+import asyncio
+import contextvars
+import heapq
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional, Tuple
+from src.utils.config import Config
+from src.utils.tokens import count_tokens
+
+INTERACTIVE = 0
+BACKGROUND = 10
+PRIORITY_NAMES = {INTERACTIVE: "interactive", BACKGROUND: "background"}
+
+_priority = contextvars.ContextVar("llm_priority", default=INTERACTIVE)
+
+
+@contextmanager
+def llm_priority(priority: int):
+    """Run the enclosed LLM calls (and tasks started inside) at this priority."""
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority() -> int:
+    return _priority.get()
+
+
+def parse_rate_limits(spec: str) -> Dict[str, Tuple[float, float]]:
+    """
+    Parse an LLM_RATE_LIMITS string.
+
+    Args:
+        spec: Comma-separated "provider[:model]=rpm/tpm" entries
+
+    Returns:
+        {"provider" or "provider:model": (requests_per_minute, tokens_per_minute)}
+    """
+    limits = {}
+    for entry in (spec or "").split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        try:
+            key, value = entry.split("=", 1)
+            rpm, tpm = value.split("/", 1)
+            limits[key.strip()] = (float(rpm), float(tpm))
+        except ValueError:
+            raise ValueError(f"Invalid LLM_RATE_LIMITS entry {entry!r}; expected provider[:model]=rpm/tpm")
+    return limits
+
+
+def estimate_tokens(prompt: str, system: Optional[str], max_tokens: int) -> int:
+    """Tokens a call can use: the prompt and system prompt plus the completion budget."""
+    return count_tokens(prompt) + count_tokens(system or "") + max_tokens
+
+
+class TokenBucket:
+    """Bucket refilled continuously at rate_per_minute, holding at most capacity."""
+
+    def __init__(self, rate_per_minute: float, capacity: float):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity
+        self.level = capacity
+        self.updated = time.monotonic()
+
+    def available(self, now: float) -> float:
+        """Current level after refilling for the time elapsed."""
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+        return self.level
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until amount is available (0 if it is now)."""
+        if self.available(now) >= amount:
+            return 0.0
+        return (amount - self.level) / self.rate
+
+    def take(self, amount: float):
+        self.level -= amount
+
+
+class _Waiter:
+    """A queued call; wake() tells it to re-check whether it can be admitted."""
+
+    def __init__(self, priority: int, seq: int, tokens: int, loop: Optional[asyncio.AbstractEventLoop]):
+        self.priority = priority
+        self.seq = seq
+        self.tokens = tokens
+        self.loop = loop
+        self.event = threading.Event() if loop is None else None
+        self.future = None
+
+    def __lt__(self, other: "_Waiter") -> bool:
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+    def reset(self):
+        if self.loop is None:
+            self.event.clear()
+        else:
+            self.future = self.loop.create_future()
+
+    def wake(self):
+        if self.loop is None:
+            self.event.set()
+        else:
+            future = self.future
+            if future is not None:
+                self.loop.call_soon_threadsafe(lambda: future.done() or future.set_result(None))
+
+
+class _Limit:
+    """Request and token buckets plus the wait queue for one (provider, model)."""
+
+    def __init__(self, rpm: float, tpm: float, burst_seconds: float):
+        # Capacity of burst_seconds' worth of quota admits small bursts but
+        # spreads sustained load, instead of allowing a full minute at once
+        self.requests = TokenBucket(rpm, max(1.0, rpm * burst_seconds / 60))
+        self.tokens = TokenBucket(tpm, max(1.0, tpm * burst_seconds / 60))
+        self.queue = []
+        self.admitted = {name: 0 for name in PRIORITY_NAMES.values()}
+        self.waited = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def wait_time(self, tokens: float) -> float:
+        now = time.monotonic()
+        return max(self.requests.wait_time(1, now), self.tokens.wait_time(tokens, now))
+
+
+class RateLimiter:
+    """Process-wide RPM/TPM limiter shared by every LLM client."""
+
+    def __init__(self, limits: Optional[Dict[str, Tuple[float, float]]] = None, burst_seconds: Optional[float] = None):
+        """
+        Args:
+            limits: {"provider" or "provider:model": (rpm, tpm)} (defaults to Config.LLM_RATE_LIMITS)
+            burst_seconds: Seconds of quota a bucket holds (defaults to Config.LLM_RATE_LIMIT_BURST_SECONDS)
+        """
+        self.limits = parse_rate_limits(Config.LLM_RATE_LIMITS) if limits is None else limits
+        self.burst_seconds = burst_seconds or Config.LLM_RATE_LIMIT_BURST_SECONDS
+        self._lock = threading.Lock()
+        self._state: Dict[Tuple[str, str], _Limit] = {}
+        self._seq = itertools.count()
+
+    def _limit(self, provider: str, model: str) -> Optional[_Limit]:
+        key = (provider, model)
+        with self._lock:
+            if key not in self._state:
+                rpm_tpm = self.limits.get(f"{provider}:{model}") or self.limits.get(provider)
+                self._state[key] = _Limit(*rpm_tpm, self.burst_seconds) if rpm_tpm else None
+            return self._state[key]
+
+    def _enqueue(self, limit: _Limit, tokens: int, loop) -> _Waiter:
+        # A call larger than the bucket could never be admitted; let it take the whole bucket
+        tokens = min(tokens, limit.tokens.capacity)
+        waiter = _Waiter(current_priority(), next(self._seq), tokens, loop)
+        with self._lock:
+            heapq.heappush(limit.queue, waiter)
+        return waiter
+
+    def _try_admit(self, limit: _Limit, waiter: _Waiter, started: float) -> Optional[float]:
+        """
+        Admit waiter if it is at the head of the queue and both buckets have room.
+
+        Returns:
+            0 when admitted, seconds until the head could be admitted, or None
+            when waiter is not at the head (it is woken when it becomes head)
+        """
+        with self._lock:
+            waiter.reset()
+            if limit.queue[0] is not waiter:
+                return None
+            delay = limit.wait_time(waiter.tokens)
+            if delay > 0:
+                return delay
+
+            limit.requests.take(1)
+            limit.tokens.take(waiter.tokens)
+            heapq.heappop(limit.queue)
+            waited = time.monotonic() - started
+            limit.admitted[PRIORITY_NAMES.get(waiter.priority, str(waiter.priority))] += 1
+            if waited > 0.001:
+                limit.waited += 1
+                limit.wait_seconds += waited
+                limit.max_wait_seconds = max(limit.max_wait_seconds, waited)
+            if limit.queue:
+                limit.queue[0].wake()
+            return 0.0
+
+    def _abandon(self, limit: _Limit, waiter: _Waiter):
+        """Drop a cancelled waiter, handing the head of the queue on if it had it."""
+        with self._lock:
+            if waiter not in limit.queue:
+                return
+            was_head = limit.queue[0] is waiter
+            limit.queue.remove(waiter)
+            heapq.heapify(limit.queue)
+            if was_head and limit.queue:
+                limit.queue[0].wake()
+
+    async def acquire(self, provider: str, model: str, tokens: int):
+        """
+        Wait until a call of `tokens` estimated tokens may be sent.
+
+        Args:
+            provider: Provider key, e.g. "openai"
+            model: Model name the call uses
+            tokens: Estimated tokens (see estimate_tokens)
+        """
+        limit = self._limit(provider, model)
+        if limit is None:
+            return
+
+        started = time.monotonic()
+        waiter = self._enqueue(limit, tokens, asyncio.get_running_loop())
+        try:
+            while True:
+                delay = self._try_admit(limit, waiter, started)
+                if delay == 0:
+                    return
+                await asyncio.wait({waiter.future}, timeout=delay)
+        except BaseException:
+            self._abandon(limit, waiter)
+            raise
+
+    def acquire_blocking(self, provider: str, model: str, tokens: int):
+        """Blocking version of acquire() for the synchronous client methods."""
+        limit = self._limit(provider, model)
+        if limit is None:
+            return
+
+        started = time.monotonic()
+        waiter = self._enqueue(limit, tokens, None)
+        try:
+            while True:
+                delay = self._try_admit(limit, waiter, started)
+                if delay == 0:
+                    return
+                waiter.event.wait(timeout=delay)
+        except BaseException:
+            self._abandon(limit, waiter)
+            raise
+
+    def get_stats(self) -> Dict:
+        """Get per (provider, model) limits, bucket levels, queue depth and wait times."""
+        with self._lock:
+            stats = {}
+            now = time.monotonic()
+            for (provider, model), limit in self._state.items():
+                if limit is None:
+                    continue
+                stats[f"{provider}:{model}"] = {
+                    "requests_per_minute": round(limit.requests.rate * 60),
+                    "tokens_per_minute": round(limit.tokens.rate * 60),
+                    "requests_available": round(limit.requests.available(now), 1),
+                    "tokens_available": round(limit.tokens.available(now)),
+                    "queued": len(limit.queue),
+                    "admitted": dict(limit.admitted),
+                    "waited": limit.waited,
+                    "avg_wait_ms": round(1000 * limit.wait_seconds / limit.waited, 1) if limit.waited else 0.0,
+                    "max_wait_ms": round(1000 * limit.max_wait_seconds, 1),
+                }
+            return stats
+
+
+rate_limiter = RateLimiter()
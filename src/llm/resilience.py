@@ -0,0 +1,393 @@
+"""Typed errors, retries with backoff, and per-provider circuit breakers for LLM calls.
+
+Each client wraps its SDK calls in a Resilience object, which:
+
+- turns SDK exceptions into LLMError subclasses that say whether the call can
+  be retried (429, 408/409 and 5xx statuses, connection errors and timeouts)
+- retries those with exponential backoff and full jitter, waiting at least as
+  long as the provider's Retry-After asks and giving up when it asks for more
+  than LLM_RETRY_AFTER_MAX_SECONDS
+- counts retryable failures in the provider's CircuitBreaker. After
+  LLM_BREAKER_FAILURE_THRESHOLD failures in a row the breaker opens and calls
+  fail at once with CircuitOpenError, instead of each waiting out the SDK
+  timeout. After LLM_BREAKER_RESET_SECONDS, one probe call is let through and
+  its outcome closes or re-opens the breaker.
+
+Streams are retried only until their first token arrives. After that, text
+has already reached the caller.
+
+The SDK clients are built with max_retries=0 so that retries happen only here.
+Breaker state is reported by /health.
+"""
+
+import asyncio
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Optional, Tuple, Type
+from src.utils.config import Config
+
+RETRYABLE_STATUSES = {408, 409, 429}
+
+
+class LLMError(Exception):
+    """An LLM provider call failed."""
+
+    def __init__(
+        self,
+        message: str,
+        provider: str,
+        status_code: Optional[int] = None,
+        retryable: bool = False,
+        retry_after: Optional[float] = None,
+    ):
+        super().__init__(message)
+        self.provider = provider
+        self.status_code = status_code
+        self.retryable = retryable
+        self.retry_after = retry_after
+
+
+class RateLimitError(LLMError):
+    """The provider rejected the call with 429."""
+
+
+class ProviderUnavailableError(LLMError):
+    """5xx/overloaded responses, connection errors and timeouts."""
+
+
+class InvalidRequestError(LLMError):
+    """4xx responses that retrying will not fix (bad request, auth, not found)."""
+
+
+class CircuitOpenError(LLMError):
+    """The provider's circuit breaker is open; the call was not attempted."""
+
+
+def parse_retry_after(headers) -> Optional[float]:
+    """
+    Read the wait a provider asked for from response headers.
+
+    Args:
+        headers: Response headers (any mapping with .get), or None
+
+    Returns:
+        Seconds to wait, from retry-after-ms or retry-after (seconds or an HTTP date), or None
+    """
+    if not headers:
+        return None
+    try:
+        value = headers.get("retry-after-ms")
+        if value:
+            return max(0.0, float(value) / 1000)
+        value = headers.get("retry-after")
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def classify_error(
+    provider: str,
+    label: str,
+    error: Exception,
+    connection_errors: Tuple[Type[BaseException], ...] = (),
+) -> LLMError:
+    """
+    Map an SDK exception to a typed LLMError.
+
+    Args:
+        provider: Breaker key, e.g. "openai"
+        label: Name used in the message, e.g. "OpenAI"
+        error: The exception raised by the SDK call
+        connection_errors: The SDK's connection/timeout exception types
+
+    Returns:
+        An LLMError subclass; existing LLMErrors are returned unchanged
+    """
+    if isinstance(error, LLMError):
+        return error
+
+    message = f"Error calling {label} API: {error}"
+    status = getattr(error, "status_code", None)
+    headers = getattr(getattr(error, "response", None), "headers", None)
+
+    if isinstance(status, int):
+        retryable = status in RETRYABLE_STATUSES or status >= 500
+        should_retry = headers.get("x-should-retry") if headers else None
+        if should_retry in ("true", "false"):
+            retryable = should_retry == "true"
+        retry_after = parse_retry_after(headers)
+        if status == 429:
+            return RateLimitError(message, provider, status, retryable, retry_after)
+        if status in RETRYABLE_STATUSES or status >= 500:
+            return ProviderUnavailableError(message, provider, status, retryable, retry_after)
+        return InvalidRequestError(message, provider, status, retryable, retry_after)
+
+    if isinstance(error, connection_errors + (ConnectionError, TimeoutError, asyncio.TimeoutError)):
+        return ProviderUnavailableError(message, provider, retryable=True)
+
+    return LLMError(message, provider)
+
+
+class CircuitBreaker:
+    """Closed -> open after consecutive failures -> half-open probe -> closed or open again."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, provider: str, failure_threshold: Optional[int] = None, reset_timeout: Optional[float] = None):
+        self.provider = provider
+        self.failure_threshold = failure_threshold or Config.LLM_BREAKER_FAILURE_THRESHOLD
+        self.reset_timeout = Config.LLM_BREAKER_RESET_SECONDS if reset_timeout is None else reset_timeout
+        self._lock = threading.Lock()
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+        self.times_opened = 0
+        self.rejected = 0
+        self.retries = 0
+
+    def before_call(self):
+        """Raise CircuitOpenError unless a call may go ahead (closed, or the single half-open probe)."""
+        with self._lock:
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self._probing = False
+            if self.state == self.CLOSED:
+                return
+            if self.state == self.HALF_OPEN and not self._probing:
+                self._probing = True
+                return
+            self.rejected += 1
+            retry_in = max(0.0, self.reset_timeout - (time.monotonic() - self.opened_at))
+
+        raise CircuitOpenError(
+            f"{self.provider} circuit breaker is open; retry in {retry_in:.1f}s",
+            self.provider,
+            retry_after=retry_in,
+        )
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.consecutive_failures = 0
+            self._probing = False
+
+    def record_failure(self):
+        """Count a retryable failure; opens the breaker at the threshold or when a probe fails."""
+        with self._lock:
+            self.consecutive_failures += 1
+            self._probing = False
+            if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    self.times_opened += 1
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+    def record_retry(self):
+        with self._lock:
+            self.retries += 1
+
+    def release(self):
+        """End a call that neither proved nor disproved provider health (e.g. an invalid request)."""
+        with self._lock:
+            self._probing = False
+
+    def get_state(self) -> Dict:
+        with self._lock:
+            state = self.state
+            if state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                state = self.HALF_OPEN
+            return {
+                "state": state,
+                "consecutive_failures": self.consecutive_failures,
+                "times_opened": self.times_opened,
+                "rejected": self.rejected,
+                "retries": self.retries,
+                "retry_in_seconds": (
+                    round(max(0.0, self.reset_timeout - (time.monotonic() - self.opened_at)), 1)
+                    if state == self.OPEN else None
+                ),
+            }
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(provider: str) -> CircuitBreaker:
+    """Get the process-wide breaker for a provider, creating it on first use."""
+    with _breakers_lock:
+        if provider not in _breakers:
+            _breakers[provider] = CircuitBreaker(provider)
+        return _breakers[provider]
+
+
+def breaker_states() -> Dict[str, Dict]:
+    """Get the state of every provider's breaker."""
+    with _breakers_lock:
+        breakers = dict(_breakers)
+    return {provider: breaker.get_state() for provider, breaker in breakers.items()}
+
+
+class Resilience:
+    """Retry and circuit-breaker wrapper for one provider's calls."""
+
+    def __init__(
+        self,
+        provider: str,
+        label: str,
+        connection_errors: Tuple[Type[BaseException], ...] = (),
+        max_retries: Optional[int] = None,
+        base_delay: Optional[float] = None,
+        max_delay: Optional[float] = None,
+        max_retry_after: Optional[float] = None,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
+        """
+        Args:
+            provider: Breaker key, e.g. "openai"
+            label: Provider name for error messages, e.g. "OpenAI"
+            connection_errors: The SDK's connection/timeout exception types
+            max_retries: Retries after the first attempt (defaults to Config.LLM_MAX_RETRIES)
+            base_delay: First backoff ceiling in seconds, doubled per retry (defaults to Config.LLM_RETRY_BASE_DELAY_SECONDS)
+            max_delay: Largest backoff ceiling (defaults to Config.LLM_RETRY_MAX_DELAY_SECONDS)
+            max_retry_after: Longest Retry-After to wait for; longer asks fail at once (defaults to Config.LLM_RETRY_AFTER_MAX_SECONDS)
+            breaker: Circuit breaker (defaults to the provider's shared breaker)
+        """
+        self.provider = provider
+        self.label = label
+        self.connection_errors = connection_errors
+        self.max_retries = Config.LLM_MAX_RETRIES if max_retries is None else max_retries
+        self.base_delay = Config.LLM_RETRY_BASE_DELAY_SECONDS if base_delay is None else base_delay
+        self.max_delay = Config.LLM_RETRY_MAX_DELAY_SECONDS if max_delay is None else max_delay
+        self.max_retry_after = Config.LLM_RETRY_AFTER_MAX_SECONDS if max_retry_after is None else max_retry_after
+        self.breaker = breaker or get_breaker(provider)
+
+    def _failed(self, error: Exception, attempt: int) -> Tuple[LLMError, Optional[float]]:
+        """
+        Classify a failed attempt and update the breaker.
+
+        Returns:
+            The typed error and the seconds to wait before retrying, or None to give up
+        """
+        error = classify_error(self.provider, self.label, error, self.connection_errors)
+        if not error.retryable:
+            self.breaker.release()
+            return error, None
+
+        self.breaker.record_failure()
+        if attempt >= self.max_retries:
+            return error, None
+        if error.retry_after is not None and error.retry_after > self.max_retry_after:
+            return error, None
+
+        # Full jitter keeps concurrent callers from retrying in lockstep
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        if error.retry_after is not None:
+            delay = max(delay, error.retry_after)
+        self.breaker.record_retry()
+        return error, delay
+
+    def call(self, fn: Callable):
+        """Run a blocking SDK call with retries."""
+        attempt = 0
+        while True:
+            self.breaker.before_call()
+            try:
+                result = fn()
+            except Exception as e:
+                error, delay = self._failed(e, attempt)
+                if delay is None:
+                    raise error from e
+                time.sleep(delay)
+                attempt += 1
+                continue
+            self.breaker.record_success()
+            return result
+
+    async def acall(self, fn: Callable):
+        """Run an async SDK call (fn returns an awaitable) with retries."""
+        attempt = 0
+        while True:
+            self.breaker.before_call()
+            try:
+                result = await fn()
+            except asyncio.CancelledError:
+                self.breaker.release()
+                raise
+            except Exception as e:
+                error, delay = self._failed(e, attempt)
+                if delay is None:
+                    raise error from e
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            self.breaker.record_success()
+            return result
+
+    def stream(self, open_stream: Callable):
+        """Yield from a blocking SDK stream, retrying failures that happen before the first token."""
+        attempt = 0
+        while True:
+            self.breaker.before_call()
+            emitted = False
+            try:
+                for text in open_stream():
+                    if not emitted:
+                        emitted = True
+                        self.breaker.record_success()
+                    yield text
+            except GeneratorExit:
+                if not emitted:
+                    self.breaker.release()
+                raise
+            except Exception as e:
+                if emitted:
+                    raise classify_error(self.provider, self.label, e, self.connection_errors) from e
+                error, delay = self._failed(e, attempt)
+                if delay is None:
+                    raise error from e
+                time.sleep(delay)
+                attempt += 1
+                continue
+            if not emitted:
+                self.breaker.record_success()
+            return
+
+    async def astream(self, open_stream: Callable):
+        """Yield from an async SDK stream, retrying failures that happen before the first token."""
+        attempt = 0
+        while True:
+            self.breaker.before_call()
+            emitted = False
+            try:
+                async for text in open_stream():
+                    if not emitted:
+                        emitted = True
+                        self.breaker.record_success()
+                    yield text
+            except (asyncio.CancelledError, GeneratorExit):
+                if not emitted:
+                    self.breaker.release()
+                raise
+            except Exception as e:
+                if emitted:
+                    raise classify_error(self.provider, self.label, e, self.connection_errors) from e
+                error, delay = self._failed(e, attempt)
+                if delay is None:
+                    raise error from e
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            if not emitted:
+                self.breaker.record_success()
+            return
@@ -0,0 +1,258 @@
+"""Opt-in cache of LLM responses for repeated refine/suggest clicks.
+
+Keys are a SHA-256 of (requested model, system prompt, normalized prompt,
+max_tokens, temperature), so only a byte-for-byte repeat of the same
+request is served from the cache. Entries are evicted least recently used
+over max_entries and expire after the TTL.
+
+There are two backends. The in-process memory backend is the default. The
+SQLite backend keeps entries across restarts and lets several workers on one
+host share them.
+
+TwitterGenerator decides what is cacheable, and only calls that decode at
+temperature 0 are. Refinements (refine, suggest, virtue-shift) are edits
+the user expects to be repeatable, so while the cache is on they run at
+temperature 0 and are cached. Generations and replies keep sampling,
+because asking again is meant to give a new draft. They bypass the cache
+unless LLM_RESPONSE_CACHE_GENERATE is on and SOCIAL_TEMPERATURE is 0.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Optional
+from src.utils.config import Config
+
+# Bump when the key layout changes so stale SQLite entries are never matched
+KEY_VERSION = 1
+RESPONSE_CACHE_BACKENDS = ("memory", "sqlite")
+
+
+def normalize_prompt(text: Optional[str]) -> str:
+    """Unify line endings and trailing whitespace, which never change the model's answer."""
+    if not text:
+        return ""
+    lines = text.replace("\r\n", "\n").split("\n")
+    return "\n".join(line.rstrip() for line in lines).strip()
+
+
+def response_cache_key(model: str, system: Optional[str], prompt: str, max_tokens: int, temperature: Optional[float]) -> str:
+    """Stable key for one LLM request."""
+    payload = json.dumps(
+        {
+            "v": KEY_VERSION,
+            "model": model,
+            "system": normalize_prompt(system),
+            "prompt": normalize_prompt(prompt),
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class MemoryResponseBackend:
+    """In-process LRU of responses with a per-entry TTL."""
+
+    name = "memory"
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return dict(value)
+
+    def put(self, key: str, value: Dict) -> int:
+        """Store value; returns how many entries were evicted."""
+        with self._lock:
+            self._entries[key] = (dict(value), time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(key)
+            evicted = 0
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                evicted += 1
+            return evicted
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteResponseBackend:
+    """Local SQLite table of responses; LRU by last access, TTL by creation time."""
+
+    name = "sqlite"
+
+    def __init__(self, path: str, max_entries: int, ttl_seconds: float):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            """CREATE TABLE IF NOT EXISTS llm_responses (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )"""
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS llm_responses_accessed ON llm_responses (accessed_at)")
+        self._db.commit()
+
+    def get(self, key: str) -> Optional[Dict]:
+        now = time.time()
+        with self._lock:
+            row = self._db.execute("SELECT value, created_at FROM llm_responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            value, created_at = row
+            if created_at + self.ttl_seconds < now:
+                self._db.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+                self._db.commit()
+                return None
+            self._db.execute("UPDATE llm_responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self._db.commit()
+        return json.loads(value)
+
+    def put(self, key: str, value: Dict) -> int:
+        """Store value; returns how many entries were evicted."""
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO llm_responses (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), now, now),
+            )
+            # Expired rows go first, then the least recently used over capacity
+            evicted = self._db.execute(
+                "DELETE FROM llm_responses WHERE created_at < ?", (now - self.ttl_seconds,)
+            ).rowcount
+            overflow = self._db.execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0] - self.max_entries
+            if overflow > 0:
+                evicted += self._db.execute(
+                    "DELETE FROM llm_responses WHERE key IN "
+                    "(SELECT key FROM llm_responses ORDER BY accessed_at LIMIT ?)",
+                    (overflow,),
+                ).rowcount
+            self._db.commit()
+            return evicted
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM llm_responses")
+            self._db.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0]
+
+
+class ResponseCache:
+    """LLM response cache over a memory or SQLite backend, with hit/miss accounting."""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self.evictions = 0
+        self.saved_ms = 0.0
+
+    def get(self, key: str) -> Optional[Dict]:
+        """
+        Look up a response.
+
+        Returns:
+            {"text", "model", "latency_ms"} as stored by put(), or None on a miss
+        """
+        value = self.backend.get(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self.saved_ms += value.get("latency_ms") or 0.0
+        return value
+
+    def put(self, key: str, text: str, model: str, latency_ms: float):
+        """Store a response with the provider that produced it and how long the call took."""
+        evicted = self.backend.put(key, {"text": text, "model": model, "latency_ms": round(latency_ms, 1)})
+        if evicted:
+            with self._lock:
+                self.evictions += evicted
+
+    def record_bypass(self):
+        with self._lock:
+            self.bypassed += 1
+
+    def clear(self):
+        self.backend.clear()
+
+    def get_stats(self) -> Dict:
+        """Get size, hit ratio, bypasses and the LLM latency hits avoided."""
+        size = len(self.backend)
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": True,
+                "backend": self.backend.name,
+                "size": size,
+                "max_entries": self.backend.max_entries,
+                "ttl_seconds": self.backend.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+                "bypassed": self.bypassed,
+                "evictions": self.evictions,
+                "saved_ms": round(self.saved_ms, 1),
+            }
+
+
+def create_response_cache(backend: Optional[str] = None, path: Optional[str] = None) -> ResponseCache:
+    """
+    Build a response cache from Config.
+
+    Args:
+        backend: "memory" or "sqlite" (defaults to Config.LLM_RESPONSE_CACHE_BACKEND)
+        path: SQLite file (defaults to Config.LLM_RESPONSE_CACHE_PATH)
+    """
+    backend = backend or Config.LLM_RESPONSE_CACHE_BACKEND
+    if backend not in RESPONSE_CACHE_BACKENDS:
+        raise ValueError(f"Unknown response cache backend {backend!r}; expected one of {RESPONSE_CACHE_BACKENDS}")
+
+    max_entries = Config.LLM_RESPONSE_CACHE_MAX_ENTRIES
+    ttl = Config.LLM_RESPONSE_CACHE_TTL_SECONDS
+    if backend == "sqlite":
+        return ResponseCache(SQLiteResponseBackend(path or Config.LLM_RESPONSE_CACHE_PATH, max_entries, ttl))
+    return ResponseCache(MemoryResponseBackend(max_entries, ttl))
+
+
+@lru_cache(maxsize=1)
+def get_response_cache() -> Optional[ResponseCache]:
+    """Get the process-wide response cache, or None when LLM_RESPONSE_CACHE is off."""
+    if not Config.LLM_RESPONSE_CACHE:
+        return None
+    return create_response_cache()
@@ -0,0 +1,485 @@
+"""Route LLM calls across providers with hedged requests and failover.
+
+LLMRouter holds one client per provider ("gpt4" -> OpenAIClient, "claude" ->
+AnthropicClient) and exposes the same generate / agenerate / streaming
+interface as a single client. Each call goes to the requested provider first.
+If it has not answered once the provider's recent latency reaches
+LLM_HEDGE_PERCENTILE, the same request is also sent to the next provider and
+whichever answers first wins; the loser is cancelled. A provider that errors
+is failed over to the next one.
+
+Hedging at the p95 adds roughly 5% extra requests while cutting the tail that
+a single slow provider would otherwise set. Streaming calls hedge on time to
+first token and only fail over before any text has been emitted.
+"""
+
+import asyncio
+import contextvars
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor
+from concurrent.futures import wait as wait_futures
+from typing import AsyncIterator, Dict, Iterator, List, Optional
+from src.utils.config import Config
+
+
+class LatencyWindow:
+    """Rolling window of recent call latencies, in seconds."""
+
+    def __init__(self, size: int = 200):
+        self.samples = deque(maxlen=size)
+
+    def add(self, seconds: float):
+        self.samples.append(seconds)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+class RoutedLLM:
+    """
+    A router view pinned to one requested model.
+
+    Has the single-client interface, so the generator can use it in place of
+    OpenAIClient; served_by names the provider that answered the last call.
+    """
+
+    def __init__(self, router: "LLMRouter", model_name: Optional[str] = None):
+        self.router = router
+        self.model_name = model_name
+        self.served_by = None
+
+    def generate(self, prompt: str, max_tokens: int = 2000, temperature: float = 0.7, system: Optional[str] = None) -> str:
+        return self.router.generate(prompt, max_tokens, temperature, system, model_name=self.model_name, route=self)
+
+    def generate_streaming(self, prompt: str, max_tokens: int = 2000, temperature: float = 0.7, system: Optional[str] = None):
+        return self.router.generate_streaming(prompt, max_tokens, temperature, system, model_name=self.model_name, route=self)
+
+    async def agenerate(self, prompt: str, max_tokens: int = 2000, temperature: float = 0.7, system: Optional[str] = None) -> str:
+        return await self.router.agenerate(prompt, max_tokens, temperature, system, model_name=self.model_name, route=self)
+
+    def agenerate_streaming(self, prompt: str, max_tokens: int = 2000, temperature: float = 0.7, system: Optional[str] = None):
+        return self.router.agenerate_streaming(prompt, max_tokens, temperature, system, model_name=self.model_name, route=self)
+
+
+class LLMRouter:
+    """Send each call to the requested provider, hedging slow calls and failing over on errors."""
+
+    def __init__(
+        self,
+        providers: Dict[str, object],
+        default: Optional[str] = None,
+        hedging: Optional[bool] = None,
+        hedge_percentile: Optional[float] = None,
+        hedge_min_samples: Optional[int] = None,
+        hedge_initial_delay: Optional[float] = None,
+        window_size: int = 200,
+    ):
+        """
+        Args:
+            providers: Provider name -> client with the OpenAIClient call interface;
+                order sets the failover order after the requested provider
+            default: Provider for calls that name no (or an unknown) model
+            hedging: Send hedged requests (defaults to Config.LLM_HEDGING)
+            hedge_percentile: Latency percentile after which to hedge (defaults to Config.LLM_HEDGE_PERCENTILE)
+            hedge_min_samples: Samples needed before the percentile is trusted (defaults to Config.LLM_HEDGE_MIN_SAMPLES)
+            hedge_initial_delay: Hedge delay in seconds until then (defaults to Config.LLM_HEDGE_INITIAL_DELAY_SECONDS)
+            window_size: Latencies kept per provider and call shape
+        """
+        if not providers:
+            raise ValueError("LLMRouter needs at least one provider")
+        self.providers = dict(providers)
+        self.default = default if default in self.providers else next(iter(self.providers))
+        self.hedging = Config.LLM_HEDGING if hedging is None else hedging
+        self.hedge_percentile = hedge_percentile or Config.LLM_HEDGE_PERCENTILE
+        self.hedge_min_samples = hedge_min_samples or Config.LLM_HEDGE_MIN_SAMPLES
+        self.hedge_initial_delay = (
+            Config.LLM_HEDGE_INITIAL_DELAY_SECONDS if hedge_initial_delay is None else hedge_initial_delay
+        )
+        self.window_size = window_size
+
+        self._lock = threading.Lock()
+        self._windows: Dict[tuple, LatencyWindow] = {}
+        self._executor = ThreadPoolExecutor(max_workers=2 * len(self.providers) + 2, thread_name_prefix="llm-router")
+        self.requests = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.failovers = 0
+        self.failures = 0
+        self._provider_stats = {name: {"calls": 0, "wins": 0, "errors": 0} for name in self.providers}
+
+    def for_model(self, model_name: Optional[str]) -> RoutedLLM:
+        """Get a client view that routes every call to model_name first."""
+        return RoutedLLM(self, model_name)
+
+    def _order(self, model_name: Optional[str]) -> List[str]:
+        first = model_name if model_name in self.providers else self.default
+        return [first] + [name for name in self.providers if name != first]
+
+    def _window(self, name: str, shape) -> LatencyWindow:
+        key = (name, shape)
+        with self._lock:
+            if key not in self._windows:
+                self._windows[key] = LatencyWindow(self.window_size)
+            return self._windows[key]
+
+    def hedge_delay(self, name: str, shape) -> Optional[float]:
+        """
+        Seconds to wait on a provider before hedging.
+
+        Args:
+            name: Provider name
+            shape: Call shape the latencies are kept under (max_tokens, or "ttft" for streams)
+
+        Returns:
+            The configured percentile of recent latencies, the initial delay while
+            there are too few samples, or None when hedging is off
+        """
+        if not self.hedging or len(self.providers) < 2:
+            return None
+        window = self._window(name, shape)
+        if len(window.samples) < self.hedge_min_samples:
+            return self.hedge_initial_delay
+        return window.percentile(self.hedge_percentile)
+
+    def _record(self, name: str, shape, seconds: float, ok: bool):
+        if ok:
+            self._window(name, shape).add(seconds)
+        with self._lock:
+            self._provider_stats[name]["calls"] += 1
+            if not ok:
+                self._provider_stats[name]["errors"] += 1
+
+    def _settle(self, route: Optional[RoutedLLM], winner: str, hedge: Optional[str] = None):
+        """Count the outcome of a routed request; hedge names the provider a hedged request went to."""
+        with self._lock:
+            self.requests += 1
+            self._provider_stats[winner]["wins"] += 1
+            if winner == hedge:
+                self.hedge_wins += 1
+        if route is not None:
+            route.served_by = winner
+
+    def _count(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def _fail(self, errors: List[tuple]) -> Exception:
+        self._count("failures")
+        return Exception("All LLM providers failed: " + "; ".join(f"{name}: {error}" for name, error in errors))
+
+    # Blocking calls
+
+    def _submit(self, name: str, kwargs: Dict):
+        # Run in a copy of the caller's context so its LLM priority carries over
+        return self._executor.submit(contextvars.copy_context().run, self._timed_generate, name, kwargs)
+
+    def _timed_generate(self, name: str, kwargs: Dict) -> str:
+        started = time.perf_counter()
+        try:
+            text = self.providers[name].generate(**kwargs)
+        except Exception:
+            self._record(name, kwargs["max_tokens"], time.perf_counter() - started, ok=False)
+            raise
+        self._record(name, kwargs["max_tokens"], time.perf_counter() - started, ok=True)
+        return text
+
+    def generate(
+        self,
+        prompt: str,
+        max_tokens: int = 2000,
+        temperature: float = 0.7,
+        system: Optional[str] = None,
+        model_name: Optional[str] = None,
+        route: Optional[RoutedLLM] = None,
+    ) -> str:
+        """Generate content, hedging on a worker thread; a losing call runs to completion in the background."""
+        kwargs = {"prompt": prompt, "max_tokens": max_tokens, "temperature": temperature, "system": system}
+        order = self._order(model_name)
+        primary, backups = order[0], order[1:]
+        delay = self.hedge_delay(primary, max_tokens)
+        hedge = None
+        errors = []
+
+        if delay is None:
+            # Nothing to hedge with: call inline and only fail over
+            for name in order:
+                try:
+                    text = self._timed_generate(name, kwargs)
+                except Exception as e:
+                    errors.append((name, e))
+                    if name != order[-1]:
+                        self._count("failovers")
+                    continue
+                self._settle(route, name, hedge)
+                return text
+            raise self._fail(errors)
+
+        pending = {self._submit(primary, kwargs): primary}
+        deadline = time.monotonic() + delay
+        while pending:
+            timeout = max(0.0, deadline - time.monotonic()) if delay is not None and hedge is None and backups else None
+            done, _ = wait_futures(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                self._count("hedges")
+                name = hedge = backups.pop(0)
+                pending[self._submit(name, kwargs)] = name
+                continue
+
+            for future in done:
+                name = pending.pop(future)
+                if future.exception() is None:
+                    self._settle(route, name, hedge)
+                    return future.result()
+                errors.append((name, future.exception()))
+
+            if not pending and backups:
+                self._count("failovers")
+                delay = None
+                name = backups.pop(0)
+                pending[self._submit(name, kwargs)] = name
+
+        raise self._fail(errors)
+
+    def generate_streaming(
+        self,
+        prompt: str,
+        max_tokens: int = 2000,
+        temperature: float = 0.7,
+        system: Optional[str] = None,
+        model_name: Optional[str] = None,
+        route: Optional[RoutedLLM] = None,
+    ) -> Iterator[str]:
+        """Stream content, failing over to the next provider if one errors before its first token."""
+        kwargs = {"prompt": prompt, "max_tokens": max_tokens, "temperature": temperature, "system": system}
+        order = self._order(model_name)
+        errors = []
+
+        for name in order:
+            started = time.perf_counter()
+            stream = self.providers[name].generate_streaming(**kwargs)
+            try:
+                first = next(stream, None)
+            except Exception as e:
+                self._record(name, "ttft", time.perf_counter() - started, ok=False)
+                errors.append((name, e))
+                if name != order[-1]:
+                    self._count("failovers")
+                continue
+
+            self._record(name, "ttft", time.perf_counter() - started, ok=True)
+            self._settle(route, name)
+            if first is not None:
+                yield first
+            yield from stream
+            return
+
+        raise self._fail(errors)
+
+    # Async calls
+
+    async def _timed_agenerate(self, name: str, kwargs: Dict) -> str:
+        started = time.perf_counter()
+        try:
+            text = await self.providers[name].agenerate(**kwargs)
+        except asyncio.CancelledError:
+            # A cancelled loser took at least this long; keep it so the window
+            # is not biased towards the calls that happened to win
+            self._window(name, kwargs["max_tokens"]).add(time.perf_counter() - started)
+            raise
+        except Exception:
+            self._record(name, kwargs["max_tokens"], time.perf_counter() - started, ok=False)
+            raise
+        self._record(name, kwargs["max_tokens"], time.perf_counter() - started, ok=True)
+        return text
+
+    async def agenerate(
+        self,
+        prompt: str,
+        max_tokens: int = 2000,
+        temperature: float = 0.7,
+        system: Optional[str] = None,
+        model_name: Optional[str] = None,
+        route: Optional[RoutedLLM] = None,
+    ) -> str:
+        """Generate content; a hedged request races the primary and the loser is cancelled."""
+        kwargs = {"prompt": prompt, "max_tokens": max_tokens, "temperature": temperature, "system": system}
+        order = self._order(model_name)
+        primary, backups = order[0], order[1:]
+        delay = self.hedge_delay(primary, max_tokens)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + (delay or 0.0)
+        hedge = None
+        errors = []
+
+        pending = {asyncio.ensure_future(self._timed_agenerate(primary, kwargs)): primary}
+        try:
+            while pending:
+                timeout = None
+                if delay is not None and hedge is None and backups:
+                    timeout = max(0.0, deadline - loop.time())
+                done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    self._count("hedges")
+                    name = hedge = backups.pop(0)
+                    pending[asyncio.ensure_future(self._timed_agenerate(name, kwargs))] = name
+                    continue
+
+                for task in done:
+                    name = pending.pop(task)
+                    if task.exception() is None:
+                        self._settle(route, name, hedge)
+                        return task.result()
+                    errors.append((name, task.exception()))
+
+                if not pending and backups:
+                    self._count("failovers")
+                    delay = None
+                    name = backups.pop(0)
+                    pending[asyncio.ensure_future(self._timed_agenerate(name, kwargs))] = name
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        raise self._fail(errors)
+
+    async def agenerate_streaming(
+        self,
+        prompt: str,
+        max_tokens: int = 2000,
+        temperature: float = 0.7,
+        system: Optional[str] = None,
+        model_name: Optional[str] = None,
+        route: Optional[RoutedLLM] = None,
+    ) -> AsyncIterator[str]:
+        """Stream content from whichever provider sends its first token first."""
+        kwargs = {"prompt": prompt, "max_tokens": max_tokens, "temperature": temperature, "system": system}
+        order = self._order(model_name)
+        primary, backups = order[0], order[1:]
+        delay = self.hedge_delay(primary, "ttft")
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + (delay or 0.0)
+        hedge = None
+        errors = []
+        streams = {}
+        pending = {}
+
+        def start(name: str):
+            stream = self.providers[name].agenerate_streaming(**kwargs)
+            streams[name] = (stream, time.perf_counter())
+            pending[asyncio.ensure_future(stream.__anext__())] = name
+
+        winner = None
+        first = None
+        start(primary)
+        try:
+            while pending and winner is None:
+                timeout = None
+                if delay is not None and hedge is None and backups:
+                    timeout = max(0.0, deadline - loop.time())
+                done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    self._count("hedges")
+                    hedge = backups.pop(0)
+                    start(hedge)
+                    continue
+
+                for task in done:
+                    name = pending.pop(task)
+                    elapsed = time.perf_counter() - streams[name][1]
+                    error = task.exception()
+                    if error is None or isinstance(error, StopAsyncIteration):
+                        self._record(name, "ttft", elapsed, ok=True)
+                        winner, first = name, None if error else task.result()
+                        break
+                    self._record(name, "ttft", elapsed, ok=False)
+                    errors.append((name, error))
+
+                if winner is None and not pending and backups:
+                    self._count("failovers")
+                    delay = None
+                    start(backups.pop(0))
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+            for name, (stream, _) in streams.items():
+                if name != winner:
+                    await stream.aclose()
+
+        if winner is None:
+            raise self._fail(errors)
+
+        self._settle(route, winner, hedge)
+        stream = streams[winner][0]
+        if first is None:
+            return
+        try:
+            yield first
+            async for text in stream:
+                yield text
+        finally:
+            await stream.aclose()
+
+    def get_stats(self) -> Dict:
+        """Get request, hedge and failover counts with per-provider latency percentiles."""
+        with self._lock:
+            windows = dict(self._windows)
+            providers = {name: dict(stats) for name, stats in self._provider_stats.items()}
+            totals = {
+                "requests": self.requests,
+                "hedges": self.hedges,
+                "hedge_wins": self.hedge_wins,
+                "failovers": self.failovers,
+                "failures": self.failures,
+            }
+
+        for name, stats in providers.items():
+            stats["model"] = getattr(self.providers[name], "model", None)
+            stats["latency_ms"] = {}
+            for (provider, shape), window in sorted(windows.items(), key=lambda item: str(item[0][1])):
+                if provider != name or not window.samples:
+                    continue
+                stats["latency_ms"][str(shape)] = {
+                    "samples": len(window.samples),
+                    "p50": round(window.percentile(50) * 1000, 1),
+                    "p95": round(window.percentile(95) * 1000, 1),
+                    "hedge_after": round(self.hedge_delay(name, shape) * 1000, 1) if self.hedging and len(self.providers) > 1 else None,
+                }
+
+        return {
+            **totals,
+            "default": self.default,
+            "hedging": self.hedging and len(self.providers) > 1,
+            "hedge_percentile": self.hedge_percentile,
+            "hedge_rate": round(totals["hedges"] / totals["requests"], 3) if totals["requests"] else 0.0,
+            "providers": providers,
+        }
+
+
+def build_default_router(config: Config = None) -> LLMRouter:
+    """
+    Build a router over every provider with an API key configured.
+
+    Returns:
+        LLMRouter with "gpt4" (OpenAIClient) and/or "claude" (AnthropicClient),
+        defaulting to Config.LLM_DEFAULT_PROVIDER
+    """
+    config = config or Config
+    providers = {}
+    if config.OPENAI_API_KEY:
+        from src.llm.openai_client import OpenAIClient
+        providers["gpt4"] = OpenAIClient(config.OPENAI_API_KEY, config.SOCIAL_MODEL)
+    if config.ANTHROPIC_API_KEY:
+        from src.llm.anthropic_client import AnthropicClient
+        providers["claude"] = AnthropicClient(config.ANTHROPIC_API_KEY, config.BLOG_MODEL)
+    if not providers:
+        raise ValueError("Set OPENAI_API_KEY and/or ANTHROPIC_API_KEY to enable an LLM provider")
+    return LLMRouter(providers, default=config.LLM_DEFAULT_PROVIDER)
@@ -0,0 +1,132 @@
+"""Prompt token accounting per format and virtue.
+
+Reports how many input tokens each generation prompt costs with the persona
+inlined in the user message *and* sent as the system prompt (the old
+assembly) versus the lean assembly that sends it once. The lean numbers are
+split into the cacheable static prefix (system) and the per-request prompt.
+
+Usage:
+    python -m src.llm.token_accounting            # table of before/after tokens
+    python -m src.llm.token_accounting --json     # machine-readable report
+    python -m src.llm.token_accounting --check    # exit 1 if a template duplicates the persona
+"""
+
+import argparse
+import json
+import sys
+from typing import Dict, List
+from src.llm import prompt_templates
+from src.llm import prompts as virtue_prompts
+from src.llm.prompts import courage, general, justice, temperance, wisdom
+from src.llm.prompt_templates import build_format_messages, build_format_prompt, get_system_prompt
+from src.utils.config import Config
+from src.utils.tokens import count_tokens
+
+FORMAT_TYPES = ["short", "thread", "long", "reply"]
+SAMPLE_TOPIC = "dichotomy of control"
+
+
+def _sample_fields(format_type: str) -> Dict:
+    return {
+        "topic": SAMPLE_TOPIC,
+        "original_content": "Why does everything go wrong for me?" if format_type == "reply" else "",
+        "username": "user" if format_type == "reply" else "",
+    }
+
+
+def prompt_token_report(virtues: List[str] = None) -> List[Dict]:
+    """
+    Count prompt tokens per (format_type, virtue).
+
+    Topic and knowledge context are held fixed, so the numbers are the static
+    prompt overhead of each template.
+
+    Returns:
+        Rows with before_tokens (persona inlined and sent as system),
+        after_tokens (lean), static_prefix_tokens (the cacheable part of
+        after_tokens) and saved_tokens
+    """
+    rows = []
+    for virtue in virtues or Config.VIRTUES:
+        persona_tokens = count_tokens(get_system_prompt("twitter", virtue))
+
+        for format_type in FORMAT_TYPES:
+            fields = _sample_fields(format_type)
+            inlined = build_format_prompt(format_type, virtue=virtue, inline_system=True, **fields)
+            system, prompt = build_format_messages(format_type, virtue=virtue, **fields)
+
+            before = persona_tokens + count_tokens(inlined)
+            static_tokens = count_tokens(system)
+            after = static_tokens + count_tokens(prompt)
+            rows.append({
+                "format_type": format_type,
+                "virtue": virtue,
+                "static_prefix_tokens": static_tokens,
+                "before_tokens": before,
+                "after_tokens": after,
+                "saved_tokens": before - after,
+            })
+    return rows
+
+
+def find_persona_duplication(virtues: List[str] = None) -> List[str]:
+    """
+    Find templates or prompts that would send the persona twice.
+
+    Returns:
+        Human-readable problems; empty when the lean assembly is intact
+    """
+    problems = []
+
+    for module in (prompt_templates, virtue_prompts, courage, general, justice, temperance, wisdom):
+        for name, value in vars(module).items():
+            if name.endswith("_TEMPLATE") and "{system_prompt}" in value:
+                problems.append(f"{module.__name__}.{name} inlines {{system_prompt}}")
+
+    for virtue in virtues or Config.VIRTUES:
+        persona = get_system_prompt("twitter", virtue)
+        for format_type in FORMAT_TYPES:
+            try:
+                system, prompt = build_format_messages(format_type, virtue=virtue, **_sample_fields(format_type))
+            except KeyError as e:
+                problems.append(f"{format_type}/{virtue} template has an unfilled placeholder {e}")
+                continue
+            if (system + prompt).count(persona) != 1:
+                problems.append(f"{format_type}/{virtue} prompt repeats the system prompt")
+
+    return sorted(set(problems))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prompt token accounting per format and virtue")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    parser.add_argument("--check", action="store_true", help="Fail if any template duplicates the persona")
+    args = parser.parse_args()
+
+    if args.check:
+        problems = find_persona_duplication()
+        for problem in problems:
+            print(f"FAIL: {problem}")
+        if problems:
+            sys.exit(1)
+        print("OK: no template sends the persona twice")
+        return
+
+    rows = prompt_token_report()
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return
+
+    print(f"{'format':<8} {'virtue':<11} {'static':>7} {'before':>7} {'after':>7} {'saved':>7}")
+    for row in rows:
+        print(
+            f"{row['format_type']:<8} {row['virtue']:<11} {row['static_prefix_tokens']:>7} "
+            f"{row['before_tokens']:>7} {row['after_tokens']:>7} {row['saved_tokens']:>7}"
+        )
+    total_before = sum(r["before_tokens"] for r in rows)
+    total_after = sum(r["after_tokens"] for r in rows)
+    print(f"Total: {total_before} -> {total_after} tokens ({100 * (total_before - total_after) / total_before:.0f}% fewer)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,13 @@
 """RAG (Retrieval Augmented Generation) system.
 
-Note: RAG requires chromadb which may not be available on all Python versions.
-The module will gracefully degrade if chromadb is not installed.
+Note: the default Chroma backend requires chromadb, which may not be available
+on all Python versions. Set VECTOR_BACKEND=numpy to run without it; otherwise
+the module will gracefully degrade if chromadb is not installed.
 """
 
+from src.rag.backends import create_vector_store
 from src.rag.document_loader import Document, DocumentLoader
+from src.rag.service import RAG_AVAILABLE, RAGService, get_rag_service
 
 # Lazy load chromadb-dependent modules
 _vector_store = None
@@ -36,22 +39,25 @@ def get_retriever():
 
 
 # For backwards compatibility, try to import but don't fail
+from src.rag.retriever import Retriever
+from src.rag.numpy_store import NumpyVectorStore
+
 try:
     from src.rag.vector_store import VectorStore
-    from src.rag.retriever import Retriever
-    RAG_AVAILABLE = True
 except ImportError:
     VectorStore = None
-    Retriever = None
-    RAG_AVAILABLE = False
 
 
 __all__ = [
     "Document",
     "DocumentLoader",
     "VectorStore",
+    "NumpyVectorStore",
     "Retriever",
+    "create_vector_store",
     "RAG_AVAILABLE",
     "get_vector_store",
     "get_retriever",
+    "RAGService",
+    "get_rag_service",
 ]
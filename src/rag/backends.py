@@ -0,0 +1,57 @@
+"""Vector store backend selection."""
+
+from typing import Optional
+from src.utils.config import Config
+
+BACKENDS = ("chroma", "numpy", "snapshot")
+
+
+def backend_available(backend: Optional[str] = None) -> bool:
+    """Check whether a backend's dependencies are importable."""
+    backend = backend or Config.VECTOR_BACKEND
+    try:
+        if backend in ("numpy", "snapshot"):
+            import numpy  # noqa: F401
+        else:
+            import chromadb  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def default_store_path(backend: Optional[str] = None) -> str:
+    """Default persistence path for a backend."""
+    backend = backend or Config.VECTOR_BACKEND
+    if backend == "snapshot":
+        return Config.VECTOR_SNAPSHOT_PATH
+    return Config.NUMPY_STORE_PATH if backend == "numpy" else Config.CHROMA_DB_PATH
+
+
+def create_vector_store(backend: Optional[str] = None, db_path: Optional[str] = None):
+    """
+    Open the configured vector store.
+
+    Args:
+        backend: "chroma", "numpy" or "snapshot" (defaults to Config.VECTOR_BACKEND)
+        db_path: Persistence path, or the snapshot file (defaults to the backend's configured path)
+
+    Returns:
+        VectorStore, NumpyVectorStore or the read-only SnapshotVectorStore; all expose the same query interface
+    """
+    backend = backend or Config.VECTOR_BACKEND
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown vector backend {backend!r}; expected one of {BACKENDS}")
+
+    db_path = db_path or default_store_path(backend)
+    if backend == "snapshot":
+        if not db_path:
+            raise ValueError("VECTOR_BACKEND=snapshot needs VECTOR_SNAPSHOT_PATH")
+        from src.rag.snapshot import SnapshotVectorStore
+        return SnapshotVectorStore(db_path)
+
+    if backend == "numpy":
+        from src.rag.numpy_store import NumpyVectorStore
+        return NumpyVectorStore(db_path)
+
+    from src.rag.vector_store import VectorStore
+    return VectorStore(db_path)
@@ -0,0 +1,234 @@
+"""Lexical BM25 index over a collection, stored as compact CSR postings.
+
+Dense embeddings blur exact stoic terms ("amor fati", "memento mori"), so
+ingest also builds an inverted index per collection. The postings live in one
+compressed .npz: a sorted term array, offsets into flat doc-index/term-
+frequency arrays, per-document lengths, a per-document virtue bitmask and
+the document IDs, which is a few bytes per posting on disk.
+"""
+
+import os
+import re
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from src.rag.virtues import CARDINAL_VIRTUES, tagged_virtues
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have he her his i if in into is it its me my no not of on "
+    "or our she so than that the their them then there these they this to was we were what when which "
+    "who will with you your".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens with stopwords removed."""
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOPWORDS]
+
+
+def lexical_index_path(db_path: str, collection_name: str) -> str:
+    """Where a collection's BM25 index is stored, next to the vector store."""
+    return os.path.join(db_path, "bm25", f"{collection_name}.npz")
+
+
+class BM25Index:
+    """Okapi BM25 over CSR postings."""
+
+    def __init__(
+        self,
+        terms: np.ndarray,
+        offsets: np.ndarray,
+        postings: np.ndarray,
+        frequencies: np.ndarray,
+        doc_lengths: np.ndarray,
+        doc_ids: List[str],
+        k1: float = 1.5,
+        b: float = 0.75,
+        doc_virtues: Optional[np.ndarray] = None,
+    ):
+        self.terms = terms
+        self.offsets = offsets
+        self.postings = postings
+        self.frequencies = frequencies
+        self.doc_lengths = doc_lengths
+        self.doc_ids = doc_ids
+        # Bit i set when the document is tagged with CARDINAL_VIRTUES[i]
+        self.doc_virtues = doc_virtues if doc_virtues is not None else np.zeros(len(doc_ids), dtype=np.uint8)
+        self.k1 = k1
+        self.b = b
+        self._term_rows: Dict[str, int] = {term: row for row, term in enumerate(terms.tolist())}
+        self.avg_doc_length = float(doc_lengths.mean()) if len(doc_lengths) else 0.0
+
+        # Precompute the length normalisation once; queries only add idf-weighted terms
+        self._norm = (k1 * (1 - b + b * doc_lengths / self.avg_doc_length)).astype(np.float32) if len(doc_lengths) else doc_lengths
+
+    @classmethod
+    def build(
+        cls,
+        doc_ids: List[str],
+        texts: List[str],
+        metadatas: Optional[List[Dict]] = None,
+        k1: float = 1.5,
+        b: float = 0.75,
+    ) -> "BM25Index":
+        """Tokenize texts and build the inverted index; metadatas supply virtue tags."""
+        postings_by_term: Dict[str, List[Tuple[int, int]]] = {}
+        doc_lengths = np.zeros(len(texts), dtype=np.uint32)
+        doc_virtues = np.zeros(len(texts), dtype=np.uint8)
+        for doc, metadata in enumerate(metadatas or []):
+            for virtue in tagged_virtues(metadata or {}):
+                doc_virtues[doc] |= 1 << CARDINAL_VIRTUES.index(virtue)
+
+        for doc, text in enumerate(texts):
+            tokens = tokenize(text)
+            doc_lengths[doc] = len(tokens)
+            counts: Dict[str, int] = {}
+            for token in tokens:
+                counts[token] = counts.get(token, 0) + 1
+            for token, count in counts.items():
+                postings_by_term.setdefault(token, []).append((doc, count))
+
+        terms = sorted(postings_by_term)
+        offsets = np.zeros(len(terms) + 1, dtype=np.uint32)
+        postings, frequencies = [], []
+        for row, term in enumerate(terms):
+            entries = postings_by_term[term]
+            offsets[row + 1] = offsets[row] + len(entries)
+            postings.extend(doc for doc, _ in entries)
+            frequencies.extend(min(count, 65535) for _, count in entries)
+
+        return cls(
+            np.array(terms, dtype=str),
+            offsets,
+            np.array(postings, dtype=np.uint32),
+            np.array(frequencies, dtype=np.uint16),
+            doc_lengths,
+            list(doc_ids),
+            k1,
+            b,
+            doc_virtues,
+        )
+
+    def save(self, path: str):
+        """Write the index atomically as a compressed .npz."""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = f"{path}.tmp.npz"
+        np.savez_compressed(
+            tmp_path,
+            terms=self.terms,
+            offsets=self.offsets,
+            postings=self.postings,
+            frequencies=self.frequencies,
+            doc_lengths=self.doc_lengths,
+            doc_ids=np.array(self.doc_ids, dtype=str),
+            doc_virtues=self.doc_virtues,
+            params=np.array([self.k1, self.b], dtype=np.float64),
+        )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "BM25Index":
+        with np.load(path) as data:
+            k1, b = data["params"].tolist()
+            return cls(
+                data["terms"],
+                data["offsets"],
+                data["postings"],
+                data["frequencies"],
+                data["doc_lengths"],
+                data["doc_ids"].tolist(),
+                k1,
+                b,
+                data["doc_virtues"] if "doc_virtues" in data.files else None,
+            )
+
+    def __len__(self) -> int:
+        return len(self.doc_ids)
+
+    def search(self, query: str, k: int = 10, virtue: Optional[str] = None) -> List[Tuple[str, float]]:
+        """
+        Top-k documents by BM25 score.
+
+        Args:
+            query: Search text
+            k: Number of results
+            virtue: Only score documents tagged with this cardinal virtue
+
+        Returns:
+            (doc_id, score) pairs, best first; documents sharing no term are omitted
+        """
+        if not len(self.doc_ids) or k <= 0:
+            return []
+
+        scores = np.zeros(len(self.doc_ids), dtype=np.float32)
+        n_docs = len(self.doc_ids)
+        for term in set(tokenize(query)):
+            row = self._term_rows.get(term)
+            if row is None:
+                continue
+
+            start, end = self.offsets[row], self.offsets[row + 1]
+            docs = self.postings[start:end]
+            tf = self.frequencies[start:end].astype(np.float32)
+            df = end - start
+            idf = np.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+            # A term appears at most once per document's postings, so plain fancy-index add is safe
+            scores[docs] += idf * tf * (self.k1 + 1) / (tf + self._norm[docs])
+
+        if virtue in CARDINAL_VIRTUES:
+            scores[(self.doc_virtues & (1 << CARDINAL_VIRTUES.index(virtue))) == 0] = 0
+
+        matched = int(np.count_nonzero(scores))
+        k = min(k, matched)
+        if k == 0:
+            return []
+
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(self.doc_ids[row], float(scores[row])) for row in top]
+
+    def get_stats(self) -> Dict:
+        return {
+            "documents": len(self.doc_ids),
+            "terms": len(self.terms),
+            "postings": len(self.postings),
+            "avg_doc_length": round(self.avg_doc_length, 1),
+            "documents_by_virtue": {
+                virtue: int(np.count_nonzero(self.doc_virtues & (1 << bit)))
+                for bit, virtue in enumerate(CARDINAL_VIRTUES)
+            },
+        }
+
+
+def build_lexical_index(vector_store, collection_name: str) -> Optional[BM25Index]:
+    """
+    Rebuild and save a collection's BM25 index from the vector store's contents.
+
+    Returns:
+        The new index, or None when the collection is empty (any stale index is removed)
+    """
+    path = lexical_index_path(vector_store.db_path, collection_name)
+    ids, documents, metadatas = vector_store.get_documents(collection_name)
+
+    if not ids:
+        if os.path.exists(path):
+            os.remove(path)
+        return None
+
+    index = BM25Index.build(ids, documents, metadatas)
+    index.save(path)
+    return index
+
+
+def reciprocal_rank_fusion(rankings: List[List[str]], k: int = 60) -> List[Tuple[str, float]]:
+    """
+    Fuse ranked ID lists: score(id) = sum over lists of 1 / (k + rank).
+
+    Returns:
+        (id, fused score) pairs, best first
+    """
+    fused: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking, 1):
+            fused[doc_id] = fused.get(doc_id, 0.0) + 1.0 / (k + rank)
+    return sorted(fused.items(), key=lambda item: item[1], reverse=True)
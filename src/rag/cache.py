@@ -0,0 +1,106 @@
+"""In-memory LRU+TTL cache for retrieval results."""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+
+def normalize_query(query: str) -> str:
+    """Lowercase and collapse whitespace so trivially different queries share an entry."""
+    return " ".join(query.lower().split())
+
+
+class RetrievalCache:
+    """
+    Bounded LRU cache of query results with a per-entry TTL.
+
+    Keys are (collection, normalized query, k, extra) tuples. Each entry also
+    remembers how long the original lookup took, so every hit adds that to
+    saved_ms and the cache can report the latency it is saving.
+    """
+
+    def __init__(self, max_entries: int = 512, ttl_seconds: float = 3600):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Tuple, Tuple[List[Dict], float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.saved_ms = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    @staticmethod
+    def make_key(collection: str, query: str, k: int, extra: Tuple = ()) -> Tuple:
+        return (collection, normalize_query(query), k, extra)
+
+    @staticmethod
+    def _copy(results: List[Dict]) -> List[Dict]:
+        # Callers may annotate results; keep the cached copy pristine
+        return [{**r, "metadata": dict(r.get("metadata") or {})} for r in results]
+
+    def get(self, key: Tuple) -> Optional[List[Dict]]:
+        """Get cached results, or None on a miss or expired entry."""
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            results, expires_at, cost_ms = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            self.saved_ms += cost_ms
+            return self._copy(results)
+
+    def put(self, key: Tuple, results: List[Dict], cost_ms: float = 0.0):
+        """Store results, evicting the least recently used entries over capacity."""
+        if not self.enabled:
+            return
+
+        with self._lock:
+            self._entries[key] = (self._copy(results), time.monotonic() + self.ttl_seconds, cost_ms)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, collection: Optional[str] = None):
+        """Drop entries for one collection, or everything when collection is None."""
+        with self._lock:
+            if collection is None:
+                self._entries.clear()
+            else:
+                for key in [key for key in self._entries if key[0] == collection]:
+                    del self._entries[key]
+            self.invalidations += 1
+
+    def get_stats(self) -> Dict:
+        """Get size, hit ratio and latency saved by hits."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "saved_ms": round(self.saved_ms, 1),
+            }
@@ -1,6 +1,15 @@
+import hashlib
+import os
 import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Dict
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from src.rag.virtues import tag_virtues
+from src.utils.tokens import count_tokens
+
+SOURCE_PATTERNS = ("**/*.md", "**/*.txt")
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+")
 
 
 class Document:
@@ -10,6 +19,17 @@ class Document:
         self.content = content
         self.metadata = metadata
 
+    @property
+    def doc_id(self) -> str:
+        """
+        Stable ID from (source_path, chunk_id, content hash).
+
+        The same chunk always gets the same ID across runs, and an edited chunk
+        gets a new one, so re-ingesting only writes what actually changed.
+        """
+        digest = hashlib.sha256(self.content.encode("utf-8")).hexdigest()[:16]
+        return f"{self.metadata.get('source_path', 'unknown')}::{self.metadata.get('chunk_id', 0)}::{digest}"
+
     def __repr__(self):
         return f"Document(length={len(self.content)}, source={self.metadata.get('source')})"
 
@@ -17,36 +37,131 @@ class Document:
 class DocumentLoader:
     """Load and process documents from various sources."""
 
-    def __init__(self, chunk_size: int = 800, chunk_overlap: int = 100):
+    def __init__(self, chunk_size: int = 200, chunk_overlap: int = 30):
+        """
+        Args:
+            chunk_size: Maximum tokens per chunk
+            chunk_overlap: Tokens of trailing sentences repeated at the start of the next chunk
+        """
         self.chunk_size = chunk_size
-        self.chunk_overlap = chunk_overlap
+        self.chunk_overlap = min(chunk_overlap, chunk_size // 2)
 
     def load_markdown_files(self, directory: str) -> List[Document]:
         """Load all markdown files from a directory."""
-        documents = []
-        path = Path(directory)
+        return self._load_files(directory, "**/*.md")
 
+    def load_text_files(self, directory: str) -> List[Document]:
+        """Load all text files from a directory."""
+        return self._load_files(directory, "**/*.txt")
+
+    def list_files(self, directory: str) -> List[Path]:
+        """List the markdown and text files under a directory, sorted."""
+        path = Path(directory)
         if not path.exists():
-            print(f"Warning: Directory {directory} does not exist")
-            return documents
+            return []
+        return sorted({f for pattern in SOURCE_PATTERNS for f in path.glob(pattern)})
 
-        for md_file in path.glob("**/*.md"):
-            try:
-                with open(md_file, "r", encoding="utf-8") as f:
-                    content = f.read()
+    def load_file(self, file_path: Path, base_dir: Path) -> List[Document]:
+        """
+        Load and chunk a single markdown or text file.
 
-                title = self._extract_title(content, md_file.name)
-                chunks = self._chunk_text(content, title, str(md_file.relative_to(path)))
-                documents.extend(chunks)
+        Args:
+            file_path: File to load
+            base_dir: Directory source_path is recorded relative to
+        """
+        with open(file_path, "r", encoding="utf-8") as f:
+            content = f.read()
 
-                print(f"Loaded: {md_file.name} ({len(chunks)} chunks)")
-            except Exception as e:
-                print(f"Error loading {md_file}: {e}")
+        if file_path.suffix == ".md":
+            title = self._extract_title(content, file_path.name)
+        else:
+            title = file_path.stem
 
-        return documents
+        return self._chunk_text(content, title, file_path.relative_to(base_dir).as_posix())
 
-    def load_text_files(self, directory: str) -> List[Document]:
-        """Load all text files from a directory."""
+    def iter_file_documents(
+        self,
+        paths: Iterable[Path],
+        base_dir: Path,
+        workers: Optional[int] = None,
+    ) -> Iterator[Tuple[Path, Optional[List[Document]], Optional[Exception]]]:
+        """
+        Parse files in a process pool, yielding (path, chunks, error) in input order.
+
+        Cleaning and chunking are pure CPU work, so they run in worker
+        processes while the caller embeds or upserts earlier results. At most
+        2 * workers files are in flight, which keeps memory flat no matter how
+        large the corpus is.
+
+        Args:
+            paths: Files to load
+            base_dir: Directory source_path is recorded relative to
+            workers: Worker processes (defaults to os.cpu_count(); 1 parses inline)
+        """
+        workers = workers or os.cpu_count() or 1
+
+        if workers == 1:
+            for path in paths:
+                try:
+                    yield path, self.load_file(path, base_dir), None
+                except Exception as e:
+                    yield path, None, e
+            return
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = deque()
+            for path in paths:
+                pending.append((path, pool.submit(_load_file_task, self, path, base_dir)))
+                if len(pending) >= workers * 2:
+                    yield self._file_result(*pending.popleft())
+            while pending:
+                yield self._file_result(*pending.popleft())
+
+    @staticmethod
+    def _file_result(path: Path, future) -> Tuple[Path, Optional[List[Document]], Optional[Exception]]:
+        try:
+            return path, future.result(), None
+        except Exception as e:
+            return path, None, e
+
+    def iter_documents(
+        self,
+        directory: str,
+        batch_size: int = 256,
+        workers: Optional[int] = None,
+    ) -> Iterator[List[Document]]:
+        """
+        Stream chunks from every markdown and text file under directory.
+
+        Unlike load_markdown_files/load_text_files, nothing is accumulated:
+        chunks are yielded in batches of up to batch_size as files finish
+        parsing, so embedding can start before the last file is read.
+
+        Args:
+            directory: Corpus directory
+            batch_size: Maximum chunks per yielded batch
+            workers: Worker processes (defaults to os.cpu_count(); 1 parses inline)
+        """
+        base = Path(directory)
+        if not base.exists():
+            print(f"Warning: Directory {directory} does not exist")
+            return
+
+        batch: List[Document] = []
+        for path, documents, error in self.iter_file_documents(self.list_files(directory), base, workers):
+            if error is not None:
+                print(f"Error loading {path}: {error}")
+                continue
+
+            batch.extend(documents)
+            while len(batch) >= batch_size:
+                yield batch[:batch_size]
+                batch = batch[batch_size:]
+
+        if batch:
+            yield batch
+
+    def _load_files(self, directory: str, pattern: str) -> List[Document]:
         documents = []
         path = Path(directory)
 
@@ -54,18 +169,14 @@ class DocumentLoader:
             print(f"Warning: Directory {directory} does not exist")
             return documents
 
-        for txt_file in path.glob("**/*.txt"):
+        for file_path in path.glob(pattern):
             try:
-                with open(txt_file, "r", encoding="utf-8") as f:
-                    content = f.read()
-
-                title = txt_file.stem
-                chunks = self._chunk_text(content, title, str(txt_file.relative_to(path)))
+                chunks = self.load_file(file_path, path)
                 documents.extend(chunks)
 
-                print(f"Loaded: {txt_file.name} ({len(chunks)} chunks)")
+                print(f"Loaded: {file_path.name} ({len(chunks)} chunks)")
             except Exception as e:
-                print(f"Error loading {txt_file}: {e}")
+                print(f"Error loading {file_path}: {e}")
 
         return documents
 
@@ -76,48 +187,133 @@ class DocumentLoader:
             return match.group(1).strip()
         return filename.replace(".md", "").replace("_", " ").title()
 
+    def _split_units(self, text: str) -> List[Tuple[str, int, bool]]:
+        """
+        Break cleaned text into (text, tokens, starts_paragraph) units.
+
+        Paragraphs that fit in a chunk stay whole; longer ones are split at
+        sentence boundaries, and any sentence still over the limit is split
+        on words.
+        """
+        units = []
+        for paragraph in (p.strip() for p in text.split("\n\n")):
+            if not paragraph:
+                continue
+
+            tokens = count_tokens(paragraph)
+            if tokens <= self.chunk_size:
+                units.append((paragraph, tokens, True))
+                continue
+
+            first = True
+            for sentence in SENTENCE_BOUNDARY.split(paragraph):
+                for piece in self._split_long_sentence(sentence):
+                    units.append((piece, count_tokens(piece), first))
+                    first = False
+        return units
+
+    def _split_long_sentence(self, sentence: str) -> List[str]:
+        """Split a sentence over chunk_size tokens into word runs that fit."""
+        if count_tokens(sentence) <= self.chunk_size:
+            return [sentence]
+
+        pieces, current, current_tokens = [], [], 0
+        for word in sentence.split():
+            word_tokens = count_tokens(word) + 1
+            if current and current_tokens + word_tokens > self.chunk_size:
+                pieces.append(" ".join(current))
+                current, current_tokens = [], 0
+            current.append(word)
+            current_tokens += word_tokens
+        if current:
+            pieces.append(" ".join(current))
+        return pieces
+
+    def _overlap_units(self, units: List[Tuple[str, int, bool]], budget: int) -> List[Tuple[str, int, bool]]:
+        """Trailing units of a finished chunk that fit in budget tokens."""
+        if budget <= 0 or not units:
+            return []
+
+        carried, total = [], 0
+        for unit in reversed(units):
+            # +1 per unit for the separator it is joined with
+            if total + unit[1] + 1 > budget:
+                break
+            carried.insert(0, unit)
+            total += unit[1] + 1
+
+        if not carried:
+            # Last sentence alone is longer than the budget; carry its tail words
+            tail, total = [], 1
+            for word in reversed(units[-1][0].split()):
+                # Summing per-word counts (+1 per space) slightly overestimates, keeping us under budget
+                total += count_tokens(word) + 1
+                if total > budget:
+                    break
+                tail.insert(0, word)
+            if tail:
+                text = " ".join(tail)
+                carried = [(text, count_tokens(text), False)]
+
+        return carried
+
+    @staticmethod
+    def _join_units(units: List[Tuple[str, int, bool]]) -> str:
+        text = ""
+        for i, (unit_text, _, starts_paragraph) in enumerate(units):
+            if i:
+                text += "\n\n" if starts_paragraph else " "
+            text += unit_text
+        return text
+
     def _chunk_text(
         self, text: str, source_title: str, source_path: str
     ) -> List[Document]:
-        """Split text into chunks with overlap."""
+        """
+        Split text into chunks of at most chunk_size tokens.
+
+        Consecutive chunks share up to chunk_overlap tokens of trailing
+        sentences, so a passage cut at a boundary is still retrievable whole.
+        """
         text = self._clean_markdown(text)
-        paragraphs = [p.strip() for p in text.split("\n\n") if p.strip()]
 
         chunks = []
-        current_chunk = ""
-        chunk_count = 0
-
-        for paragraph in paragraphs:
-            if len(current_chunk) + len(paragraph) < self.chunk_size:
-                current_chunk += paragraph + "\n\n"
-            else:
-                if current_chunk:
-                    chunks.append(
-                        Document(
-                            current_chunk.strip(),
-                            {
-                                "source": source_title,
-                                "source_path": source_path,
-                                "chunk_id": chunk_count,
-                            },
-                        )
-                    )
-                    chunk_count += 1
-
-                current_chunk = paragraph + "\n\n"
-
-        if current_chunk:
+        current: List[Tuple[str, int, bool]] = []
+        current_tokens = 0
+        # Units in current that are new rather than carried over as overlap
+        fresh = 0
+
+        def emit():
+            chunk_text = self._join_units(current)
             chunks.append(
                 Document(
-                    current_chunk.strip(),
+                    chunk_text,
                     {
                         "source": source_title,
                         "source_path": source_path,
-                        "chunk_id": chunk_count,
+                        "chunk_id": len(chunks),
+                        "tokens": count_tokens(chunk_text),
+                        **tag_virtues(chunk_text),
                     },
                 )
             )
 
+        for unit in self._split_units(text):
+            # Each join adds a separator, counted as one token so chunks never exceed chunk_size
+            if current and current_tokens + 1 + unit[1] > self.chunk_size:
+                emit()
+                budget = min(self.chunk_overlap, self.chunk_size - unit[1] - 1)
+                current = self._overlap_units(current, budget)
+                current_tokens = sum(u[1] for u in current) + max(len(current) - 1, 0)
+                fresh = 0
+
+            current_tokens += unit[1] + (1 if current else 0)
+            current.append(unit)
+            fresh += 1
+
+        if current and fresh:
+            emit()
+
         return chunks
 
     @staticmethod
@@ -135,3 +331,8 @@ class DocumentLoader:
         text = re.sub(r"^[\-\*]{3,}$", "", text, flags=re.MULTILINE)
 
         return text
+
+
+def _load_file_task(loader: DocumentLoader, path: Path, base_dir: Path) -> List[Document]:
+    """Process-pool entry point: load and chunk one file with a pickled loader."""
+    return loader.load_file(path, base_dir)
@@ -0,0 +1,345 @@
+"""Embedding caches: query vectors (LRU + SQLite) and document vectors (memmap)."""
+
+import hashlib
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+
+DEFAULT_EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+
+
+def text_hash(text: str) -> str:
+    """Stable key for a text, independent of process and Python hash seed."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class QueryEmbeddingCache:
+    """
+    Memoize query embeddings in memory and on disk.
+
+    Lookups check a bounded in-process LRU first, then a SQLite table keyed by
+    (model, text hash), and only run the embedding function for texts neither
+    tier has seen. New embeddings are written back to disk, so after a restart
+    every previously seen topic or reply prefix skips model inference.
+    """
+
+    def __init__(
+        self,
+        embedding_function: Callable[[List[str]], Sequence],
+        model_name: str = DEFAULT_EMBEDDING_MODEL,
+        path: Optional[str] = None,
+        max_entries: int = 4096,
+    ):
+        """
+        Args:
+            embedding_function: Callable mapping a list of texts to vectors
+            model_name: Model identifier; part of the key so models never mix
+            path: SQLite file for the persistent tier (None keeps it in memory only)
+            max_entries: In-process LRU capacity
+        """
+        self.embedding_function = embedding_function
+        self.model_name = model_name
+        self.path = path
+        self.max_entries = max_entries
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.computed = 0
+
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                """CREATE TABLE IF NOT EXISTS query_embeddings (
+                    model TEXT NOT NULL,
+                    text_hash TEXT NOT NULL,
+                    dim INTEGER NOT NULL,
+                    vector BLOB NOT NULL,
+                    PRIMARY KEY (model, text_hash)
+                )"""
+            )
+            self._db.commit()
+
+    def _remember(self, key: str, vector: np.ndarray):
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _load(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        """Fetch vectors for keys from the SQLite tier."""
+        if self._db is None or not keys:
+            return {}
+
+        found = {}
+        # Stay well below SQLite's bound-parameter limit
+        for start in range(0, len(keys), 500):
+            batch = keys[start:start + 500]
+            placeholders = ",".join("?" * len(batch))
+            rows = self._db.execute(
+                f"SELECT text_hash, vector FROM query_embeddings "
+                f"WHERE model = ? AND text_hash IN ({placeholders})",
+                [self.model_name, *batch],
+            ).fetchall()
+            for key, blob in rows:
+                found[key] = np.frombuffer(blob, dtype=np.float32)
+        return found
+
+    def _store(self, vectors: Dict[str, np.ndarray]):
+        if self._db is None or not vectors:
+            return
+
+        self._db.executemany(
+            "INSERT OR REPLACE INTO query_embeddings (model, text_hash, dim, vector) VALUES (?, ?, ?, ?)",
+            [(self.model_name, key, len(vec), vec.tobytes()) for key, vec in vectors.items()],
+        )
+        self._db.commit()
+
+    def embed(self, texts: List[str]) -> List[np.ndarray]:
+        """
+        Get float32 embeddings for texts, computing only the unseen ones.
+
+        Returns:
+            One vector per input text, in input order
+        """
+        keys = [text_hash(text) for text in texts]
+        vectors: Dict[str, np.ndarray] = {}
+
+        with self._lock:
+            for key in keys:
+                if key in self._memory:
+                    self._memory.move_to_end(key)
+                    vectors[key] = self._memory[key]
+                    self.memory_hits += 1
+
+            missing = list(dict.fromkeys(key for key in keys if key not in vectors))
+            for key, vec in self._load(missing).items():
+                vectors[key] = vec
+                self._remember(key, vec)
+                self.disk_hits += 1
+
+        to_compute = {}
+        for key, text in zip(keys, texts):
+            if key not in vectors:
+                to_compute.setdefault(key, text)
+
+        if to_compute:
+            # Run the model outside the lock so concurrent lookups aren't serialized on it
+            computed = self.embedding_function(list(to_compute.values()))
+            fresh = {
+                key: np.asarray(vec, dtype=np.float32)
+                for key, vec in zip(to_compute.keys(), computed)
+            }
+            with self._lock:
+                for key, vec in fresh.items():
+                    self._remember(key, vec)
+                self._store(fresh)
+                self.computed += len(fresh)
+            vectors.update(fresh)
+
+        return [vectors[key] for key in keys]
+
+    def embed_one(self, text: str) -> np.ndarray:
+        """Get the embedding for a single text."""
+        return self.embed([text])[0]
+
+    def close(self):
+        """Close the SQLite tier."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def get_stats(self) -> Dict:
+        """Get hit counts per tier and the number of model calls avoided."""
+        with self._lock:
+            persisted = 0
+            if self._db is not None:
+                persisted = self._db.execute(
+                    "SELECT COUNT(*) FROM query_embeddings WHERE model = ?", [self.model_name]
+                ).fetchone()[0]
+            lookups = self.memory_hits + self.disk_hits + self.computed
+            return {
+                "model": self.model_name,
+                "path": self.path,
+                "memory_entries": len(self._memory),
+                "persisted_entries": persisted,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "computed": self.computed,
+                "hit_ratio": round((self.memory_hits + self.disk_hits) / lookups, 3) if lookups else 0.0,
+            }
+
+
+class DocumentEmbeddingCache:
+    """
+    Content-addressed store of chunk embeddings for re-indexing.
+
+    Vectors live in an append-only float32 file read through a memory map,
+    with a parallel index of 32-byte SHA-256 digests (row i of the index is
+    the text of row i of the vectors). Both files sit in a per-model
+    directory, so the key is effectively (model, text hash). Rebuilding a
+    collection or re-chunking unchanged text reads vectors back instead of
+    running the embedding model; only misses are embedded, in one batch.
+    """
+
+    DIGEST_SIZE = 32
+
+    def __init__(
+        self,
+        embedding_function: Callable[[List[str]], Sequence],
+        model_name: str = DEFAULT_EMBEDDING_MODEL,
+        directory: str = "./embedding_cache",
+    ):
+        """
+        Args:
+            embedding_function: Callable mapping a list of texts to vectors
+            model_name: Model identifier; each model gets its own files
+            directory: Parent directory for the cache files
+        """
+        self.embedding_function = embedding_function
+        self.model_name = model_name
+        self.directory = os.path.join(directory, model_name.replace("/", "_"))
+        self.vectors_path = os.path.join(self.directory, "vectors.f32")
+        self.index_path = os.path.join(self.directory, "index.sha256")
+        self.meta_path = os.path.join(self.directory, "meta.txt")
+        self._lock = threading.Lock()
+        self._rows: Dict[bytes, int] = {}
+        self._matrix = None
+        self.dim: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(self.directory, exist_ok=True)
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.meta_path):
+            return
+
+        with open(self.meta_path, "r", encoding="utf-8") as f:
+            self.dim = int(f.read().strip())
+
+        with open(self.index_path, "rb") as f:
+            index = f.read()
+
+        # A crash between the two appends can leave one file longer; trust the shorter
+        row_bytes = self.dim * 4
+        rows = min(len(index) // self.DIGEST_SIZE, os.path.getsize(self.vectors_path) // row_bytes)
+        for row in range(rows):
+            self._rows[index[row * self.DIGEST_SIZE:(row + 1) * self.DIGEST_SIZE]] = row
+
+        for path, size in ((self.index_path, rows * self.DIGEST_SIZE), (self.vectors_path, rows * row_bytes)):
+            if os.path.getsize(path) != size:
+                with open(path, "r+b") as f:
+                    f.truncate(size)
+
+    def _vectors(self) -> np.ndarray:
+        """Memory map over the stored rows, remapped when rows were appended."""
+        rows = len(self._rows)
+        if self._matrix is None or self._matrix.shape[0] != rows:
+            self._matrix = np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(rows, self.dim))
+        return self._matrix
+
+    def _append(self, digests: List[bytes], vectors: np.ndarray):
+        if self.dim is None:
+            self.dim = vectors.shape[1]
+            with open(self.meta_path, "w", encoding="utf-8") as f:
+                f.write(str(self.dim))
+        elif vectors.shape[1] != self.dim:
+            raise ValueError(f"Embedding dimension changed from {self.dim} to {vectors.shape[1]} for {self.model_name}")
+
+        # Vectors first: an index entry never points past the end of the vector file
+        with open(self.vectors_path, "ab") as f:
+            f.write(np.ascontiguousarray(vectors, dtype=np.float32).tobytes())
+        with open(self.index_path, "ab") as f:
+            f.write(b"".join(digests))
+
+        start = len(self._rows)
+        for offset, digest in enumerate(digests):
+            self._rows[digest] = start + offset
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """
+        Get embeddings for texts as a (len(texts), dim) float32 array.
+
+        Cached rows are read from the memory map; misses are embedded in one
+        call and appended to the cache.
+        """
+        digests = [hashlib.sha256(text.encode("utf-8")).digest() for text in texts]
+
+        with self._lock:
+            missing = {}
+            for digest, text in zip(digests, texts):
+                if digest not in self._rows:
+                    missing.setdefault(digest, text)
+
+        if missing:
+            computed = np.asarray(self.embedding_function(list(missing.values())), dtype=np.float32)
+            with self._lock:
+                fresh = [(d, v) for d, v in zip(missing.keys(), computed) if d not in self._rows]
+                if fresh:
+                    self._append([d for d, _ in fresh], np.stack([v for _, v in fresh]))
+
+        with self._lock:
+            self.misses += len(missing)
+            self.hits += len(texts) - len(missing)
+            if not texts:
+                return np.zeros((0, self.dim or 0), dtype=np.float32)
+            rows = [self._rows[digest] for digest in digests]
+            return np.array(self._vectors()[rows])
+
+    def get_stats(self) -> Dict:
+        """Get entry count, on-disk size and hit counts."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            size = sum(os.path.getsize(p) for p in (self.vectors_path, self.index_path) if os.path.exists(p))
+            return {
+                "model": self.model_name,
+                "directory": self.directory,
+                "entries": len(self._rows),
+                "dim": self.dim,
+                "size_bytes": size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+
+class OpenAIEmbeddingFunction:
+    """Embedding function backed by the OpenAI embeddings API, batched."""
+
+    def __init__(self, model: str, batch_size: int = 512):
+        from openai import OpenAI
+
+        self.client = OpenAI()
+        self.model = model
+        self.batch_size = batch_size
+
+    def __call__(self, input: List[str]) -> List[List[float]]:
+        vectors = []
+        for start in range(0, len(input), self.batch_size):
+            response = self.client.embeddings.create(model=self.model, input=input[start:start + self.batch_size])
+            vectors.extend(item.embedding for item in response.data)
+        return vectors
+
+
+def default_embedding_function() -> Tuple[Callable[[List[str]], Sequence], str]:
+    """
+    Get (embedding function, model name) for stores that embed their own text.
+
+    Uses chromadb's bundled MiniLM model when chromadb is installed, so the
+    NumPy backend and Chroma collections share one embedding space; falls
+    back to OpenAI embeddings (Config.EMBEDDING_MODEL) without it.
+    """
+    try:
+        from chromadb.utils import embedding_functions
+        return embedding_functions.DefaultEmbeddingFunction(), DEFAULT_EMBEDDING_MODEL
+    except ImportError:
+        from src.utils.config import Config
+        return OpenAIEmbeddingFunction(Config.EMBEDDING_MODEL), Config.EMBEDDING_MODEL
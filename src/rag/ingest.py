@@ -0,0 +1,344 @@
+"""Incremental, resumable corpus ingestion into the vector store.
+
+A manifest next to the Chroma database records each ingested file's content
+hash and the chunk IDs it produced. Re-running only embeds chunks from new
+or changed files, deletes chunks whose file changed or disappeared, and
+checkpoints after every file, so a killed run picks up where it stopped.
+After a run that changed a collection, its BM25 index is rebuilt from the
+stored chunks so lexical and vector retrieval always see the same corpus.
+
+Usage:
+    python -m src.rag.ingest                                  # Config.KNOWLEDGE_DIR / STYLE_EXAMPLES_DIR
+    python -m src.rag.ingest --knowledge-dir ./vault --style-dir ./examples
+    python -m src.rag.ingest --dry-run                        # report what would change
+    python -m src.rag.ingest --rebuild --space ip             # recreate collections from cached embeddings
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+from src.rag.backends import create_vector_store
+from src.rag.bm25 import build_lexical_index, lexical_index_path
+from src.rag.document_loader import Document, DocumentLoader
+from src.rag.virtues import TAGGER_VERSION
+from src.utils.config import Config
+
+MANIFEST_VERSION = 1
+MANIFEST_FILENAME = "ingest_manifest.json"
+
+
+def file_hash(path: Path) -> str:
+    """SHA-256 of a file's bytes."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def chunk_size_histogram(token_counts: List[int], chunk_size: int, bins: int = 8) -> List[Dict]:
+    """
+    Bucket chunk token counts into equal-width bins up to chunk_size.
+
+    Returns:
+        [{"range": "0-25", "count": n}, ...]; a final "over" bin catches any
+        chunk above chunk_size (which the chunker should never produce)
+    """
+    width = max(1, -(-chunk_size // bins))
+    counts = [0] * (bins + 1)
+    for tokens in token_counts:
+        counts[min(tokens // width, bins - 1) if tokens <= chunk_size else bins] += 1
+
+    histogram = [
+        {"range": f"{i * width}-{chunk_size if i == bins - 1 else (i + 1) * width - 1}", "count": counts[i]}
+        for i in range(bins)
+    ]
+    histogram.append({"range": f">{chunk_size}", "count": counts[bins]})
+    return histogram
+
+
+def print_histogram(histogram: List[Dict], width: int = 40):
+    """Print a histogram as labelled text bars."""
+    peak = max((row["count"] for row in histogram), default=0) or 1
+    for row in histogram:
+        bar = "#" * round(width * row["count"] / peak)
+        print(f"  {row['range']:>9} tokens | {bar} {row['count']}")
+
+
+class IngestManifest:
+    """
+    Per-collection record of ingested files.
+
+    Layout: {"version", "collections": {name: {"chunker", "files": {source_path:
+    {"hash", "chunk_ids", "chunker"}}}}}. Each file records the chunker
+    signature it was chunked with, so a killed re-chunk resumes with the files
+    it had not reached yet; the collection's "chunker" is only the fallback
+    for entries written before that, and is updated once every file is on the
+    current signature. Saved atomically so a crash mid-write never leaves a
+    truncated manifest behind.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.data = {"version": MANIFEST_VERSION, "collections": {}}
+
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                loaded = json.load(f)
+            if loaded.get("version") == MANIFEST_VERSION:
+                self.data = loaded
+            else:
+                print(f"Ignoring manifest {path} with unsupported version {loaded.get('version')}")
+
+    def collection(self, name: str) -> Dict:
+        return self.data["collections"].setdefault(name, {"chunker": None, "files": {}})
+
+    def save(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.data, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+class CorpusIngestor:
+    """Sync a directory of markdown/text files into a vector store collection."""
+
+    def __init__(
+        self,
+        vector_store,
+        loader: Optional[DocumentLoader] = None,
+        manifest_path: Optional[str] = None,
+        batch_size: int = 64,
+        workers: Optional[int] = None,
+    ):
+        """
+        Args:
+            vector_store: VectorStore or NumpyVectorStore to write to
+            loader: Chunker (defaults to DocumentLoader with Config chunk settings)
+            manifest_path: Manifest file (defaults to <db_path>/ingest_manifest.json)
+            batch_size: Chunks per upsert call
+            workers: Parser processes (defaults to os.cpu_count(); 1 parses inline)
+        """
+        self.vs = vector_store
+        self.loader = loader or DocumentLoader(Config.CHUNK_SIZE, Config.CHUNK_OVERLAP)
+        self.manifest = IngestManifest(manifest_path or os.path.join(vector_store.db_path, MANIFEST_FILENAME))
+        self.batch_size = batch_size
+        self.workers = workers
+
+    def _chunker_signature(self) -> Dict:
+        """Settings that change chunks or their metadata; a change forces re-chunking every file."""
+        return {
+            "unit": "tokens",
+            "chunk_size": self.loader.chunk_size,
+            "chunk_overlap": self.loader.chunk_overlap,
+            "virtue_tagger": TAGGER_VERSION,
+        }
+
+    def _write_chunks(self, documents: List[Document], collection_name: str, overwrite: bool = False) -> int:
+        """
+        Upsert chunks in batches. Returns the number written.
+
+        Chunks already stored are skipped unless overwrite is set, which
+        rewrites their metadata (their embeddings come from the cache).
+        """
+        written = 0
+        for start in range(0, len(documents), self.batch_size):
+            batch = documents[start:start + self.batch_size]
+            existing = set() if overwrite else self.vs.existing_ids([doc.doc_id for doc in batch], collection_name)
+            fresh = [doc for doc in batch if doc.doc_id not in existing]
+            self.vs.upsert_documents(fresh, collection_name)
+            written += len(fresh)
+        return written
+
+    def ingest_directory(self, directory: str, collection_name: str, dry_run: bool = False) -> Dict:
+        """
+        Bring a collection in line with the files under directory.
+
+        Returns:
+            Counts of files added/changed/unchanged/removed, chunks written/deleted
+            and a token-size histogram of the chunks produced this run
+        """
+        stats = {
+            "collection": collection_name,
+            "directory": directory,
+            "files_added": 0,
+            "files_changed": 0,
+            "files_unchanged": 0,
+            "files_removed": 0,
+            "files_failed": 0,
+            "chunks_written": 0,
+            "chunks_deleted": 0,
+            "chunk_tokens": [],
+            "lexical_index": None,
+        }
+
+        base = Path(directory)
+        if not base.exists():
+            # Never treat a missing directory as "every file was removed"
+            print(f"Warning: Directory {directory} does not exist; skipping {collection_name}")
+            return stats
+
+        record = self.manifest.collection(collection_name)
+        signature = self._chunker_signature()
+
+        def outdated(entry: Dict) -> bool:
+            chunked_with = entry.get("chunker", record["chunker"])
+            return chunked_with is not None and chunked_with != signature
+
+        reingest_all = False
+        pending = sum(1 for entry in record["files"].values() if outdated(entry))
+        if pending:
+            print(f"Chunker settings changed for {collection_name}; re-chunking {pending} files")
+        elif record["files"] and self.vs.count(collection_name) == 0:
+            # Collection was cleared behind the manifest's back; embeddings come from the cache
+            print(f"{collection_name} is empty; re-ingesting all files")
+            reingest_all = True
+
+        seen = set()
+        changed = {}
+        for path in self.loader.list_files(directory):
+            source_path = path.relative_to(base).as_posix()
+            seen.add(source_path)
+
+            try:
+                content_hash = file_hash(path)
+            except Exception as e:
+                stats["files_failed"] += 1
+                print(f"Error reading {path}: {e}")
+                continue
+
+            entry = record["files"].get(source_path)
+            rechunk = reingest_all or bool(entry and outdated(entry))
+            if entry and entry["hash"] == content_hash and not rechunk:
+                stats["files_unchanged"] += 1
+                continue
+
+            stats["files_changed" if entry else "files_added"] += 1
+            if dry_run:
+                print(f"Would ingest: {source_path}")
+                continue
+            changed[path] = (source_path, content_hash, entry, rechunk)
+
+        token_counts = []
+        # Parsing runs ahead in worker processes while this loop upserts
+        for path, documents, error in self.loader.iter_file_documents(list(changed), base, self.workers):
+            source_path, content_hash, entry, rechunk = changed[path]
+            try:
+                if error is not None:
+                    raise error
+
+                chunk_ids = [doc.doc_id for doc in documents]
+                token_counts.extend(doc.metadata.get("tokens", 0) for doc in documents)
+                written = self._write_chunks(documents, collection_name, overwrite=rechunk)
+
+                stale = sorted(set(entry["chunk_ids"]) - set(chunk_ids)) if entry else []
+                self.vs.delete_documents(stale, collection_name)
+
+                record["files"][source_path] = {"hash": content_hash, "chunk_ids": chunk_ids, "chunker": signature}
+                self.manifest.save()
+
+                stats["chunks_written"] += written
+                stats["chunks_deleted"] += len(stale)
+                print(f"Ingested: {source_path} ({len(documents)} chunks, {written} written, {len(stale)} deleted)")
+            except Exception as e:
+                stats["files_failed"] += 1
+                print(f"Error ingesting {path}: {e}")
+
+        for source_path in sorted(set(record["files"]) - seen):
+            stats["files_removed"] += 1
+            if dry_run:
+                print(f"Would remove: {source_path}")
+                continue
+
+            chunk_ids = record["files"][source_path]["chunk_ids"]
+            self.vs.delete_documents(chunk_ids, collection_name)
+            del record["files"][source_path]
+            self.manifest.save()
+
+            stats["chunks_deleted"] += len(chunk_ids)
+            print(f"Removed: {source_path} ({len(chunk_ids)} chunks)")
+
+        if token_counts:
+            stats["chunk_tokens"] = chunk_size_histogram(token_counts, self.loader.chunk_size)
+
+        # A failed file keeps its old signature and is retried on the next run
+        if not dry_run and not stats["files_failed"] and record["chunker"] != signature:
+            record["chunker"] = signature
+            self.manifest.save()
+
+        touched = stats["chunks_written"] or stats["chunks_deleted"]
+        index_path = lexical_index_path(self.vs.db_path, collection_name)
+        if not dry_run and (touched or not os.path.exists(index_path)):
+            index = build_lexical_index(self.vs, collection_name)
+            stats["lexical_index"] = index.get_stats() if index else None
+
+        return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Incrementally ingest the stoic corpus into the vector store")
+    parser.add_argument("--knowledge-dir", default=Config.KNOWLEDGE_DIR, help="Directory for stoic_knowledge")
+    parser.add_argument("--style-dir", default=Config.STYLE_EXAMPLES_DIR, help="Directory for style_examples")
+    parser.add_argument("--backend", default=Config.VECTOR_BACKEND, choices=["chroma", "numpy"])
+    parser.add_argument("--db-path", default=None, help="Store path (defaults to the backend's configured path)")
+    parser.add_argument("--manifest", default=None, help="Manifest path (defaults to <db-path>/ingest_manifest.json)")
+    parser.add_argument("--batch-size", type=int, default=64, help="Chunks per upsert")
+    parser.add_argument("--workers", type=int, default=None, help="Parser processes (default: CPU count)")
+    parser.add_argument("--dry-run", action="store_true", help="Report changes without writing")
+    parser.add_argument("--rebuild", action="store_true", help="Recreate both collections from their contents")
+    parser.add_argument("--space", default="cosine", choices=["cosine", "l2", "ip"], help="HNSW space for --rebuild")
+    args = parser.parse_args()
+
+    vector_store = create_vector_store(args.backend, args.db_path)
+
+    if args.rebuild:
+        for collection_name in ("stoic_knowledge", "style_examples"):
+            stats = vector_store.rebuild_collection(collection_name, space=args.space, batch_size=args.batch_size)
+            print(
+                f"Rebuilt {collection_name} ({stats['space']}): {stats['documents']} documents in "
+                f"{stats['seconds']}s, {stats.get('embedding_cache_misses', 'n/a')} embedded"
+            )
+            build_lexical_index(vector_store, collection_name)
+        return
+
+    started = time.perf_counter()
+    ingestor = CorpusIngestor(
+        vector_store,
+        manifest_path=args.manifest,
+        batch_size=args.batch_size,
+        workers=args.workers,
+    )
+
+    results = []
+    for directory, collection_name in (
+        (args.knowledge_dir, "stoic_knowledge"),
+        (args.style_dir, "style_examples"),
+    ):
+        if directory:
+            results.append(ingestor.ingest_directory(directory, collection_name, dry_run=args.dry_run))
+
+    for stats in results:
+        print(
+            f"{stats['collection']}: {stats['files_added']} added, {stats['files_changed']} changed, "
+            f"{stats['files_unchanged']} unchanged, {stats['files_removed']} removed, "
+            f"{stats['files_failed']} failed | {stats['chunks_written']} chunks written, "
+            f"{stats['chunks_deleted']} deleted"
+        )
+        if stats["lexical_index"]:
+            index = stats["lexical_index"]
+            print(f"  BM25 index: {index['documents']} chunks, {index['terms']} terms, {index['postings']} postings")
+            tagged = ", ".join(f"{virtue} {count}" for virtue, count in index["documents_by_virtue"].items())
+            print(f"  Virtue tags: {tagged}")
+        if stats["chunk_tokens"]:
+            print("Chunk sizes:")
+            print_histogram(stats["chunk_tokens"])
+    print(f"Done in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
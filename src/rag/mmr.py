@@ -0,0 +1,55 @@
+"""Maximal marginal relevance (MMR) re-ranking over candidate embeddings."""
+
+from typing import List
+import numpy as np
+
+
+def mmr_select(query_embedding, candidate_embeddings, k: int, lambda_mult: float = 0.7) -> List[int]:
+    """
+    Greedily pick k diverse, relevant candidates.
+
+    Each step takes the candidate maximizing
+    lambda_mult * sim(query, c) - (1 - lambda_mult) * max sim(c, already picked),
+    with cosine similarities. The pairwise similarity matrix is computed once
+    and the running "max similarity to the picked set" is updated with one
+    vectorized np.maximum per step, so the cost is a single matmul plus k
+    passes over the candidates.
+
+    Args:
+        query_embedding: Query vector, shape (dim,)
+        candidate_embeddings: Candidate vectors, shape (n, dim), in relevance order
+        k: Number of candidates to pick
+        lambda_mult: 1.0 ranks by relevance only, 0.0 by diversity only
+
+    Returns:
+        Indexes into candidate_embeddings, in pick order
+    """
+    candidates = np.asarray(candidate_embeddings, dtype=np.float32)
+    n = len(candidates)
+    k = min(k, n)
+    if k <= 0:
+        return []
+
+    candidates = candidates / np.maximum(np.linalg.norm(candidates, axis=1, keepdims=True), 1e-12)
+    query = np.asarray(query_embedding, dtype=np.float32)
+    query = query / max(float(np.linalg.norm(query)), 1e-12)
+
+    relevance = candidates @ query
+    picked = [int(np.argmax(relevance))]
+    if k == 1:
+        return picked
+
+    similarity = candidates @ candidates.T
+    max_similarity = similarity[picked[0]].copy()
+    available = np.ones(n, dtype=bool)
+    available[picked[0]] = False
+
+    while len(picked) < k:
+        scores = lambda_mult * relevance - (1 - lambda_mult) * max_similarity
+        scores[~available] = -np.inf
+        choice = int(np.argmax(scores))
+        picked.append(choice)
+        available[choice] = False
+        np.maximum(max_similarity, similarity[choice], out=max_similarity)
+
+    return picked
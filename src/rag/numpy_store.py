@@ -0,0 +1,501 @@
+"""Exact-search vector store on NumPy, with no chromadb dependency.
+
+The corpus is small enough (thousands of chunks) that a brute-force matmul
+over a float32 matrix beats HNSW on latency and is exact. Each collection is
+a directory holding a memory-mapped embeddings-<generation>.npy of
+L2-normalized vectors and records.json with ids, documents and metadata.
+Writes save a new generation of the matrix, then atomically swap
+records.json to point at it, so readers never see a half-written store.
+The previous generation is kept until the next write, since readers may
+still have it memory-mapped. Every access stats records.json and reloads
+after another process (e.g. `python -m src.rag.ingest`) wrote it.
+"""
+
+import glob
+import json
+import os
+import re
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple
+import numpy as np
+from src.rag.document_loader import Document
+from src.rag.embeddings import DocumentEmbeddingCache, QueryEmbeddingCache, default_embedding_function
+from src.utils.config import Config
+
+COLLECTIONS = ("stoic_knowledge", "style_examples")
+RECORDS_FILENAME = "records.json"
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+
+class _Collection:
+    """One collection's matrix and records, swapped as a unit on every write."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.name = os.path.basename(directory)
+        self.lock = threading.Lock()
+        self.space = "cosine"
+        self.model: Optional[str] = None
+        self.generation = 0
+        self.ids: List[str] = []
+        self.documents: List[str] = []
+        self.metadatas: List[Dict] = []
+        self.rows: Dict[str, int] = {}
+        self.matrix: Optional[np.ndarray] = None
+        # (inode, mtime) of the records.json the in-memory state was loaded from or saved as
+        self.records_version: Optional[Tuple[int, int]] = None
+        # Row indexes per metadata filter, e.g. one partition per virtue, keyed by generation
+        self.partitions: Dict[Tuple, np.ndarray] = {}
+        os.makedirs(directory, exist_ok=True)
+        self._load()
+
+    @property
+    def records_path(self) -> str:
+        return os.path.join(self.directory, RECORDS_FILENAME)
+
+    def _matrix_path(self, generation: int) -> str:
+        return os.path.join(self.directory, f"embeddings-{generation}.npy")
+
+    def _stat_records(self) -> Optional[Tuple[int, int]]:
+        # os.replace gives every write a new inode, which survives coarse mtime resolution
+        try:
+            stat = os.stat(self.records_path)
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns
+
+    def _load(self):
+        version = self._stat_records()
+        if version is None:
+            return
+
+        with open(self.records_path, "r", encoding="utf-8") as f:
+            records = json.load(f)
+        ids = records["ids"]
+        matrix = np.load(self._matrix_path(records["generation"]), mmap_mode="r") if ids else None
+
+        self.space = records.get("space", "cosine")
+        self.model = records.get("model")
+        self.generation = records["generation"]
+        self.ids = ids
+        self.documents = records["documents"]
+        self.metadatas = records["metadatas"]
+        self.rows = {doc_id: row for row, doc_id in enumerate(ids)}
+        self.matrix = matrix
+        self.partitions = {}
+        self.records_version = version
+
+    def refresh(self) -> bool:
+        """
+        Reload when another process has rewritten records.json since it was loaded.
+
+        Returns:
+            True if the collection was reloaded
+        """
+        if self._stat_records() == self.records_version:
+            return False
+        with self.lock:
+            if self._stat_records() == self.records_version:
+                return False
+            try:
+                self._load()
+            except (OSError, ValueError, KeyError) as e:
+                # Caught mid-write (or the generation was already superseded); retry on the next access
+                print(f"Warning: could not reload {self.records_path}: {e}")
+                return False
+        return True
+
+    def _remove_stale_generations(self, keep: Set[int]):
+        """Delete matrices of generations not in keep, leaving any still mapped by a reader."""
+        for path in glob.glob(os.path.join(self.directory, "embeddings-*.npy")):
+            match = re.search(r"embeddings-(\d+)\.npy$", path)
+            if match and int(match.group(1)) not in keep:
+                try:
+                    os.remove(path)
+                except OSError:
+                    # Windows refuses to delete a mapped file; the next save retries
+                    pass
+
+    def save(self, ids: List[str], documents: List[str], metadatas: List[Dict], matrix: Optional[np.ndarray], model: Optional[str]):
+        """Write a new generation and make it current."""
+        previous = self.generation
+        generation = previous + 1
+
+        if ids:
+            np.save(self._matrix_path(generation), np.ascontiguousarray(matrix, dtype=np.float32))
+
+        records = {
+            "generation": generation,
+            "space": self.space,
+            "model": model,
+            "ids": ids,
+            "documents": documents,
+            "metadatas": metadatas,
+        }
+        tmp_path = f"{self.records_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(records, f)
+        os.replace(tmp_path, self.records_path)
+        self.records_version = self._stat_records()
+
+        # Readers may still have the previous generation mapped; it goes on the next save
+        self._remove_stale_generations({previous, generation})
+
+        self.generation = generation
+        self.model = model
+        self.ids, self.documents, self.metadatas = ids, documents, metadatas
+        self.rows = {doc_id: row for row, doc_id in enumerate(ids)}
+        self.matrix = np.load(self._matrix_path(generation), mmap_mode="r") if ids else None
+        self.partitions = {}
+
+    def partition(self, generation: int, metadatas: List[Dict], where: Dict) -> np.ndarray:
+        """Rows whose metadata equals every key/value in where, computed once per generation."""
+        key = (generation, tuple(sorted(where.items())))
+        rows = self.partitions.get(key)
+        if rows is None:
+            rows = np.array(
+                [row for row, metadata in enumerate(metadatas) if all(metadata.get(k) == v for k, v in where.items())],
+                dtype=np.int64,
+            )
+            self.partitions[key] = rows
+        return rows
+
+
+class NumpyVectorStore:
+    """
+    VectorStore-compatible backend doing exact top-k over a float32 matrix.
+
+    Select it with VECTOR_BACKEND=numpy. It exposes the same query, write and
+    stats methods as the Chroma-backed VectorStore, so Retriever, the ingest
+    CLI and RAGService work unchanged.
+    """
+
+    def __init__(
+        self,
+        db_path: str = "./vector_store",
+        cache_query_embeddings: Optional[bool] = None,
+        cache_document_embeddings: Optional[bool] = None,
+    ):
+        """
+        Args:
+            db_path: Directory holding one subdirectory per collection
+            cache_query_embeddings: Memoize query embeddings on disk (defaults to Config.QUERY_EMBEDDING_CACHE)
+            cache_document_embeddings: Reuse chunk embeddings across rebuilds (defaults to Config.DOC_EMBEDDING_CACHE)
+        """
+        self.db_path = db_path
+        self.embedding_function, self.model_name = default_embedding_function()
+        self.collections = {name: _Collection(os.path.join(db_path, name)) for name in COLLECTIONS}
+        self._change_listeners: List[Callable[[str], None]] = []
+
+        for name, collection in self.collections.items():
+            if collection.model and collection.model != self.model_name:
+                print(
+                    f"Warning: {name} was embedded with {collection.model} but the current model is "
+                    f"{self.model_name}; run `python -m src.rag.ingest --rebuild`"
+                )
+
+        if cache_query_embeddings is None:
+            cache_query_embeddings = Config.QUERY_EMBEDDING_CACHE
+        if cache_document_embeddings is None:
+            cache_document_embeddings = Config.DOC_EMBEDDING_CACHE
+
+        self.query_embeddings = None
+        if cache_query_embeddings:
+            self.query_embeddings = QueryEmbeddingCache(
+                self.embedding_function,
+                model_name=self.model_name,
+                path=Config.QUERY_EMBEDDING_CACHE_PATH or os.path.join(db_path, "query_embeddings.sqlite3"),
+            )
+
+        self.document_embeddings = None
+        if cache_document_embeddings:
+            self.document_embeddings = DocumentEmbeddingCache(
+                self.embedding_function,
+                model_name=self.model_name,
+                directory=Config.DOC_EMBEDDING_CACHE_DIR or os.path.join(db_path, "embedding_cache"),
+            )
+
+    def add_change_listener(self, callback: Callable[[str], None]):
+        """Register a callback run with the collection name after every write."""
+        self._change_listeners.append(callback)
+
+    def _notify_change(self, collection_name: str):
+        for callback in self._change_listeners:
+            callback(collection_name)
+
+    def _collection(self, collection_name: str) -> _Collection:
+        collection = self.collections.get(collection_name, self.collections["style_examples"])
+        if collection.refresh():
+            self._notify_change(collection.name)
+        return collection
+
+    def _embed_documents(self, contents: List[str]) -> np.ndarray:
+        if self.document_embeddings is not None:
+            vectors = self.document_embeddings.embed(contents)
+        else:
+            vectors = np.asarray(self.embedding_function(contents), dtype=np.float32)
+        return _normalize(np.asarray(vectors, dtype=np.float32))
+
+    def add_documents(self, documents: List[Document], collection_name: str = "stoic_knowledge"):
+        """Add documents to the vector store, keyed by their stable doc_id."""
+        self.upsert_documents(documents, collection_name)
+
+        print(f"Added {len(documents)} documents to {collection_name}")
+
+    def upsert_documents(self, documents: List[Document], collection_name: str = "stoic_knowledge"):
+        """Insert or replace documents by doc_id."""
+        if not documents:
+            return
+
+        unique = {doc.doc_id: doc for doc in documents}
+        vectors = self._embed_documents([doc.content for doc in unique.values()])
+        collection = self._collection(collection_name)
+
+        with collection.lock:
+            ids = list(collection.ids)
+            contents = list(collection.documents)
+            metadatas = list(collection.metadatas)
+            matrix = np.array(collection.matrix) if collection.matrix is not None else np.zeros((0, vectors.shape[1]), dtype=np.float32)
+
+            appended = []
+            for (doc_id, doc), vector in zip(unique.items(), vectors):
+                row = collection.rows.get(doc_id)
+                if row is None:
+                    ids.append(doc_id)
+                    contents.append(doc.content)
+                    metadatas.append(doc.metadata)
+                    appended.append(vector)
+                else:
+                    contents[row] = doc.content
+                    metadatas[row] = doc.metadata
+                    matrix[row] = vector
+
+            if appended:
+                matrix = np.vstack([matrix, np.stack(appended)])
+            collection.save(ids, contents, metadatas, matrix, self.model_name)
+
+        self._notify_change(collection_name)
+
+    def existing_ids(self, ids: List[str], collection_name: str = "stoic_knowledge") -> Set[str]:
+        """Return which of ids are already stored."""
+        rows = self._collection(collection_name).rows
+        return {doc_id for doc_id in ids if doc_id in rows}
+
+    def delete_documents(self, ids: List[str], collection_name: str = "stoic_knowledge"):
+        """Delete documents by ID."""
+        if not ids:
+            return
+
+        collection = self._collection(collection_name)
+        with collection.lock:
+            doomed = {collection.rows[doc_id] for doc_id in ids if doc_id in collection.rows}
+            if not doomed:
+                return
+
+            keep = [row for row in range(len(collection.ids)) if row not in doomed]
+            collection.save(
+                [collection.ids[row] for row in keep],
+                [collection.documents[row] for row in keep],
+                [collection.metadatas[row] for row in keep],
+                np.array(collection.matrix[keep]) if keep else None,
+                collection.model,
+            )
+
+        self._notify_change(collection_name)
+
+    def get_documents(self, collection_name: str = "stoic_knowledge", batch_size: int = 1000) -> Tuple[List[str], List[str], List[Dict]]:
+        """Get (ids, documents, metadatas) for every document in a collection."""
+        collection = self._collection(collection_name)
+        return list(collection.ids), list(collection.documents), list(collection.metadatas)
+
+    def get_by_ids(self, ids: List[str], collection_name: str = "stoic_knowledge", include_embeddings: bool = False) -> List[Dict]:
+        """Get documents by ID as query-style results (distance None), in the order given."""
+        collection = self._collection(collection_name)
+        rows, documents, metadatas, matrix = collection.rows, collection.documents, collection.metadatas, collection.matrix
+        results = []
+        for doc_id in ids:
+            if doc_id not in rows:
+                continue
+            row = rows[doc_id]
+            result = {"id": doc_id, "content": documents[row], "metadata": metadatas[row], "distance": None}
+            if include_embeddings:
+                result["embedding"] = np.array(matrix[row])
+            results.append(result)
+        return results
+
+    def count(self, collection_name: str = "stoic_knowledge") -> int:
+        """Number of documents in a collection."""
+        return len(self._collection(collection_name).ids)
+
+    def embed_queries(self, texts: List[str]) -> List[Sequence[float]]:
+        """Embed query texts, through the query-embedding cache when enabled."""
+        if self.query_embeddings is not None:
+            return self.query_embeddings.embed(texts)
+        return [np.asarray(vec, dtype=np.float32) for vec in self.embedding_function(texts)]
+
+    def query(
+        self,
+        query_text: Optional[str] = None,
+        k: int = 3,
+        collection_name: str = "stoic_knowledge",
+        query_embedding: Optional[Sequence[float]] = None,
+        where: Optional[Dict] = None,
+        include_embeddings: bool = False,
+    ) -> List[Dict]:
+        """
+        Exact top-k by cosine similarity.
+
+        Args:
+            query_text: Text to search for (embedded via the query cache)
+            k: Number of results
+            collection_name: Collection to search
+            query_embedding: Precomputed query vector; skips embedding query_text
+            where: Metadata equality filter; only matching rows are scored
+            include_embeddings: Add each result's stored vector as "embedding"
+        """
+        if query_embedding is None and query_text is None:
+            raise ValueError("query requires query_text or query_embedding")
+
+        collection = self._collection(collection_name)
+        # Snapshot: a concurrent write swaps these attributes, never mutates them
+        matrix, ids, documents, metadatas, space, generation = (
+            collection.matrix, collection.ids, collection.documents, collection.metadatas,
+            collection.space, collection.generation,
+        )
+        if matrix is None or k <= 0:
+            return []
+
+        rows = collection.partition(generation, metadatas, where) if where else None
+        if rows is not None and not len(rows):
+            return []
+
+        if query_embedding is None:
+            query_embedding = self.embed_queries([query_text])[0]
+        q = _normalize(np.asarray(query_embedding, dtype=np.float32))
+
+        scores = (matrix if rows is None else matrix[rows]) @ q
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        scores = scores[top]
+        if rows is not None:
+            top = rows[top]
+
+        # Report distances the way Chroma does for the collection's space
+        distances = 2 - 2 * scores if space == "l2" else 1 - scores
+        results = [
+            {
+                "id": ids[row],
+                "content": documents[row],
+                "metadata": metadatas[row],
+                "distance": float(distance),
+            }
+            for row, distance in zip(top, distances)
+        ]
+        if include_embeddings:
+            for result, vector in zip(results, np.array(matrix[top])):
+                result["embedding"] = vector
+        return results
+
+    def get_space(self, collection_name: str = "stoic_knowledge") -> str:
+        """Distance space a collection reports distances in."""
+        return self._collection(collection_name).space
+
+    def clear_collection(self, collection_name: str = "stoic_knowledge"):
+        """Clear a collection."""
+        collection = self._collection(collection_name)
+        with collection.lock:
+            collection.save([], [], [], None, collection.model)
+        self._notify_change(collection_name)
+
+    def replace_collection(
+        self,
+        collection_name: str,
+        ids: List[str],
+        contents: List[str],
+        metadatas: List[Dict],
+        embeddings: np.ndarray,
+        space: str = "cosine",
+    ):
+        """Replace a collection's contents with precomputed embeddings (e.g. from a snapshot)."""
+        collection = self._collection(collection_name)
+        with collection.lock:
+            collection.space = space
+            matrix = _normalize(np.asarray(embeddings, dtype=np.float32)) if ids else None
+            collection.save(list(ids), list(contents), list(metadatas), matrix, self.model_name)
+        self._notify_change(collection_name)
+
+    def rebuild_collection(
+        self,
+        collection_name: str = "stoic_knowledge",
+        space: str = "cosine",
+        batch_size: int = 256,
+    ) -> Dict:
+        """
+        Re-embed a collection from its stored documents and set its distance space.
+
+        Embeddings come from the document embedding cache, so this is mostly
+        I/O unless the embedding model changed.
+
+        Returns:
+            Document count, elapsed seconds and document cache hits/misses
+        """
+        started = time.perf_counter()
+        collection = self._collection(collection_name)
+        before = self.document_embeddings.get_stats() if self.document_embeddings else None
+
+        with collection.lock:
+            ids, contents, metadatas = list(collection.ids), list(collection.documents), list(collection.metadatas)
+            matrix = None
+            if ids:
+                matrix = np.vstack([
+                    self._embed_documents(contents[start:start + batch_size])
+                    for start in range(0, len(contents), batch_size)
+                ])
+            collection.space = space
+            collection.save(ids, contents, metadatas, matrix, self.model_name)
+        self._notify_change(collection_name)
+
+        stats = {
+            "collection": collection_name,
+            "space": space,
+            "documents": len(ids),
+            "seconds": round(time.perf_counter() - started, 2),
+        }
+        if before is not None:
+            after = self.document_embeddings.get_stats()
+            stats["embedding_cache_hits"] = after["hits"] - before["hits"]
+            stats["embedding_cache_misses"] = after["misses"] - before["misses"]
+        return stats
+
+    def warm(self):
+        """Load the embedding model and page the matrices into memory."""
+        self.embedding_function(["stoic wisdom"])
+        for collection in self.collections.values():
+            if collection.matrix is not None:
+                float(np.asarray(collection.matrix).sum())
+
+    def close(self):
+        """Release the query-embedding cache's SQLite handle and drop superseded matrices."""
+        for collection in self.collections.values():
+            collection._remove_stale_generations({collection.generation})
+        if self.query_embeddings is not None:
+            self.query_embeddings.close()
+
+    def get_stats(self) -> Dict:
+        """Get statistics about the vector store."""
+        stats = {
+            "backend": "numpy",
+            "knowledge_documents": self.count("stoic_knowledge"),
+            "style_examples": self.count("style_examples"),
+        }
+        if self.query_embeddings is not None:
+            stats["query_embedding_cache"] = self.query_embeddings.get_stats()
+        if self.document_embeddings is not None:
+            stats["document_embedding_cache"] = self.document_embeddings.get_stats()
+        return stats
@@ -1,20 +1,215 @@
-from typing import List, Dict
-from src.rag.vector_store import VectorStore
+import os
+import threading
+import time
+from typing import List, Dict, Optional
+from src.rag.bm25 import BM25Index, lexical_index_path, reciprocal_rank_fusion
+from src.rag.cache import RetrievalCache
+from src.rag.mmr import mmr_select
+from src.rag.virtues import virtue_filter
+from src.utils.config import Config
+
+RETRIEVAL_MODES = ("vector", "bm25", "hybrid")
 
 
 class Retriever:
     """Retrieve relevant passages and examples from the vector store."""
 
-    def __init__(self, vector_store: VectorStore):
+    def __init__(
+        self,
+        vector_store,
+        cache_size: Optional[int] = None,
+        cache_ttl_seconds: Optional[float] = None,
+    ):
+        """
+        Args:
+            vector_store: VectorStore or NumpyVectorStore to query
+            cache_size: Max cached lookups, 0 disables (defaults to Config.RETRIEVAL_CACHE_SIZE)
+            cache_ttl_seconds: Cached lookup lifetime (defaults to Config.RETRIEVAL_CACHE_TTL_SECONDS)
+        """
         self.vs = vector_store
+        self.cache = RetrievalCache(
+            max_entries=Config.RETRIEVAL_CACHE_SIZE if cache_size is None else cache_size,
+            ttl_seconds=Config.RETRIEVAL_CACHE_TTL_SECONDS if cache_ttl_seconds is None else cache_ttl_seconds,
+        )
+        self.vs.add_change_listener(self.cache.invalidate)
+        self._lexical: Dict[str, tuple] = {}
+        self._lexical_lock = threading.Lock()
+        self.mode_counts = {mode: 0 for mode in RETRIEVAL_MODES}
+        self.filtered_lookups = 0
+        self.backfilled_lookups = 0
+        self.mmr_reranks = 0
+        self.mmr_ms = 0.0
+
+    def _lexical_index(self, collection_name: str) -> Optional[BM25Index]:
+        """Load a collection's BM25 index, reloading when ingest has rewritten it."""
+        if hasattr(self.vs, "lexical_index"):
+            # Snapshot stores carry their index in the snapshot file
+            index = self.vs.lexical_index(collection_name)
+            if index is not None:
+                with self._lexical_lock:
+                    self._lexical[collection_name] = (None, index)
+            return index
+
+        path = lexical_index_path(self.vs.db_path, collection_name)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+        with self._lexical_lock:
+            loaded = self._lexical.get(collection_name)
+            if loaded is None or loaded[0] != mtime:
+                loaded = (mtime, BM25Index.load(path))
+                self._lexical[collection_name] = loaded
+                self.cache.invalidate(collection_name)
+            return loaded[1]
+
+    def _search(
+        self,
+        query: str,
+        k: int,
+        collection_name: str,
+        mode: str,
+        virtue: Optional[str] = None,
+        include_embeddings: bool = False,
+    ) -> List[Dict]:
+        """Run one uncached lookup in the given mode, restricted to chunks tagged with virtue."""
+        where = virtue_filter(virtue)
+        index = self._lexical_index(collection_name) if mode != "vector" else None
+        if index is None:
+            # No index ingested yet: lexical modes degrade to plain vector search
+            mode = "vector"
+        self.mode_counts[mode] += 1
+
+        if mode == "vector":
+            return self.vs.query(
+                query, k=k, collection_name=collection_name, where=where, include_embeddings=include_embeddings
+            )
+
+        if mode == "bm25":
+            hits = index.search(query, k, virtue=virtue)
+            scores = dict(hits)
+            results = self.vs.get_by_ids([doc_id for doc_id, _ in hits], collection_name, include_embeddings)
+            for result in results:
+                result["score"] = scores[result["id"]]
+            return results
+
+        # Hybrid: fuse both rankings with RRF over a deeper candidate pool
+        depth = max(4 * k, 20)
+        vector_results = self.vs.query(
+            query, k=depth, collection_name=collection_name, where=where, include_embeddings=include_embeddings
+        )
+        lexical_ids = [doc_id for doc_id, _ in index.search(query, depth, virtue=virtue)]
+        fused = reciprocal_rank_fusion([[r["id"] for r in vector_results], lexical_ids], Config.RRF_K)[:k]
+
+        by_id = {r["id"]: r for r in vector_results}
+        lexical_only = [doc_id for doc_id, _ in fused if doc_id not in by_id]
+        by_id.update({r["id"]: r for r in self.vs.get_by_ids(lexical_only, collection_name, include_embeddings)})
 
-    def retrieve_knowledge(self, query: str, k: int = 3) -> List[Dict]:
-        """Retrieve stoic passages relevant to the query."""
-        return self.vs.query(query, k=k, collection_name="stoic_knowledge")
+        results = []
+        for doc_id, score in fused:
+            if doc_id in by_id:
+                results.append({**by_id[doc_id], "score": score})
+        return results
+
+    def _rerank_mmr(self, query: str, candidates: List[Dict], k: int, lambda_mult: float) -> List[Dict]:
+        """Pick a diverse top-k from over-fetched candidates carrying embeddings."""
+        started = time.perf_counter()
+        query_embedding = self.vs.embed_queries([query])[0]
+        order = mmr_select(query_embedding, [r["embedding"] for r in candidates], k, lambda_mult)
+        self.mmr_reranks += 1
+        self.mmr_ms += (time.perf_counter() - started) * 1000
+        return [candidates[i] for i in order]
+
+    def _query(
+        self,
+        query: str,
+        k: int,
+        collection_name: str,
+        mode: str = "vector",
+        virtue: Optional[str] = None,
+        mmr_lambda: Optional[float] = None,
+    ) -> List[Dict]:
+        """Query a collection through the result cache."""
+        if virtue_filter(virtue) is None:
+            virtue = None
+        key = RetrievalCache.make_key(collection_name, query, k, extra=(mode, virtue, mmr_lambda))
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        started = time.perf_counter()
+        use_mmr = mmr_lambda is not None
+        # MMR needs a candidate pool larger than k to choose from
+        fetch_k = max(k, Config.MMR_FETCH_K) if use_mmr else k
+        results = self._search(query, fetch_k, collection_name, mode, virtue, use_mmr)
+        if use_mmr:
+            # Diversify within the virtue partition, so off-virtue backfill can't displace on-virtue hits
+            results = self._rerank_mmr(query, results, k, mmr_lambda) if results else []
+            for result in results:
+                del result["embedding"]
+
+        if virtue is not None:
+            self.filtered_lookups += 1
+            if len(results) < k:
+                # Sparse (or untagged) partition: top up the shortfall from the whole collection
+                self.backfilled_lookups += 1
+                seen = {r["id"] for r in results}
+                extra = self._search(query, k + len(results), collection_name, mode, None)
+                results += [r for r in extra if r["id"] not in seen][:k - len(results)]
+
+        self.cache.put(key, results, cost_ms=(time.perf_counter() - started) * 1000)
+        return results
+
+    def retrieve_knowledge(
+        self,
+        query: str,
+        k: int = 3,
+        mode: Optional[str] = None,
+        virtue: Optional[str] = None,
+        mmr_lambda: Optional[float] = None,
+    ) -> List[Dict]:
+        """
+        Retrieve stoic passages relevant to the query.
+
+        Args:
+            query: Search text
+            k: Number of passages
+            mode: "vector", "bm25" or "hybrid" (reciprocal rank fusion of both);
+                defaults to Config.RETRIEVAL_MODE
+            virtue: Search only chunks tagged with this cardinal virtue, topping
+                up from the whole collection if fewer than k match; "general"
+                or None searches everything
+            mmr_lambda: Re-rank Config.MMR_FETCH_K candidates with maximal marginal
+                relevance, trading relevance (1.0) against diversity (0.0);
+                defaults to Config.MMR_LAMBDA when Config.RETRIEVAL_MMR is on,
+                otherwise no re-ranking
+        """
+        mode = mode or Config.RETRIEVAL_MODE
+        if mode not in RETRIEVAL_MODES:
+            raise ValueError(f"Unknown retrieval mode: {mode}")
+        if mmr_lambda is None and Config.RETRIEVAL_MMR:
+            mmr_lambda = Config.MMR_LAMBDA
+        return self._query(query, k, "stoic_knowledge", mode, virtue, mmr_lambda)
 
     def retrieve_style_examples(self, query: str, k: int = 2) -> List[Dict]:
         """Retrieve style examples relevant to the query/content type."""
-        return self.vs.query(query, k=k, collection_name="style_examples")
+        return self._query(query, k, "style_examples")
+
+    def get_stats(self) -> Dict:
+        """Get retrieval cache, lexical index and per-mode lookup statistics."""
+        with self._lexical_lock:
+            lexical = {name: index.get_stats() for name, (_, index) in self._lexical.items()}
+        return {
+            "mode": Config.RETRIEVAL_MODE,
+            "lookups_by_mode": dict(self.mode_counts),
+            "virtue_filtered_lookups": self.filtered_lookups,
+            "virtue_backfilled_lookups": self.backfilled_lookups,
+            "mmr_reranks": self.mmr_reranks,
+            "mmr_avg_ms": round(self.mmr_ms / self.mmr_reranks, 3) if self.mmr_reranks else 0.0,
+            "lexical_indexes": lexical,
+            "cache": self.cache.get_stats(),
+        }
 
     def format_knowledge_context(self, results: List[Dict]) -> str:
         """Format retrieved knowledge passages as context for generation."""
@@ -0,0 +1,126 @@
+"""Process-wide RAG service shared by all API requests."""
+
+import threading
+import time
+from typing import Dict, Optional
+from src.rag.backends import backend_available, create_vector_store, default_store_path
+from src.rag.retriever import Retriever
+from src.utils.config import Config
+
+# chromadb may not be available on all Python versions; the numpy backend needs only numpy
+RAG_AVAILABLE = backend_available()
+
+
+class RAGService:
+    """
+    Own a single VectorStore/Retriever pair for the lifetime of the process.
+
+    Opening the vector store (a chromadb PersistentClient or the NumPy
+    backend's memory maps) and loading the embedding model is expensive, so the API lifespan starts this once and routes borrow the
+    shared Retriever instead of building their own per request.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, backend: Optional[str] = None):
+        """
+        Args:
+            db_path: Store path (defaults to the backend's configured path)
+            backend: "chroma", "numpy" or "snapshot" (defaults to Config.VECTOR_BACKEND)
+        """
+        self.backend = backend or Config.VECTOR_BACKEND
+        self.db_path = db_path or default_store_path(self.backend)
+        self.vector_store = None
+        self.retriever = None
+        self.open_seconds: Optional[float] = None
+        self.warmup_seconds: Optional[float] = None
+        self.error: Optional[str] = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_started(self) -> bool:
+        """Check if the vector store has been opened."""
+        return self.retriever is not None
+
+    def start(self, warm: bool = None):
+        """
+        Open the vector store and optionally warm the embedding model.
+
+        Safe to call more than once; only the first call does any work.
+
+        Args:
+            warm: Run a warmup query per collection (defaults to Config.RAG_WARMUP)
+
+        Returns:
+            The shared Retriever, or None if RAG is unavailable
+        """
+        if warm is None:
+            warm = Config.RAG_WARMUP
+
+        with self._lock:
+            if self.retriever is not None or not backend_available(self.backend):
+                return self.retriever
+
+            try:
+                started = time.perf_counter()
+                self.vector_store = create_vector_store(self.backend, self.db_path)
+                self.retriever = Retriever(self.vector_store)
+                self.open_seconds = time.perf_counter() - started
+            except Exception as e:
+                self.error = str(e)
+                print(f"RAG disabled: could not open vector store at {self.db_path}: {e}")
+                return None
+
+            if warm:
+                self._warm()
+
+        return self.retriever
+
+    def _warm(self):
+        """Run warmup queries so the first request doesn't load the model."""
+        try:
+            started = time.perf_counter()
+            self.vector_store.warm()
+            self.warmup_seconds = time.perf_counter() - started
+        except Exception as e:
+            print(f"RAG warmup failed: {e}")
+
+    def get_retriever(self):
+        """Get the shared Retriever, starting the service lazily if needed."""
+        if self.retriever is None:
+            return self.start(warm=False)
+        return self.retriever
+
+    def stop(self):
+        """Release the vector store."""
+        with self._lock:
+            if self.vector_store is not None:
+                self.vector_store.close()
+            self.retriever = None
+            self.vector_store = None
+
+    def get_stats(self) -> Dict:
+        """Get service status and startup timings."""
+        stats = {
+            "available": backend_available(self.backend),
+            "backend": self.backend,
+            "started": self.is_started,
+            "db_path": self.db_path,
+            "open_seconds": self.open_seconds,
+            "warmup_seconds": self.warmup_seconds,
+            "error": self.error,
+        }
+        if self.vector_store is not None:
+            stats.update(self.vector_store.get_stats())
+        if self.retriever is not None:
+            stats.update(self.retriever.get_stats())
+        return stats
+
+
+_service: Optional[RAGService] = None
+
+
+def get_rag_service() -> RAGService:
+    """Get the process-wide RAGService instance."""
+    global _service
+    if _service is None:
+        _service = RAGService()
+    return _service
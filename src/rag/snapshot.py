@@ -0,0 +1,416 @@
+"""Packed, memory-mappable vector store snapshots for fast cold start.
+
+A snapshot is one file holding every collection's vectors, IDs, documents
+and metadata plus its BM25 index, so a fresh container or an extra replica
+can map it read-only and serve queries without opening Chroma or
+re-ingesting anything.
+
+Layout (little-endian):
+
+    magic "XGVSNAP\\0" | uint32 version | uint32 flags | uint64 header length
+    header JSON (padded to a 64-byte boundary)
+    sections, each 64-byte aligned: float32 vector matrices, records JSON, BM25 .npz
+
+The header lists every section's offset and size, the embedding model,
+the source store's ingest manifest digest and a SHA-256 over everything
+after the header. A bad magic, an unknown version or a checksum mismatch
+raises SnapshotError; comparing the manifest digest with the live store
+tells whether a snapshot is stale.
+
+Usage:
+    python -m src.rag.snapshot export --backend chroma --output ./snapshots/vectors.snap
+    python -m src.rag.snapshot verify ./snapshots/vectors.snap --db-path ./chroma_db
+    python -m src.rag.snapshot import ./snapshots/vectors.snap --backend numpy
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import struct
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from src.rag.bm25 import BM25Index, lexical_index_path
+from src.rag.embeddings import QueryEmbeddingCache, default_embedding_function
+from src.rag.ingest import MANIFEST_FILENAME
+from src.rag.numpy_store import COLLECTIONS, NumpyVectorStore, _Collection, _normalize
+from src.utils.config import Config
+
+MAGIC = b"XGVSNAP\x00"
+SNAPSHOT_VERSION = 1
+PREAMBLE = struct.Struct("<8sIIQ")
+ALIGNMENT = 64
+
+
+class SnapshotError(Exception):
+    """A snapshot file is malformed, from an unsupported version, or corrupt."""
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def manifest_digest(db_path: str) -> Optional[str]:
+    """SHA-256 of a store's ingest manifest, or None if it has never been ingested into."""
+    path = os.path.join(db_path, MANIFEST_FILENAME)
+    if not os.path.exists(path):
+        return None
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _collection_sections(vector_store, collection_name: str, batch_size: int = 1000) -> Dict:
+    """Read one collection's vectors and records from a live store."""
+    ids, documents, metadatas = vector_store.get_documents(collection_name)
+    vectors = []
+    for start in range(0, len(ids), batch_size):
+        rows = vector_store.get_by_ids(ids[start:start + batch_size], collection_name, include_embeddings=True)
+        vectors.extend(row["embedding"] for row in rows)
+
+    matrix = _normalize(np.asarray(vectors, dtype=np.float32)) if vectors else np.zeros((0, 0), dtype=np.float32)
+    records = json.dumps({"ids": ids, "documents": documents, "metadatas": metadatas}).encode("utf-8")
+
+    lexical = b""
+    lexical_path = lexical_index_path(vector_store.db_path, collection_name)
+    if os.path.exists(lexical_path):
+        with open(lexical_path, "rb") as f:
+            lexical = f.read()
+
+    return {
+        "rows": len(ids),
+        "dim": int(matrix.shape[1]) if len(ids) else 0,
+        "space": vector_store.get_space(collection_name),
+        "vectors": np.ascontiguousarray(matrix).tobytes(),
+        "records": records,
+        "lexical": lexical,
+    }
+
+
+def export_snapshot(vector_store, path: str) -> Dict:
+    """
+    Pack every collection of a VectorStore or NumpyVectorStore into one snapshot file.
+
+    Written to a temporary file and renamed into place, so readers never map
+    a half-written snapshot.
+
+    Returns:
+        The snapshot header
+    """
+    started = time.perf_counter()
+    header = {
+        "version": SNAPSHOT_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "model": vector_store.model_name,
+        "source": {
+            "backend": vector_store.get_stats().get("backend"),
+            "db_path": os.path.abspath(vector_store.db_path),
+            "manifest_sha256": manifest_digest(vector_store.db_path),
+        },
+        "collections": {},
+    }
+
+    sections: List[bytes] = []
+    layout = []
+    for name in COLLECTIONS:
+        collection = _collection_sections(vector_store, name)
+        entry = {key: collection[key] for key in ("rows", "dim", "space")}
+        for section in ("vectors", "records", "lexical"):
+            layout.append((entry, section, len(collection[section])))
+            sections.append(collection[section])
+        header["collections"][name] = entry
+
+    # Section offsets are relative to the body, so the header can be sized after them
+    relative = 0
+    relative_offsets = []
+    for _, _, size in layout:
+        relative = _aligned(relative)
+        relative_offsets.append(relative)
+        relative += size
+    body_size = relative
+
+    digest = hashlib.sha256()
+    body = bytearray(body_size)
+    for offset, data in zip(relative_offsets, sections):
+        body[offset:offset + len(data)] = data
+    digest.update(body)
+    header["checksum"] = digest.hexdigest()
+    header["body_size"] = body_size
+
+    for (entry, section, size), offset in zip(layout, relative_offsets):
+        entry[section] = [offset, size]
+    header_bytes = json.dumps(header, sort_keys=True).encode("utf-8")
+    body_offset = _aligned(PREAMBLE.size + len(header_bytes))
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(PREAMBLE.pack(MAGIC, SNAPSHOT_VERSION, 0, len(header_bytes)))
+        f.write(header_bytes)
+        f.write(b"\x00" * (body_offset - PREAMBLE.size - len(header_bytes)))
+        f.write(body)
+    os.replace(tmp_path, path)
+
+    header["size_bytes"] = os.path.getsize(path)
+    header["seconds"] = round(time.perf_counter() - started, 3)
+    return header
+
+
+class SnapshotFile:
+    """A snapshot mapped read-only; section views are zero-copy slices of the map."""
+
+    def __init__(self, path: str, verify: bool = True):
+        """
+        Args:
+            path: Snapshot file
+            verify: Check the body checksum (reads the whole file once)
+
+        Raises:
+            SnapshotError: Bad magic, unsupported version, truncation or checksum mismatch
+        """
+        self.path = path
+        self.buffer = np.memmap(path, dtype=np.uint8, mode="r")
+
+        if len(self.buffer) < PREAMBLE.size:
+            raise SnapshotError(f"{path} is too short to be a snapshot")
+        magic, version, _, header_length = PREAMBLE.unpack(bytes(self.buffer[:PREAMBLE.size]))
+        if magic != MAGIC:
+            raise SnapshotError(f"{path} is not a vector store snapshot")
+        if version != SNAPSHOT_VERSION:
+            raise SnapshotError(f"{path} has snapshot version {version}; this build reads version {SNAPSHOT_VERSION}")
+
+        self.header = json.loads(bytes(self.buffer[PREAMBLE.size:PREAMBLE.size + header_length]))
+        self.body_offset = _aligned(PREAMBLE.size + header_length)
+        if len(self.buffer) - self.body_offset != self.header["body_size"]:
+            raise SnapshotError(f"{path} is truncated or padded: body is not {self.header['body_size']} bytes")
+
+        if verify:
+            self.verify()
+
+    def verify(self):
+        """Recompute the body checksum, raising SnapshotError on a mismatch."""
+        digest = hashlib.sha256()
+        step = 8 << 20
+        for start in range(self.body_offset, len(self.buffer), step):
+            digest.update(memoryview(self.buffer[start:start + step]))
+        if digest.hexdigest() != self.header["checksum"]:
+            raise SnapshotError(f"{self.path} failed its checksum; re-export it")
+
+    def section(self, collection_name: str, name: str) -> np.ndarray:
+        offset, size = self.header["collections"][collection_name][name]
+        start = self.body_offset + offset
+        return self.buffer[start:start + size]
+
+    def vectors(self, collection_name: str) -> Optional[np.ndarray]:
+        entry = self.header["collections"][collection_name]
+        if not entry["rows"]:
+            return None
+        return self.section(collection_name, "vectors").view(np.float32).reshape(entry["rows"], entry["dim"])
+
+    def records(self, collection_name: str) -> Dict:
+        return json.loads(bytes(self.section(collection_name, "records")))
+
+    def lexical_index(self, collection_name: str) -> Optional[BM25Index]:
+        data = self.section(collection_name, "lexical")
+        return BM25Index.load(io.BytesIO(bytes(data))) if len(data) else None
+
+    def is_stale(self, db_path: str) -> bool:
+        """True when the store at db_path has been ingested into since this snapshot was taken."""
+        return manifest_digest(db_path) != self.header["source"]["manifest_sha256"]
+
+
+class _SnapshotCollection(_Collection):
+    """A _Collection backed by views into a mapped snapshot; never written."""
+
+    def __init__(self, snapshot: SnapshotFile, name: str):
+        entry = snapshot.header["collections"].get(name, {"rows": 0, "space": "cosine"})
+        records = snapshot.records(name) if entry["rows"] else {"ids": [], "documents": [], "metadatas": []}
+
+        self.directory = snapshot.path
+        self.name = name
+        self.lock = None
+        self.records_version = None
+        self.space = entry["space"]
+        self.model = snapshot.header["model"]
+        self.generation = 0
+        self.ids = records["ids"]
+        self.documents = records["documents"]
+        self.metadatas = records["metadatas"]
+        self.rows = {doc_id: row for row, doc_id in enumerate(self.ids)}
+        self.matrix = snapshot.vectors(name) if entry["rows"] else None
+        self.partitions = {}
+
+    def refresh(self) -> bool:
+        # The snapshot is immutable; there is no records.json to watch
+        return False
+
+    def _remove_stale_generations(self, keep):
+        pass
+
+    def save(self, *args, **kwargs):
+        raise RuntimeError("Snapshot stores are read-only; ingest into a writable backend and re-export")
+
+
+class SnapshotVectorStore(NumpyVectorStore):
+    """
+    Read-only, NumpyVectorStore-compatible view over a snapshot file.
+
+    Select it with VECTOR_BACKEND=snapshot and VECTOR_SNAPSHOT_PATH. Opening
+    maps the file and parses the records JSON; vectors stay on the map and
+    are paged in by the first queries (or by warm()).
+    """
+
+    def __init__(self, path: str, verify: Optional[bool] = None, cache_query_embeddings: Optional[bool] = None):
+        """
+        Args:
+            path: Snapshot file
+            verify: Check the checksum on open (defaults to Config.VECTOR_SNAPSHOT_VERIFY)
+            cache_query_embeddings: Memoize query embeddings (defaults to Config.QUERY_EMBEDDING_CACHE);
+                kept in memory unless QUERY_EMBEDDING_CACHE_PATH is set, since replicas may mount read-only
+        """
+        self.snapshot = SnapshotFile(path, Config.VECTOR_SNAPSHOT_VERIFY if verify is None else verify)
+        self.db_path = os.path.dirname(os.path.abspath(path))
+        self.embedding_function, self.model_name = default_embedding_function()
+        self.collections = {name: _SnapshotCollection(self.snapshot, name) for name in COLLECTIONS}
+        self._lexical = {name: self.snapshot.lexical_index(name) for name in COLLECTIONS if name in self.snapshot.header["collections"]}
+        self._change_listeners = []
+
+        if self.snapshot.header["model"] != self.model_name:
+            print(
+                f"Warning: snapshot {path} was embedded with {self.snapshot.header['model']} but the current "
+                f"model is {self.model_name}; re-export it"
+            )
+
+        if cache_query_embeddings is None:
+            cache_query_embeddings = Config.QUERY_EMBEDDING_CACHE
+        self.query_embeddings = None
+        if cache_query_embeddings:
+            self.query_embeddings = QueryEmbeddingCache(
+                self.embedding_function, model_name=self.model_name, path=Config.QUERY_EMBEDDING_CACHE_PATH
+            )
+        self.document_embeddings = None
+
+    def lexical_index(self, collection_name: str) -> Optional[BM25Index]:
+        """BM25 index packed into the snapshot, if the source store had one."""
+        return self._lexical.get(collection_name)
+
+    def _read_only(self, *args, **kwargs):
+        raise RuntimeError("Snapshot stores are read-only; ingest into a writable backend and re-export")
+
+    upsert_documents = add_documents = delete_documents = clear_collection = _read_only
+    rebuild_collection = replace_collection = _read_only
+
+    def get_stats(self) -> Dict:
+        """Get statistics about the snapshot and its collections."""
+        stats = super().get_stats()
+        stats["backend"] = "snapshot"
+        stats["snapshot"] = {
+            "path": self.snapshot.path,
+            "version": self.snapshot.header["version"],
+            "created_at": self.snapshot.header["created_at"],
+            "model": self.snapshot.header["model"],
+            "source": self.snapshot.header["source"],
+            "size_bytes": len(self.snapshot.buffer),
+        }
+        return stats
+
+
+def import_snapshot(path: str, vector_store, verify: bool = True) -> Dict:
+    """
+    Load a snapshot into a writable store, replacing its collections.
+
+    Vectors are written as-is (no re-embedding), and any packed BM25 index is
+    restored next to the store.
+
+    Returns:
+        Rows imported per collection and elapsed seconds
+    """
+    started = time.perf_counter()
+    snapshot = SnapshotFile(path, verify)
+    if snapshot.header["model"] != vector_store.model_name:
+        raise SnapshotError(
+            f"Snapshot was embedded with {snapshot.header['model']}, but the store uses {vector_store.model_name}"
+        )
+
+    stats = {"collections": {}}
+    for name, entry in snapshot.header["collections"].items():
+        records = snapshot.records(name)
+        vectors = snapshot.vectors(name)
+        vector_store.replace_collection(
+            name,
+            records["ids"],
+            records["documents"],
+            records["metadatas"],
+            vectors if vectors is not None else np.zeros((0, 0), dtype=np.float32),
+            space=entry["space"],
+        )
+
+        lexical = snapshot.section(name, "lexical")
+        lexical_path = lexical_index_path(vector_store.db_path, name)
+        if len(lexical):
+            os.makedirs(os.path.dirname(lexical_path), exist_ok=True)
+            with open(f"{lexical_path}.tmp", "wb") as f:
+                f.write(bytes(lexical))
+            os.replace(f"{lexical_path}.tmp", lexical_path)
+        stats["collections"][name] = entry["rows"]
+
+    stats["seconds"] = round(time.perf_counter() - started, 3)
+    return stats
+
+
+def main():
+    from src.rag.backends import create_vector_store
+
+    parser = argparse.ArgumentParser(description="Export, import and verify vector store snapshots")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export = commands.add_parser("export", help="Pack a store into a snapshot file")
+    export.add_argument("--backend", default=Config.VECTOR_BACKEND, choices=["chroma", "numpy"])
+    export.add_argument("--db-path", default=None, help="Store path (defaults to the backend's configured path)")
+    export.add_argument("--output", default=Config.VECTOR_SNAPSHOT_PATH or "./snapshots/vectors.snap")
+
+    load = commands.add_parser("import", help="Load a snapshot into a writable store")
+    load.add_argument("path")
+    load.add_argument("--backend", default=Config.VECTOR_BACKEND, choices=["chroma", "numpy"])
+    load.add_argument("--db-path", default=None, help="Store path (defaults to the backend's configured path)")
+
+    verify = commands.add_parser("verify", help="Check a snapshot's header and checksum")
+    verify.add_argument("path")
+    verify.add_argument("--db-path", default=None, help="Also report whether this store changed since the export")
+
+    args = parser.parse_args()
+
+    if args.command == "export":
+        header = export_snapshot(create_vector_store(args.backend, args.db_path), args.output)
+        rows = ", ".join(f"{name} {entry['rows']}" for name, entry in header["collections"].items())
+        print(f"Wrote {args.output}: {rows} rows, {header['size_bytes'] / 1e6:.1f} MB in {header['seconds']}s")
+        return
+
+    if args.command == "import":
+        stats = import_snapshot(args.path, create_vector_store(args.backend, args.db_path))
+        rows = ", ".join(f"{name} {count}" for name, count in stats["collections"].items())
+        print(f"Imported {args.path}: {rows} rows in {stats['seconds']}s")
+        return
+
+    try:
+        snapshot = SnapshotFile(args.path)
+    except SnapshotError as e:
+        print(f"Invalid: {e}")
+        sys.exit(1)
+
+    header = snapshot.header
+    print(f"OK: version {header['version']}, model {header['model']}, created {header['created_at']}")
+    if args.db_path:
+        if snapshot.is_stale(args.db_path):
+            print(f"Stale: {args.db_path} has been ingested into since this snapshot was exported")
+            sys.exit(2)
+        print(f"Current with {args.db_path}")
+
+
+if __name__ == "__main__":
+    main()
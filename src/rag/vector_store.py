@@ -1,15 +1,57 @@
+import os
+import time
 import chromadb
-from typing import List, Dict
+import numpy as np
+from chromadb.utils import embedding_functions
+from typing import Callable, List, Dict, Optional, Sequence, Set, Tuple
 from src.rag.document_loader import Document
+from src.rag.embeddings import DEFAULT_EMBEDDING_MODEL, DocumentEmbeddingCache, QueryEmbeddingCache
+from src.utils.config import Config
 
 
 class VectorStore:
     """Manage ChromaDB vector store for RAG."""
 
-    def __init__(self, db_path: str = "./chroma_db"):
+    def __init__(
+        self,
+        db_path: str = "./chroma_db",
+        cache_query_embeddings: Optional[bool] = None,
+        cache_document_embeddings: Optional[bool] = None,
+    ):
+        """
+        Args:
+            db_path: Chroma persistence directory
+            cache_query_embeddings: Memoize query embeddings on disk (defaults to Config.QUERY_EMBEDDING_CACHE)
+            cache_document_embeddings: Reuse chunk embeddings across rebuilds (defaults to Config.DOC_EMBEDDING_CACHE)
+        """
         self.db_path = db_path
+        self.model_name = DEFAULT_EMBEDDING_MODEL
         self.client = chromadb.PersistentClient(path=db_path)
 
+        if cache_query_embeddings is None:
+            cache_query_embeddings = Config.QUERY_EMBEDDING_CACHE
+
+        # Same model the collections embed documents with, so cached query
+        # vectors land in the same space
+        self.query_embeddings = None
+        if cache_query_embeddings:
+            self.query_embeddings = QueryEmbeddingCache(
+                embedding_functions.DefaultEmbeddingFunction(),
+                model_name=DEFAULT_EMBEDDING_MODEL,
+                path=Config.QUERY_EMBEDDING_CACHE_PATH or os.path.join(db_path, "query_embeddings.sqlite3"),
+            )
+
+        if cache_document_embeddings is None:
+            cache_document_embeddings = Config.DOC_EMBEDDING_CACHE
+
+        self.document_embeddings = None
+        if cache_document_embeddings:
+            self.document_embeddings = DocumentEmbeddingCache(
+                embedding_functions.DefaultEmbeddingFunction(),
+                model_name=DEFAULT_EMBEDDING_MODEL,
+                directory=Config.DOC_EMBEDDING_CACHE_DIR or os.path.join(db_path, "embedding_cache"),
+            )
+
         self.knowledge_collection = self.client.get_or_create_collection(
             name="stoic_knowledge",
             metadata={"hnsw:space": "cosine"},
@@ -20,45 +62,147 @@ class VectorStore:
             metadata={"hnsw:space": "cosine"},
         )
 
-    def add_documents(self, documents: List[Document], collection_name: str = "stoic_knowledge"):
-        """Add documents to the vector store."""
-        collection = (
+        self._change_listeners: List[Callable[[str], None]] = []
+
+    def add_change_listener(self, callback: Callable[[str], None]):
+        """Register a callback run with the collection name after every write."""
+        self._change_listeners.append(callback)
+
+    def _notify_change(self, collection_name: str):
+        for callback in self._change_listeners:
+            callback(collection_name)
+
+    def _collection(self, collection_name: str):
+        return (
             self.knowledge_collection
             if collection_name == "stoic_knowledge"
             else self.style_collection
         )
 
-        ids = []
-        contents = []
-        metadatas = []
+    def add_documents(self, documents: List[Document], collection_name: str = "stoic_knowledge"):
+        """Add documents to the vector store, keyed by their stable doc_id."""
+        self.upsert_documents(documents, collection_name)
 
-        for i, doc in enumerate(documents):
-            doc_id = f"{doc.metadata.get('source_path', 'unknown')}_{i}"
-            ids.append(doc_id)
-            contents.append(doc.content)
-            metadatas.append(doc.metadata)
+        print(f"Added {len(documents)} documents to {collection_name}")
 
-        collection.add(ids=ids, documents=contents, metadatas=metadatas)
+    def upsert_documents(self, documents: List[Document], collection_name: str = "stoic_knowledge"):
+        """Insert or replace documents by doc_id; re-adding a chunk never duplicates it."""
+        if not documents:
+            return
 
-        print(f"Added {len(documents)} documents to {collection_name}")
+        # A batch may repeat a chunk (identical file content); keep one copy per ID
+        unique = {doc.doc_id: doc for doc in documents}
+        self._upsert(
+            collection_name,
+            ids=list(unique.keys()),
+            contents=[doc.content for doc in unique.values()],
+            metadatas=[doc.metadata for doc in unique.values()],
+        )
+        self._notify_change(collection_name)
+
+    def _upsert(self, collection_name: str, ids: List[str], contents: List[str], metadatas: List[Dict]):
+        """Upsert raw rows, taking embeddings from the document cache when enabled."""
+        kwargs = {"ids": ids, "documents": contents, "metadatas": metadatas}
+        if self.document_embeddings is not None:
+            kwargs["embeddings"] = self.document_embeddings.embed(contents)
+        self._collection(collection_name).upsert(**kwargs)
+
+    def get_documents(self, collection_name: str = "stoic_knowledge", batch_size: int = 1000) -> Tuple[List[str], List[str], List[Dict]]:
+        """Get (ids, documents, metadatas) for every document in a collection."""
+        collection = self._collection(collection_name)
+        ids, contents, metadatas = [], [], []
+        for offset in range(0, collection.count(), batch_size):
+            page = collection.get(include=["documents", "metadatas"], limit=batch_size, offset=offset)
+            ids.extend(page["ids"])
+            contents.extend(page["documents"])
+            metadatas.extend(page["metadatas"])
+        return ids, contents, metadatas
+
+    def get_by_ids(self, ids: List[str], collection_name: str = "stoic_knowledge", include_embeddings: bool = False) -> List[Dict]:
+        """Get documents by ID as query-style results (distance None), in the order given."""
+        if not ids:
+            return []
+        include = ["documents", "metadatas", "embeddings"] if include_embeddings else ["documents", "metadatas"]
+        page = self._collection(collection_name).get(ids=ids, include=include)
+        found = {}
+        for i, doc_id in enumerate(page["ids"]):
+            found[doc_id] = {"id": doc_id, "content": page["documents"][i], "metadata": page["metadatas"][i], "distance": None}
+            if include_embeddings:
+                found[doc_id]["embedding"] = np.asarray(page["embeddings"][i], dtype=np.float32)
+        return [found[doc_id] for doc_id in ids if doc_id in found]
+
+    def count(self, collection_name: str = "stoic_knowledge") -> int:
+        """Number of documents in a collection."""
+        return self._collection(collection_name).count()
+
+    def existing_ids(self, ids: List[str], collection_name: str = "stoic_knowledge") -> Set[str]:
+        """Return which of ids are already stored."""
+        if not ids:
+            return set()
+        return set(self._collection(collection_name).get(ids=ids, include=[])["ids"])
+
+    def delete_documents(self, ids: List[str], collection_name: str = "stoic_knowledge"):
+        """Delete documents by ID."""
+        if not ids:
+            return
+
+        self._collection(collection_name).delete(ids=ids)
+        self._notify_change(collection_name)
+
+    def embed_queries(self, texts: List[str]) -> List[Sequence[float]]:
+        """
+        Embed query texts, through the query-embedding cache when enabled.
+
+        Use this to precompute embeddings (e.g. for a fixed topic list) and
+        pass them to query() as query_embedding.
+        """
+        if self.query_embeddings is not None:
+            return self.query_embeddings.embed(texts)
+        return embedding_functions.DefaultEmbeddingFunction()(texts)
 
     def query(
-        self, query_text: str, k: int = 3, collection_name: str = "stoic_knowledge"
+        self,
+        query_text: Optional[str] = None,
+        k: int = 3,
+        collection_name: str = "stoic_knowledge",
+        query_embedding: Optional[Sequence[float]] = None,
+        where: Optional[Dict] = None,
+        include_embeddings: bool = False,
     ) -> List[Dict]:
-        """Query the vector store."""
-        collection = (
-            self.knowledge_collection
-            if collection_name == "stoic_knowledge"
-            else self.style_collection
-        )
+        """
+        Query the vector store.
+
+        Args:
+            query_text: Text to search for (embedded via the query cache)
+            k: Number of results
+            collection_name: Collection to search
+            query_embedding: Precomputed query vector; skips embedding query_text
+            where: Chroma metadata filter, e.g. {"virtue_courage": True}
+            include_embeddings: Add each result's stored vector as "embedding"
+        """
+        collection = self._collection(collection_name)
+
+        if query_embedding is None and query_text is None:
+            raise ValueError("query requires query_text or query_embedding")
+
+        if query_embedding is None and self.query_embeddings is not None:
+            query_embedding = self.query_embeddings.embed_one(query_text)
 
-        results = collection.query(query_texts=[query_text], n_results=k)
+        include = ["documents", "metadatas", "distances"]
+        if include_embeddings:
+            include.append("embeddings")
+
+        if query_embedding is not None:
+            results = collection.query(query_embeddings=[query_embedding], n_results=k, where=where, include=include)
+        else:
+            results = collection.query(query_texts=[query_text], n_results=k, where=where, include=include)
 
         retrieved = []
         if results["documents"] and len(results["documents"]) > 0:
             for i, doc in enumerate(results["documents"][0]):
                 retrieved.append(
                     {
+                        "id": results["ids"][0][i],
                         "content": doc,
                         "metadata": results["metadatas"][0][i],
                         "distance": results["distances"][0][i]
@@ -66,27 +210,121 @@ class VectorStore:
                         else None,
                     }
                 )
+                if include_embeddings:
+                    retrieved[-1]["embedding"] = np.asarray(results["embeddings"][0][i], dtype=np.float32)
 
         return retrieved
 
-    def clear_collection(self, collection_name: str = "stoic_knowledge"):
-        """Clear a collection."""
+    def _recreate_collection(self, collection_name: str, space: str = "cosine"):
+        self.client.delete_collection(name=collection_name)
+        collection = self.client.get_or_create_collection(
+            name=collection_name,
+            metadata={"hnsw:space": space},
+        )
         if collection_name == "stoic_knowledge":
-            self.client.delete_collection(name="stoic_knowledge")
-            self.knowledge_collection = self.client.get_or_create_collection(
-                name="stoic_knowledge",
-                metadata={"hnsw:space": "cosine"},
-            )
+            self.knowledge_collection = collection
         else:
-            self.client.delete_collection(name="style_examples")
-            self.style_collection = self.client.get_or_create_collection(
-                name="style_examples",
-                metadata={"hnsw:space": "cosine"},
+            self.style_collection = collection
+
+    def get_space(self, collection_name: str = "stoic_knowledge") -> str:
+        """Distance space of a collection's HNSW index."""
+        return (self._collection(collection_name).metadata or {}).get("hnsw:space", "l2")
+
+    def clear_collection(self, collection_name: str = "stoic_knowledge"):
+        """Clear a collection."""
+        self._recreate_collection(collection_name)
+        self._notify_change(collection_name)
+
+    def replace_collection(
+        self,
+        collection_name: str,
+        ids: List[str],
+        contents: List[str],
+        metadatas: List[Dict],
+        embeddings: np.ndarray,
+        space: str = "cosine",
+        batch_size: int = 1000,
+    ):
+        """Replace a collection's contents with precomputed embeddings (e.g. from a snapshot)."""
+        self._recreate_collection(collection_name, space)
+        collection = self._collection(collection_name)
+        for start in range(0, len(ids), batch_size):
+            end = start + batch_size
+            collection.upsert(
+                ids=ids[start:end],
+                documents=contents[start:end],
+                metadatas=metadatas[start:end],
+                embeddings=np.asarray(embeddings[start:end], dtype=np.float32),
             )
+        self._notify_change(collection_name)
+
+    def rebuild_collection(
+        self,
+        collection_name: str = "stoic_knowledge",
+        space: str = "cosine",
+        batch_size: int = 256,
+    ) -> Dict:
+        """
+        Drop and recreate a collection from its own contents.
+
+        Use to switch the HNSW distance space or compact the index. IDs,
+        documents and metadata are kept; embeddings come from the document
+        embedding cache, so only chunks it has never seen are re-embedded.
+
+        Returns:
+            Document count, elapsed seconds and document cache hits/misses
+        """
+        started = time.perf_counter()
+
+        # Read everything first: the collection is gone once it's recreated
+        ids, contents, metadatas = self.get_documents(collection_name, batch_size)
+
+        before = self.document_embeddings.get_stats() if self.document_embeddings else None
+        self._recreate_collection(collection_name, space)
+        for start in range(0, len(ids), batch_size):
+            end = start + batch_size
+            self._upsert(collection_name, ids[start:end], contents[start:end], metadatas[start:end])
+        self._notify_change(collection_name)
+
+        stats = {
+            "collection": collection_name,
+            "space": space,
+            "documents": len(ids),
+            "seconds": round(time.perf_counter() - started, 2),
+        }
+        if before is not None:
+            after = self.document_embeddings.get_stats()
+            stats["embedding_cache_hits"] = after["hits"] - before["hits"]
+            stats["embedding_cache_misses"] = after["misses"] - before["misses"]
+        return stats
+
+    def warm(self):
+        """Load the embedding model and collection indexes ahead of the first query."""
+        if self.query_embeddings is not None:
+            # Cached embeddings would skip inference, so load the model explicitly
+            self.query_embeddings.embedding_function(["stoic wisdom"])
+
+        for collection_name, collection in (
+            ("stoic_knowledge", self.knowledge_collection),
+            ("style_examples", self.style_collection),
+        ):
+            if collection.count() > 0:
+                self.query("stoic wisdom", k=1, collection_name=collection_name)
+
+    def close(self):
+        """Release the query-embedding cache's SQLite handle."""
+        if self.query_embeddings is not None:
+            self.query_embeddings.close()
 
     def get_stats(self) -> Dict:
         """Get statistics about the vector store."""
-        return {
+        stats = {
+            "backend": "chroma",
             "knowledge_documents": self.knowledge_collection.count(),
             "style_examples": self.style_collection.count(),
         }
+        if self.query_embeddings is not None:
+            stats["query_embedding_cache"] = self.query_embeddings.get_stats()
+        if self.document_embeddings is not None:
+            stats["document_embedding_cache"] = self.document_embeddings.get_stats()
+        return stats
@@ -0,0 +1,87 @@
+"""Rule-based tagging of knowledge chunks by cardinal virtue.
+
+Each chunk gets a boolean metadata flag per virtue it discusses
+("virtue_courage": True, ...) plus a "virtue" field naming the strongest one,
+or "general" when no virtue stands out. Flags rather than a list keep the
+tags filterable with a plain equality `where` in both vector backends.
+"""
+
+import re
+from typing import Dict, List, Optional
+
+# Bump when the keyword lists change so ingest re-tags existing chunks
+TAGGER_VERSION = 1
+
+CARDINAL_VIRTUES = ("wisdom", "courage", "justice", "temperance")
+
+VIRTUE_KEYWORDS = {
+    "wisdom": (
+        "wisdom", "wise", "reason", "judgment", "judgement", "knowledge", "understanding", "perception",
+        "impression", "impressions", "assent", "opinion", "truth", "philosophy", "prudence", "sophia",
+        "dichotomy of control", "logos", "discern", "learn", "study",
+    ),
+    "courage": (
+        "courage", "courageous", "brave", "bravery", "fear", "fears", "afraid", "adversity", "hardship",
+        "obstacle", "obstacles", "endure", "endurance", "resilience", "death", "memento mori", "pain",
+        "suffering", "danger", "fortitude", "persevere", "perseverance", "amor fati", "premeditatio malorum",
+    ),
+    "justice": (
+        "justice", "just", "fairness", "fair", "duty", "duties", "others", "community", "society",
+        "kindness", "kind", "honesty", "honest", "service", "common good", "citizen", "cosmopolis",
+        "sympatheia", "oikeiosis", "humanity", "neighbor", "neighbour", "benevolence",
+    ),
+    "temperance": (
+        "temperance", "moderation", "moderate", "self-control", "restraint", "discipline", "desire",
+        "desires", "pleasure", "pleasures", "appetite", "excess", "indulgence", "simplicity", "frugal",
+        "anger", "patience", "calm", "enough", "luxury", "habit", "habits",
+    ),
+}
+
+_PATTERNS = {
+    virtue: re.compile(r"\b(?:" + "|".join(re.escape(k) for k in sorted(keywords, key=len, reverse=True)) + r")\b")
+    for virtue, keywords in VIRTUE_KEYWORDS.items()
+}
+
+
+def virtue_flag(virtue: str) -> str:
+    """Metadata key marking a chunk as relevant to virtue."""
+    return f"virtue_{virtue}"
+
+
+def virtue_filter(virtue: Optional[str]) -> Optional[Dict]:
+    """Metadata `where` filter for a virtue, or None for no filter ("general" or None)."""
+    if virtue not in CARDINAL_VIRTUES:
+        return None
+    return {virtue_flag(virtue): True}
+
+
+def score_virtues(text: str) -> Dict[str, int]:
+    """Keyword hit counts per cardinal virtue."""
+    lowered = text.lower()
+    return {virtue: len(pattern.findall(lowered)) for virtue, pattern in _PATTERNS.items()}
+
+
+def tag_virtues(text: str, min_hits: int = 2) -> Dict:
+    """
+    Virtue metadata for a chunk.
+
+    Args:
+        text: Chunk content
+        min_hits: Keyword hits a virtue needs to be tagged
+
+    Returns:
+        {"virtue": primary virtue or "general", "virtue_<name>": bool for each cardinal virtue}
+    """
+    scores = score_virtues(text)
+    tagged = [virtue for virtue in CARDINAL_VIRTUES if scores[virtue] >= min_hits]
+    primary = max(tagged, key=lambda virtue: scores[virtue]) if tagged else "general"
+
+    metadata = {"virtue": primary}
+    for virtue in CARDINAL_VIRTUES:
+        metadata[virtue_flag(virtue)] = virtue in tagged
+    return metadata
+
+
+def tagged_virtues(metadata: Dict) -> List[str]:
+    """Cardinal virtues a chunk's metadata is flagged with."""
+    return [virtue for virtue in CARDINAL_VIRTUES if metadata.get(virtue_flag(virtue))]
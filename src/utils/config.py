@@ -10,6 +10,8 @@ class Config:
     # API Keys
     ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY")
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+    ANTHROPIC_BASE_URL = os.getenv("ANTHROPIC_BASE_URL")
+    ANTHROPIC_PROMPT_CACHING = os.getenv("ANTHROPIC_PROMPT_CACHING", "true").lower() == "true"
     TWITTERAPI_IO_KEY = os.getenv("TWITTERAPI_IO_KEY")
 
     # X OAuth2 credentials
@@ -23,17 +25,34 @@ class Config:
     EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "text-embedding-3-small")
 
     # RAG Configuration
-    CHROMA_DB_PATH = "./chroma_db"
-    CHUNK_SIZE = 800
-    CHUNK_OVERLAP = 100
+    VECTOR_BACKEND = os.getenv("VECTOR_BACKEND", "chroma")  # chroma | numpy | snapshot
+    CHROMA_DB_PATH = os.getenv("CHROMA_PERSIST_PATH", "./chroma_db")
+    NUMPY_STORE_PATH = os.getenv("NUMPY_STORE_PATH", "./vector_store")
+    VECTOR_SNAPSHOT_PATH = os.getenv("VECTOR_SNAPSHOT_PATH", "")  # packed snapshot served by VECTOR_BACKEND=snapshot
+    VECTOR_SNAPSHOT_VERIFY = os.getenv("VECTOR_SNAPSHOT_VERIFY", "true").lower() == "true"
+    RAG_WARMUP = os.getenv("RAG_WARMUP", "true").lower() == "true"
+    # Chunk sizes are in tokens, so retrieved context has a predictable prompt cost
+    CHUNK_SIZE = int(os.getenv("CHUNK_SIZE", "200"))
+    CHUNK_OVERLAP = int(os.getenv("CHUNK_OVERLAP", "30"))
     RETRIEVAL_K = 3
+    RETRIEVAL_MODE = os.getenv("RETRIEVAL_MODE", "hybrid")  # vector | bm25 | hybrid
+    RRF_K = int(os.getenv("RRF_K", "60"))
+    RETRIEVAL_MMR = os.getenv("RETRIEVAL_MMR", "false").lower() == "true"
+    MMR_LAMBDA = float(os.getenv("MMR_LAMBDA", "0.7"))  # 1.0 = relevance only, 0.0 = diversity only
+    MMR_FETCH_K = int(os.getenv("MMR_FETCH_K", "20"))
+    RETRIEVAL_CACHE_SIZE = int(os.getenv("RETRIEVAL_CACHE_SIZE", "512"))
+    RETRIEVAL_CACHE_TTL_SECONDS = int(os.getenv("RETRIEVAL_CACHE_TTL_SECONDS", "3600"))
+    QUERY_EMBEDDING_CACHE = os.getenv("QUERY_EMBEDDING_CACHE", "true").lower() == "true"
+    QUERY_EMBEDDING_CACHE_PATH = os.getenv("QUERY_EMBEDDING_CACHE_PATH", "")
+    DOC_EMBEDDING_CACHE = os.getenv("DOC_EMBEDDING_CACHE", "true").lower() == "true"
+    DOC_EMBEDDING_CACHE_DIR = os.getenv("DOC_EMBEDDING_CACHE_DIR", "")
     STYLE_EXAMPLES_K = 2
 
     # Generation parameters
     BLOG_MAX_TOKENS = 2000
     TWEET_MAX_TOKENS = 280
     BLOG_TEMPERATURE = 0.7
-    SOCIAL_TEMPERATURE = 0.8
+    SOCIAL_TEMPERATURE = float(os.getenv("SOCIAL_TEMPERATURE", "0.8"))
 
     # Tweet format weights (70/20/10 engagement strategy)
     POST_FORMAT_WEIGHTS = {
@@ -47,6 +66,59 @@ class Config:
     THREAD_MAX_TOKENS = 2000
     LONG_MAX_TOKENS = 2000
 
+    # Suggestion variants for /chat/suggest (type -> refine instruction)
+    SUGGESTION_TYPES = {
+        "hook": "Suggest a more engaging hook for this stoic post",
+        "clarity": "Suggest how to make this clearer and more accessible",
+        "action": "Suggest an actionable takeaway to add",
+    }
+    SUGGEST_CONCURRENCY = int(os.getenv("SUGGEST_CONCURRENCY", "4"))
+    SUGGEST_TIMEOUT_SECONDS = float(os.getenv("SUGGEST_TIMEOUT_SECONDS", "20"))
+
+    # LLM routing: requested provider first, hedge to the other after the latency percentile, fail over on errors
+    LLM_DEFAULT_PROVIDER = os.getenv("LLM_DEFAULT_PROVIDER", "gpt4")
+    LLM_HEDGING = os.getenv("LLM_HEDGING", "true").lower() == "true"
+    LLM_HEDGE_PERCENTILE = float(os.getenv("LLM_HEDGE_PERCENTILE", "95"))
+    LLM_HEDGE_MIN_SAMPLES = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20"))
+    LLM_HEDGE_INITIAL_DELAY_SECONDS = float(os.getenv("LLM_HEDGE_INITIAL_DELAY_SECONDS", "10"))
+
+    # LLM call resilience: retries with backoff on 429/5xx, per-provider circuit breaker
+    LLM_REQUEST_TIMEOUT_SECONDS = float(os.getenv("LLM_REQUEST_TIMEOUT_SECONDS", "60"))
+    LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "3"))
+    LLM_RETRY_BASE_DELAY_SECONDS = float(os.getenv("LLM_RETRY_BASE_DELAY_SECONDS", "0.5"))
+    LLM_RETRY_MAX_DELAY_SECONDS = float(os.getenv("LLM_RETRY_MAX_DELAY_SECONDS", "8"))
+    LLM_RETRY_AFTER_MAX_SECONDS = float(os.getenv("LLM_RETRY_AFTER_MAX_SECONDS", "30"))
+    LLM_BREAKER_FAILURE_THRESHOLD = int(os.getenv("LLM_BREAKER_FAILURE_THRESHOLD", "5"))
+    LLM_BREAKER_RESET_SECONDS = float(os.getenv("LLM_BREAKER_RESET_SECONDS", "30"))
+
+    # Client-side RPM/TPM limits: "provider[:model]=requests/tokens per minute", comma separated
+    LLM_RATE_LIMITS = os.getenv("LLM_RATE_LIMITS", "openai=500/30000,anthropic=50/40000")
+    LLM_RATE_LIMIT_BURST_SECONDS = float(os.getenv("LLM_RATE_LIMIT_BURST_SECONDS", "10"))
+
+    # LLM response cache (opt-in): refine/suggest (run at temperature 0 while on), generate only with LLM_RESPONSE_CACHE_GENERATE at temperature 0
+    LLM_RESPONSE_CACHE = os.getenv("LLM_RESPONSE_CACHE", "false").lower() == "true"
+    LLM_RESPONSE_CACHE_BACKEND = os.getenv("LLM_RESPONSE_CACHE_BACKEND", "memory")
+    LLM_RESPONSE_CACHE_PATH = os.getenv("LLM_RESPONSE_CACHE_PATH", "./data/processed/llm_responses.sqlite3")
+    LLM_RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("LLM_RESPONSE_CACHE_MAX_ENTRIES", "1024"))
+    LLM_RESPONSE_CACHE_TTL_SECONDS = float(os.getenv("LLM_RESPONSE_CACHE_TTL_SECONDS", str(24 * 60 * 60)))
+    LLM_RESPONSE_CACHE_GENERATE = os.getenv("LLM_RESPONSE_CACHE_GENERATE", "false").lower() == "true"
+
+    # Per-call LLM ledger: recent calls in memory, optionally every call appended to a JSONL file
+    LLM_LEDGER_SIZE = int(os.getenv("LLM_LEDGER_SIZE", "1000"))
+    LLM_LEDGER_PATH = os.getenv("LLM_LEDGER_PATH", "")
+
+    # Batch generation
+    BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "8"))
+    BATCH_MAX_COUNT = 50
+
+    # Draft pool (pre-generated drafts served by /generate)
+    DRAFT_POOL_ENABLED = os.getenv("DRAFT_POOL_ENABLED", "false").lower() == "true"
+    DRAFT_POOL_TARGET_SIZE = int(os.getenv("DRAFT_POOL_TARGET_SIZE", "3"))
+    DRAFT_POOL_LOW_WATERMARK = int(os.getenv("DRAFT_POOL_LOW_WATERMARK", "2"))
+    DRAFT_POOL_TTL_SECONDS = int(os.getenv("DRAFT_POOL_TTL_SECONDS", str(6 * 60 * 60)))
+    DRAFT_POOL_CONCURRENCY = int(os.getenv("DRAFT_POOL_CONCURRENCY", "2"))
+    DRAFT_POOL_REFILL_INTERVAL = 60
+
     # Scheduler Configuration
     SCHEDULE_ENABLED = os.getenv("SCHEDULE_ENABLED", "true").lower() == "true"
     SCHEDULE_INTERVALS = [int(x) for x in os.getenv("SCHEDULE_INTERVALS", "45,60,90,120").split(",")]
@@ -54,9 +126,10 @@ class Config:
     SCHEDULE_BLACKOUT_END = os.getenv("SCHEDULE_BLACKOUT_END", "05:00")
     SCHEDULE_TIMEZONE = os.getenv("SCHEDULE_TIMEZONE", "America/New_York")
 
-    # Data paths
-    DATA_RAW_DIR = "./data/raw"
-    STYLE_EXAMPLES_DIR = "./data/style_examples"
+    # Data paths; the corpus directories are what `python -m src.rag.ingest` syncs
+    DATA_RAW_DIR = os.getenv("KNOWLEDGE_DIR", "./data/raw")
+    KNOWLEDGE_DIR = DATA_RAW_DIR
+    STYLE_EXAMPLES_DIR = os.getenv("STYLE_EXAMPLES_DIR", "./data/style_examples")
     PROCESSED_DIR = "./data/processed"
 
     # Stoic virtues
@@ -0,0 +1,39 @@
+"""Token counting helpers.
+
+Uses tiktoken when it is installed; otherwise falls back to a character
+heuristic (~4 characters per token for English) that is close enough for
+budgeting prompts and chunks.
+"""
+
+import re
+from functools import lru_cache
+
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    tiktoken = None
+    TIKTOKEN_AVAILABLE = False
+
+DEFAULT_ENCODING = "cl100k_base"
+_WORD_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+
+@lru_cache(maxsize=8)
+def _get_encoding(name: str):
+    return tiktoken.get_encoding(name)
+
+
+def count_tokens(text: str, encoding: str = DEFAULT_ENCODING) -> int:
+    """Count (or estimate, without tiktoken) the tokens in text."""
+    if not text:
+        return 0
+
+    if TIKTOKEN_AVAILABLE:
+        try:
+            return len(_get_encoding(encoding).encode(text))
+        except Exception:
+            pass
+
+    # Heuristic: the larger of ~4 chars/token and one token per word/punctuation mark
+    return max(len(text) // 4, len(_WORD_PATTERN.findall(text)))
@@ -0,0 +1,130 @@
+"""Deterministic synthetic stoic corpus and labelled query set for the retrieval benchmark.
+
+Every generator topic (VIRTUE_TOPICS) gets one target file whose passages
+discuss it in stoic language; distractor files are built from the same
+sentence pool without any topic's key terms. Queries are the topics
+themselves (what generate() searches with) plus reply-like texts that
+mention a topic's key terms informally, as when replying to a tweet.
+Relevant chunks for a query are the chunks of its topic's target file.
+"""
+
+import random
+import re
+from pathlib import Path
+from typing import Dict, List
+
+from src.generators.twitter_generator import VIRTUE_TOPICS
+from src.rag.bm25 import STOPWORDS
+
+SENTENCES = [
+    "The obstacle in the path becomes the path.",
+    "We suffer more often in imagination than in reality.",
+    "No person is free who is not master of themselves.",
+    "It is not things that disturb us, but our judgments about things.",
+    "The best revenge is not to be like the one who wronged you.",
+    "Waste no more time arguing what a good person should be; be one.",
+    "Luck is what happens when preparation meets opportunity.",
+    "He who fears death will never do anything worthy of a living person.",
+    "First say to yourself what you would be, and then do what you have to do.",
+    "Difficulties strengthen the mind, as labour does the body.",
+    "Begin at once to live, and count each separate day as a separate life.",
+    "How long are you going to wait before you demand the best for yourself?",
+    "The happiness of your life depends upon the quality of your thoughts.",
+    "Wealth consists not in having great possessions, but in having few wants.",
+    "A gem cannot be polished without friction, nor a person perfected without trials.",
+    "What we do now echoes in eternity.",
+    "Man conquers the world by conquering himself.",
+    "If it is not right, do not do it; if it is not true, do not say it.",
+    "Receive without pride, let go without attachment.",
+    "Very little is needed to make a happy life.",
+    "Each morning rehearse the day ahead and the people you will meet.",
+    "Evening reflection asks what went well and what could be done better.",
+    "Seneca wrote letters to Lucilius about how to spend time well.",
+    "Epictetus taught as a freed slave in Nicopolis.",
+    "Marcus Aurelius wrote his meditations on campaign along the Danube.",
+]
+
+TOPIC_TEMPLATES = [
+    "The Stoics return again and again to {a} and {b}.",
+    "Epictetus would say that {a} begins with how we use our impressions of {b}.",
+    "Seneca's letters treat {a} as a daily practice rather than a theory of {b}.",
+    "Marcus reminds himself each morning that {a} shapes {b}.",
+    "To practise {a} is to train the mind before {b} tests it.",
+]
+
+REPLY_TEMPLATES = [
+    "honestly struggling with {a} lately, any advice on {b}?",
+    "this is so true. {a} is the hardest part of {b} for me",
+    "how do you keep {a} when everything around you ignores {b}?",
+]
+
+DISTRACTOR_TITLES = ["Letters", "Discourses", "Notes", "Meditations", "Reflections", "Fragments", "Commentary"]
+
+
+def key_terms(topic: str) -> List[str]:
+    """Content words of a topic, e.g. "moderation with technology" -> ["moderation", "technology"]."""
+    return [w for w in re.findall(r"[a-z]+", topic.lower()) if w not in STOPWORDS and len(w) > 2]
+
+
+def slug(topic: str) -> str:
+    return "-".join(re.findall(r"[a-z]+", topic.lower()))
+
+
+def _pair(terms: List[str], rng: random.Random) -> Dict[str, str]:
+    if len(terms) == 1:
+        return {"a": terms[0], "b": terms[0]}
+    a, b = rng.sample(terms, 2)
+    return {"a": a, "b": b}
+
+
+def write_corpus(directory: Path, distractors: int = 300, paragraphs: int = 4, seed: int = 19) -> Dict[str, str]:
+    """
+    Write target and distractor markdown files.
+
+    Returns:
+        {topic: source_path of its target file}
+    """
+    rng = random.Random(seed)
+    targets = {}
+
+    for virtue, topics in VIRTUE_TOPICS.items():
+        for topic in topics:
+            terms = key_terms(topic)
+            parts = [f"# On {topic}"]
+            for _ in range(2):
+                lines = [rng.choice(TOPIC_TEMPLATES).format(**_pair(terms, rng)) for _ in range(2)]
+                lines += rng.sample(SENTENCES, 3)
+                rng.shuffle(lines)
+                parts.append(" ".join(lines))
+
+            source_path = f"topics/{virtue}/{slug(topic)}.md"
+            path = directory / source_path
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text("\n\n".join(parts), encoding="utf-8")
+            targets[topic] = source_path
+
+    for i in range(distractors):
+        parts = [f"# {rng.choice(DISTRACTOR_TITLES)} {i}"]
+        parts += [" ".join(rng.sample(SENTENCES, rng.randint(3, 6))) for _ in range(paragraphs)]
+        path = directory / "distractors" / f"{i:04d}.md"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("\n\n".join(parts), encoding="utf-8")
+
+    return targets
+
+
+def build_queries(targets: Dict[str, str], seed: int = 23) -> List[Dict]:
+    """
+    Labelled queries: each topic verbatim plus one reply-like text per topic.
+
+    Returns:
+        [{"query", "kind": "topic" | "reply", "virtue", "relevant_source"}]
+    """
+    rng = random.Random(seed)
+    queries = []
+    for virtue, topics in VIRTUE_TOPICS.items():
+        for topic in topics:
+            queries.append({"query": topic, "kind": "topic", "virtue": virtue, "relevant_source": targets[topic]})
+            reply = rng.choice(REPLY_TEMPLATES).format(**_pair(key_terms(topic), rng))
+            queries.append({"query": reply, "kind": "reply", "virtue": virtue, "relevant_source": targets[topic]})
+    return queries
@@ -0,0 +1,295 @@
+"""Retrieval quality and latency benchmark.
+
+Builds the synthetic stoic corpus from tests/bench/corpus.py and ingests it
+into each vector backend through CorpusIngestor (chunking, virtue tagging,
+BM25 index). Then it runs the labelled query set through
+Retriever.retrieve_knowledge under every setting: mode x MMR x virtue filter.
+
+Chunk embeddings are computed once into a shared cache before any backend is
+built, so build time measures indexing rather than the embedding model; the
+one-off embedding time is reported separately. The result cache is disabled
+and query embeddings are warmed, so latencies measure retrieval itself.
+
+Output is one JSON document with run metadata (git commit, timestamp,
+versions), per-backend build time, peak Python heap, RSS growth and on-disk
+size, and per-setting p50/p95 latency and recall@k. Save runs with --output
+and compare against an earlier file with --baseline.
+
+Usage:
+    python -m tests.bench.retrieval                                  # JSON to stdout
+    python -m tests.bench.retrieval --output bench-results/$(date +%F).json
+    python -m tests.bench.retrieval --backends numpy --modes hybrid --baseline bench-results/2026-10-01.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from src.rag.backends import backend_available, create_vector_store
+from src.rag.document_loader import DocumentLoader
+from src.rag.ingest import CorpusIngestor
+from src.rag.retriever import RETRIEVAL_MODES, Retriever
+from src.utils.config import Config
+from tests.bench.corpus import build_queries, write_corpus
+
+COLLECTION = "stoic_knowledge"
+
+
+def _percentile(timings: List[float], pct: float) -> float:
+    ordered = sorted(timings)
+    return round(ordered[min(len(ordered) - 1, int(len(ordered) * pct))], 3)
+
+
+def _rss_mb() -> Optional[float]:
+    """Current resident set size, where /proc is available."""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 1e6
+    except (OSError, ValueError):
+        return None
+
+
+def _disk_mb(path: str) -> float:
+    total = sum(f.stat().st_size for f in Path(path).rglob("*") if f.is_file())
+    return round(total / 1e6, 2)
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def build_backend(backend: str, corpus_dir: str, db_path: str) -> Dict:
+    """Ingest the corpus into a fresh store, measuring time and memory."""
+    rss_before = _rss_mb()
+    tracemalloc.start()
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        store = create_vector_store(backend, db_path)
+        stats = CorpusIngestor(store, workers=1).ingest_directory(corpus_dir, COLLECTION)
+    seconds = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rss_after = _rss_mb()
+
+    return {
+        "store": store,
+        "build": {
+            "chunks": store.count(COLLECTION),
+            "build_seconds": round(seconds, 3),
+            "peak_heap_mb": round(peak / 1e6, 1),
+            "rss_growth_mb": round(rss_after - rss_before, 1) if rss_before is not None else None,
+            "disk_mb": _disk_mb(db_path),
+            "bm25": stats["lexical_index"],
+        },
+    }
+
+
+def run_setting(retriever: Retriever, queries: List[Dict], relevant: Dict[str, set], ks: List[int], setting: Dict) -> Dict:
+    """Time every query under one setting and score recall@k for each k."""
+    k_max = max(ks)
+    timings = []
+    recall = {k: [] for k in ks}
+    recall_by_kind: Dict[str, Dict[int, List[float]]] = {}
+
+    for item in queries:
+        started = time.perf_counter()
+        results = retriever.retrieve_knowledge(
+            item["query"],
+            k=k_max,
+            mode=setting["mode"],
+            virtue=item["virtue"] if setting["virtue_filter"] else None,
+            mmr_lambda=Config.MMR_LAMBDA if setting["mmr"] else None,
+        )
+        timings.append((time.perf_counter() - started) * 1000)
+
+        wanted = relevant[item["relevant_source"]]
+        ids = [r["id"] for r in results]
+        by_kind = recall_by_kind.setdefault(item["kind"], {k: [] for k in ks})
+        for k in ks:
+            score = len(set(ids[:k]) & wanted) / min(k, len(wanted))
+            recall[k].append(score)
+            by_kind[k].append(score)
+
+    return {
+        **setting,
+        "queries": len(queries),
+        "p50_ms": _percentile(timings, 0.5),
+        "p95_ms": _percentile(timings, 0.95),
+        **{f"recall@{k}": round(float(np.mean(scores)), 4) for k, scores in recall.items()},
+        "recall_by_kind": {
+            kind: {f"recall@{k}": round(float(np.mean(scores)), 4) for k, scores in by_k.items()}
+            for kind, by_k in recall_by_kind.items()
+        },
+    }
+
+
+def run(backends: List[str], modes: List[str], ks: List[int], distractors: int, mmr: bool) -> Dict:
+    settings = [
+        {"mode": mode, "mmr": use_mmr, "virtue_filter": virtue_filter}
+        for mode in modes
+        for use_mmr in ([False, True] if mmr else [False])
+        for virtue_filter in (False, True)
+    ]
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "numpy": np.__version__,
+            "chunk_size": Config.CHUNK_SIZE,
+            "chunk_overlap": Config.CHUNK_OVERLAP,
+            "rrf_k": Config.RRF_K,
+            "mmr_lambda": Config.MMR_LAMBDA,
+            "mmr_fetch_k": Config.MMR_FETCH_K,
+        },
+        "corpus": {},
+        "backends": {},
+        "runs": [],
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus_dir = os.path.join(tmp, "corpus")
+        targets = write_corpus(Path(corpus_dir), distractors)
+        queries = build_queries(targets)
+
+        Config.DOC_EMBEDDING_CACHE = True
+        Config.DOC_EMBEDDING_CACHE_DIR = os.path.join(tmp, "embedding_cache")
+        Config.QUERY_EMBEDDING_CACHE_PATH = os.path.join(tmp, "query_embeddings.sqlite3")
+        # Settings choose MMR explicitly
+        Config.RETRIEVAL_MMR = False
+
+        embedded = False
+        for backend in backends:
+            if not backend_available(backend):
+                report["backends"][backend] = {"error": "not installed"}
+                continue
+
+            db_path = os.path.join(tmp, backend)
+            if not embedded:
+                # Fill the shared chunk-embedding cache so builds measure indexing only
+                loader = DocumentLoader(Config.CHUNK_SIZE, Config.CHUNK_OVERLAP)
+                with contextlib.redirect_stdout(io.StringIO()):
+                    chunks = [doc.content for batch in loader.iter_documents(corpus_dir, workers=1) for doc in batch]
+                    warm_store = create_vector_store(backend, os.path.join(tmp, "warmup"))
+                started = time.perf_counter()
+                warm_store.document_embeddings.embed(chunks)
+                warm_store.embed_queries([item["query"] for item in queries])
+                report["corpus"] = {
+                    "files": len(targets) + distractors,
+                    "chunks": len(chunks),
+                    "queries": len(queries),
+                    "embedding_seconds": round(time.perf_counter() - started, 2),
+                    "embedding_model": warm_store.document_embeddings.model_name,
+                }
+                warm_store.close()
+                embedded = True
+
+            built = build_backend(backend, corpus_dir, db_path)
+            store = built["store"]
+            report["backends"][backend] = built["build"]
+
+            ids, _, metadatas = store.get_documents(COLLECTION)
+            relevant: Dict[str, set] = {}
+            for doc_id, metadata in zip(ids, metadatas):
+                relevant.setdefault(metadata["source_path"], set()).add(doc_id)
+
+            retriever = Retriever(store, cache_size=0)
+            for setting in settings:
+                report["runs"].append({"backend": backend, **run_setting(retriever, queries, relevant, ks, setting)})
+            store.close()
+
+    return report
+
+
+def _run_key(run: Dict) -> tuple:
+    return run["backend"], run["mode"], run["mmr"], run["virtue_filter"]
+
+
+def print_summary(report: Dict, ks: List[int], baseline: Optional[Dict] = None, out=sys.stderr):
+    """Print a table of runs, with deltas against a baseline report when given."""
+    previous = {_run_key(run): run for run in (baseline or {}).get("runs", [])}
+    corpus = report["corpus"]
+    print(
+        f"{corpus.get('chunks')} chunks, {corpus.get('queries')} queries, "
+        f"commit {report['meta']['git_commit']}",
+        file=out,
+    )
+    for backend, build in report["backends"].items():
+        if "error" in build:
+            print(f"{backend}: {build['error']}", file=out)
+            continue
+        print(
+            f"{backend}: build {build['build_seconds']}s | heap peak {build['peak_heap_mb']} MB | "
+            f"rss +{build['rss_growth_mb']} MB | disk {build['disk_mb']} MB",
+            file=out,
+        )
+
+    for run in report["runs"]:
+        label = f"{run['backend']:>6} {run['mode']:>6} mmr={'y' if run['mmr'] else 'n'} virtue={'y' if run['virtue_filter'] else 'n'}"
+        line = f"{label} | p50 {run['p50_ms']:>7} ms | p95 {run['p95_ms']:>7} ms"
+        for k in ks:
+            line += f" | r@{k} {run[f'recall@{k}']:.3f}"
+        before = previous.get(_run_key(run))
+        if before:
+            k = max(ks)
+            line += (
+                f" | vs baseline p50 {run['p50_ms'] - before['p50_ms']:+.3f} ms, "
+                f"r@{k} {run[f'recall@{k}'] - before.get(f'recall@{k}', 0):+.3f}"
+            )
+        print(line, file=out)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backends", nargs="+", default=["numpy", "chroma"], choices=["numpy", "chroma"])
+    parser.add_argument("--modes", nargs="+", default=list(RETRIEVAL_MODES), choices=list(RETRIEVAL_MODES))
+    parser.add_argument("--k", type=int, nargs="+", default=[1, Config.RETRIEVAL_K, 5])
+    parser.add_argument("--distractors", type=int, default=300, help="Distractor files around the topic files")
+    parser.add_argument("--no-mmr", action="store_true", help="Skip the MMR settings")
+    parser.add_argument("--output", help="Write the JSON report here and print a summary table")
+    parser.add_argument("--baseline", help="Earlier JSON report to print deltas against")
+    args = parser.parse_args()
+
+    ks = sorted(set(args.k))
+    report = run(args.backends, args.modes, ks, args.distractors, mmr=not args.no_mmr)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print_summary(report, ks, baseline, out=sys.stdout)
+        print(f"Wrote {args.output}")
+        return
+
+    print(json.dumps(report, indent=2))
+    if baseline:
+        print_summary(report, ks, baseline)
+
+
+if __name__ == "__main__":
+    main()
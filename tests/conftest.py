@@ -0,0 +1,26 @@
+"""Shared fixtures: a deterministic stub embedder so stores run without a model or API key."""
+
+import numpy as np
+import pytest
+import src.rag.numpy_store as numpy_store
+import src.rag.snapshot as snapshot
+
+
+def stub_embed(texts):
+    return [np.random.RandomState(sum(map(ord, text)) % 2**32).rand(8).astype(np.float32) for text in texts]
+
+
+@pytest.fixture
+def stub_embedder(monkeypatch):
+    for module in (numpy_store, snapshot):
+        monkeypatch.setattr(module, "default_embedding_function", lambda: (stub_embed, "stub"))
+    return stub_embed
+
+
+@pytest.fixture
+def numpy_store_factory(tmp_path, stub_embedder):
+    def create(name: str = "store"):
+        return numpy_store.NumpyVectorStore(
+            str(tmp_path / name), cache_query_embeddings=False, cache_document_embeddings=False
+        )
+    return create
@@ -0,0 +1,63 @@
+"""Resumable re-chunking in CorpusIngestor."""
+
+import pytest
+from src.rag.document_loader import DocumentLoader
+from src.rag.ingest import CorpusIngestor
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    directory = tmp_path / "corpus"
+    directory.mkdir()
+    for i in range(4):
+        (directory / f"note{i}.md").write_text(f"# Note {i}\n\n" + " ".join(f"word{i}x{j}" for j in range(300)))
+    return directory
+
+
+def _ingestor(store, chunk_size):
+    return CorpusIngestor(store, loader=DocumentLoader(chunk_size, 10), workers=1)
+
+
+def test_killed_rechunk_resumes_remaining_files(corpus, numpy_store_factory, monkeypatch):
+    store = numpy_store_factory()
+    _ingestor(store, 200).ingest_directory(str(corpus), "stoic_knowledge")
+
+    ingestor = _ingestor(store, 100)
+    write_chunks = ingestor._write_chunks
+    calls = []
+
+    def killed_after_first_file(*args, **kwargs):
+        if calls:
+            raise KeyboardInterrupt
+        calls.append(1)
+        return write_chunks(*args, **kwargs)
+
+    monkeypatch.setattr(ingestor, "_write_chunks", killed_after_first_file)
+    with pytest.raises(KeyboardInterrupt):
+        ingestor.ingest_directory(str(corpus), "stoic_knowledge")
+
+    stats = _ingestor(store, 100).ingest_directory(str(corpus), "stoic_knowledge")
+    assert stats["files_changed"] == 3
+    assert stats["files_unchanged"] == 1
+    _, _, metadatas = store.get_documents("stoic_knowledge")
+    assert max(metadata["tokens"] for metadata in metadatas) <= 100
+
+
+def test_failed_file_is_retried_after_rechunk(corpus, numpy_store_factory, monkeypatch):
+    store = numpy_store_factory()
+    _ingestor(store, 200).ingest_directory(str(corpus), "stoic_knowledge")
+
+    ingestor = _ingestor(store, 100)
+    write_chunks = ingestor._write_chunks
+
+    def fail_note2(documents, *args, **kwargs):
+        if documents and documents[0].metadata["source_path"] == "note2.md":
+            raise OSError("disk full")
+        return write_chunks(documents, *args, **kwargs)
+
+    monkeypatch.setattr(ingestor, "_write_chunks", fail_note2)
+    assert ingestor.ingest_directory(str(corpus), "stoic_knowledge")["files_failed"] == 1
+
+    stats = _ingestor(store, 100).ingest_directory(str(corpus), "stoic_knowledge")
+    assert stats["files_changed"] == 1
+    assert stats["files_unchanged"] == 3
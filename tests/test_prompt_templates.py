@@ -0,0 +1,8 @@
+"""Guard the lean prompt assembly: the persona is sent once, as the system prompt."""
+
+from src.llm.token_accounting import find_persona_duplication
+
+
+def test_no_prompt_duplicates_the_persona():
+    # Covers every *_TEMPLATE and every format/virtue pair in Config.VIRTUES
+    assert find_persona_duplication() == []
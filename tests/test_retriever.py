@@ -0,0 +1,26 @@
+"""Virtue-filtered retrieval with MMR re-ranking."""
+
+import numpy as np
+from src.rag.retriever import Retriever
+from src.rag.virtues import virtue_flag
+
+
+def test_mmr_keeps_on_virtue_hits_when_backfilling(numpy_store_factory, stub_embedder):
+    store = numpy_store_factory()
+    q = np.asarray(stub_embedder(["amor fati"])[0])
+    q = q / np.linalg.norm(q)
+    # Directions orthogonal to the query (and to each other)
+    basis = np.linalg.qr(np.column_stack([q, np.random.RandomState(0).rand(8, 7)]))[0][:, 1:].T
+
+    # The one justice chunk is a near-duplicate of the best off-virtue chunk,
+    # so MMR over a mixed pool would drop it as redundant
+    vectors = [q + 0.30 * basis[0], q + 0.32 * basis[0]] + [0.6 * q + 0.8 * basis[i] for i in range(1, 6)]
+    ids = [f"doc{i}" for i in range(len(vectors))]
+    metadatas = [{virtue_flag("justice"): i == 1} for i in range(len(vectors))]
+    store.replace_collection("stoic_knowledge", ids, ids, metadatas, np.array(vectors))
+
+    results = Retriever(store).retrieve_knowledge("amor fati", k=3, mode="vector", virtue="justice", mmr_lambda=0.5)
+
+    assert [r["id"] for r in results][0] == "doc1"
+    assert len(results) == 3
+    assert all("embedding" not in r for r in results)
@@ -0,0 +1,19 @@
+"""Snapshot export and read-only querying."""
+
+import src.rag.snapshot as snapshot
+from src.rag.document_loader import Document
+
+
+def test_snapshot_store_queries(tmp_path, numpy_store_factory, stub_embedder):
+    store = numpy_store_factory()
+    docs = [Document(f"chunk {i}", {"source_path": "s.md", "chunk_id": i}) for i in range(4)]
+    store.upsert_documents(docs, "stoic_knowledge")
+    path = str(tmp_path / "store.snap")
+    snapshot.export_snapshot(store, path)
+
+    snap = snapshot.SnapshotVectorStore(path, cache_query_embeddings=False)
+    results = snap.query(query_embedding=stub_embedder(["chunk 2"])[0], k=1)
+
+    assert results[0]["id"] == docs[2].doc_id
+    assert snap.count("stoic_knowledge") == 4
+    snap.close()